@@ -1,11 +1,48 @@
-from typing import Optional
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
-from .dtos import CompressRequest, CompressResult
-from backend.image_converter.domain.size_targeting import find_best_quality_under_target
+from .dtos import CompressRequest, CompressResult, PageProgress
+from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
+from backend.image_converter.domain.size_targeting import (
+    find_best_quality_under_target,
+    find_best_quality_via_proxy,
+)
 from backend.image_converter.domain.units import TargetSize
 from backend.image_converter.core.enums.image_format import ImageFormat
-from backend.image_converter.application.file_payload_expander import FilePayloadExpander
+from backend.image_converter.application.file_payload_expander import FilePayloadExpander, PagePayload
+from backend.image_converter.domain.pdf_merge import PdfMergeOrder, natural_sort_key
 from backend.image_converter.domain.pdf_presets import resolve_pdf_preset, resolve_pdf_scale, PdfPreset
+from backend.image_converter.domain.raster_target import RasterTarget
+from backend.image_converter.infrastructure.conversion_cache import CachedOutput, ConversionCache
+from backend.image_converter.infrastructure.image_probe import ImageMetadata, ImageProbe
+from backend.image_converter.infrastructure.local_storage import FileItem
+from backend.image_converter.infrastructure.streaming_pdf import MERGED_PDF_NAME, PdfPage, StreamingPdfWriter
+
+
+@dataclass(frozen=True)
+class _PageOutcome:
+    """What one page contributed to the request: a written file or an error."""
+
+    processed_file: Optional[str] = None
+    error: Optional[str] = None
+    full_resolution_encodes: int = 0
+    # Which upload (and page) the outcome belongs to, for progress reports.
+    source_name: str = ""
+    page_index: Optional[int] = None
+    # Set on freshly converted pages whose input may be cached.
+    cache_key: Optional[str] = None
+    cached_output: Optional[CachedOutput] = None
+    # Pages laid out for the merged PDF, appended on the calling thread.
+    pdf_pages: Tuple[PdfPage, ...] = ()
+
+
+_PageJob = Callable[[], _PageOutcome]
+
 
 class CompressImagesUseCase:
     def __init__(
@@ -15,14 +52,38 @@ class CompressImagesUseCase:
         converter_factory,
         storage,
         payload_expander: FilePayloadExpander,
+        max_workers: int = 1,
+        max_background_removal_workers: int = 1,
+        image_probe: Optional[ImageProbe] = None,
+        target_size_proxy_pixels: int = 0,
+        background_removal_batch_size: int = 1,
+        conversion_cache: Optional[ConversionCache] = None,
+        max_decoded_page_bytes: Optional[int] = None,
+        avif_threads: Optional[EncoderThreadBudget] = None,
     ):
         self.logger = logger
         self.resizer = resizer
         self.converter_factory = converter_factory
         self.storage = storage
         self.payload_expander = payload_expander
+        self.max_workers = max(1, max_workers)
+        self.max_background_removal_workers = max(1, max_background_removal_workers)
+        self.image_probe = image_probe or ImageProbe()
+        self.target_size_proxy_pixels = max(0, target_size_proxy_pixels)
+        self.background_removal_batch_size = max(1, background_removal_batch_size)
+        self.conversion_cache = conversion_cache
+        self.max_decoded_page_bytes = max_decoded_page_bytes
+        self.avif_threads = avif_threads or EncoderThreadBudget.whole_machine()
 
-    def execute(self, req: CompressRequest) -> CompressResult:
+    def execute(
+        self,
+        req: CompressRequest,
+        on_page_done: Optional[Callable[[PageProgress], None]] = None,
+    ) -> CompressResult:
+        """
+        Convert every input of `req`. `on_page_done` is called (in page order,
+        on the calling thread) as each page's outcome becomes final.
+        """
         processed, errors = [], []
         new_ext = req.image_format.get_file_extension()
         pdf_preset: Optional[PdfPreset] = None
@@ -44,39 +105,79 @@ class CompressImagesUseCase:
                 return CompressResult(processed_files=[], errors=[scale_res.error])
             pdf_scale = scale_res.value
 
-        for item in self.storage.iter_files(req.source_folder):
+        uses_target_size = bool(req.target_size) and req.image_format in [ImageFormat.JPEG, ImageFormat.AVIF]
+        converter = None
+        if not uses_target_size:
+            # Every page of a request shares the same settings, so one converter
+            # (and, for rembg, one loaded model session) serves the whole request.
             try:
-                read_result = self.storage.read_bytes(item.path)
-                if not read_result.is_successful:
-                    raise ValueError(read_result.error)
-                original = read_result.value
-
-                expand_result = self.payload_expander.expand(item.name, original)
-                if not expand_result.is_successful:
-                    raise ValueError(expand_result.error)
-                page_payloads = expand_result.value
+                converter = self.converter_factory.create_converter(
+                    req.image_format,
+                    req.quality,
+                    self.logger,
+                    req.use_rembg,
+                    pdf_preset=pdf_preset,
+                    pdf_scale=pdf_scale,
+                    pdf_margin_mm=pdf_margin_mm,
+                    pdf_paginate=pdf_paginate,
+                    pdf_quality=pdf_quality,
+                    effort=req.effort,
+                    avif_threads=self.avif_threads,
+                )
             except Exception as e:
-                errors.append(f"{item.name}: {e}")
-                continue
+                return CompressResult(processed_files=[], errors=[str(e)])
 
-            # page_payloads is now an iterable (generator for PDFs) to save memory
-            for payload in page_payloads:
-                page_label = payload.label
-                try:
-                    if pdf_preset and req.image_format == ImageFormat.PDF:
-                        data = payload.data
-                    else:
-                        data = self._resize_if_needed(payload.data, req.width)
+        # A merged PDF is one file for the whole request; per-input cache
+        # entries do not apply.
+        merge = req.pdf_merge and req.image_format == ImageFormat.PDF and converter is not None
+        conversion_cache = None if merge else self.conversion_cache
+        cache_params = self._cache_params(req, uses_target_size, converter)
+        raster_target = RasterTarget.for_conversion(
+            req.width, pdf_preset, pdf_scale, pdf_margin_mm, pdf_paginate, pdf_quality
+        )
 
-                    if req.target_size and req.image_format in [ImageFormat.JPEG, ImageFormat.AVIF]:
-                        target = TargetSize(req.target_size.bytes)
-                        target_bytes = target.soft_limit
+        def convert_page(item: FileItem, payload: PagePayload, cache_key: Optional[str]) -> _PageOutcome:
+            page_label = payload.label
+            try:
+                probe_result = payload.probe(self.image_probe)
+                if not probe_result.is_successful:
+                    raise ValueError(probe_result.error)
+                metadata = probe_result.value
 
-                        def encoder(q: int, d: bytes) -> bytes:
-                            converter = self.converter_factory.create_converter(req.image_format, q, self.logger)
-                            return converter.encode_to_bytes(d)
+                if not (pdf_preset and req.image_format == ImageFormat.PDF) and self._needs_resize(metadata, req.width):
+                    draft_width = self.resizer.draft_width(req.width) if req.fast_downscale else None
+                    decoded = payload.decode(
+                        draft_width=draft_width, memory_limit_bytes=self.max_decoded_page_bytes
+                    )
+                    image = self.resizer.resize(decoded, req.width)
+                    self.logger.log(
+                        f"{page_label}: resized {metadata.width}px -> {image.width}px", "debug"
+                    )
+                else:
+                    image = payload.decode(memory_limit_bytes=self.max_decoded_page_bytes)
 
-                        q, out, size = find_best_quality_under_target(encoder, data, target_bytes)
+                if uses_target_size:
+                    target = TargetSize(req.target_size.bytes)
+
+                    # Converters are shared across pages and threads, so every
+                    # probed quality gets its own (pooled) instance.
+                    def encoder(q: int, d: DecodedImage) -> bytes:
+                        probe_converter = self.converter_factory.create_converter(
+                            req.image_format, q, self.logger,
+                            effort=req.effort, avif_threads=self.avif_threads,
+                        )
+                        return probe_converter.encode_image(d)
+
+                    out = self._lossless_within_target(req, image, target)
+                    if out is not None:
+                        full_encodes = 0
+                        self.logger.log(f"{page_label}: kept the source JPEG ({len(out)} bytes).", "debug")
+                    else:
+                        q, out, size, full_encodes = self._search_target_quality(encoder, image, target)
+                        self.logger.log(
+                            f"{page_label}: quality {q} -> {size} bytes after {full_encodes} full-resolution encode(s).",
+                            "debug",
+                        )
 
                         if not target.within_tolerance(len(out)):
                             self.logger.log(
@@ -84,52 +185,283 @@ class CompressImagesUseCase:
                                 "warn"
                             )
 
-                        # The target-size path never removes the background.
-                        dest_name = self._build_dest_name(item.stem, new_ext, payload.page_index)
-                        dest_path = self.storage.build_dest_path(req.dest_folder, dest_name)
-                        write_result = self.storage.write_bytes(dest_path, out)
-                        if not write_result.is_successful:
-                            errors.append(f"{page_label}: {write_result.error}")
-                        else:
-                            processed.append(dest_name)
-                    else:
-                        converter = self.converter_factory.create_converter(
-                            req.image_format,
-                            req.quality,
-                            self.logger,
-                            req.use_rembg,
-                            pdf_preset=pdf_preset,
-                            pdf_scale=pdf_scale,
-                            pdf_margin_mm=pdf_margin_mm,
-                            pdf_paginate=pdf_paginate,
-                            pdf_quality=pdf_quality,
-                        )
-                        # Tag the filename when the converter itself removed the
-                        # background, so the suffix follows the actual behaviour
-                        # regardless of which formats support rembg.
-                        dest_name = self._build_dest_name(
-                            item.stem, new_ext, payload.page_index, converter.removes_background
-                        )
-                        dest_path = self.storage.build_dest_path(req.dest_folder, dest_name)
-                        result = converter.convert(
-                            image_data=data,
-                            source_path=item.path,
-                            dest_path=dest_path
+                    # The target-size path never removes the background.
+                    dest_name = self._build_dest_name(item.stem, new_ext, payload.page_index)
+                    dest_path = self.storage.build_dest_path(req.dest_folder, dest_name)
+                    write_result = self.storage.write_bytes(dest_path, out)
+                    if not write_result.is_successful:
+                        return _PageOutcome(
+                            error=f"{page_label}: {write_result.error}",
+                            full_resolution_encodes=full_encodes,
+                            cache_key=cache_key,
                         )
-                        if not result.is_successful:
-                            errors.append(f"{page_label}: {result.error}")
-                        else:
-                            processed.append(dest_name)
+                    return self._converted(item, dest_name, metadata, image, cache_key, full_encodes)
+
+                if merge:
+                    pages = tuple(converter.layout_pages(image))
+                    return _PageOutcome(processed_file=MERGED_PDF_NAME, pdf_pages=pages)
+
+                # Tag the filename when the converter itself removed the
+                # background, so the suffix follows the actual behaviour
+                # regardless of which formats support rembg.
+                dest_name = self._build_dest_name(
+                    item.stem, new_ext, payload.page_index, converter.removes_background
+                )
+                dest_path = self.storage.build_dest_path(req.dest_folder, dest_name)
+                result = converter.convert_image(
+                    image=image,
+                    source_path=item.path,
+                    dest_path=dest_path
+                )
+                if not result.is_successful:
+                    return _PageOutcome(error=f"{page_label}: {result.error}", cache_key=cache_key)
+                return self._converted(item, dest_name, metadata, image, cache_key)
+            except Exception as e:
+                return _PageOutcome(error=f"{page_label}: {e}", cache_key=cache_key)
+
+        def page_jobs() -> Iterator[_PageJob]:
+            inputs = self._iter_inputs(req)
+            if merge:
+                inputs = self._in_merge_order(req, inputs)
+            for item, read_bytes in inputs:
+                try:
+                    read_result = read_bytes()
+                    if not read_result.is_successful:
+                        raise ValueError(read_result.error)
+                    original = read_result.value
+
+                    cache_key = None
+                    if conversion_cache is not None:
+                        cache_key = conversion_cache.build_key(original, cache_params)
+                        restored = self._restore_from_cache(cache_key, req.dest_folder, item)
+                        if restored is not None:
+                            for name in restored:
+                                yield lambda name=name, item=item: _PageOutcome(
+                                    processed_file=name, source_name=item.name
+                                )
+                            continue
+
+                    expand_result = self.payload_expander.expand(
+                        item.name, original, raster_target=raster_target
+                    )
+                    if not expand_result.is_successful:
+                        raise ValueError(expand_result.error)
+                    page_payloads = expand_result.value
                 except Exception as e:
-                    errors.append(f"{page_label}: {e}")
+                    failure = _PageOutcome(error=f"{item.name}: {e}", source_name=item.name)
+                    yield lambda failure=failure: failure
+                    continue
+
+                # page_payloads is an iterable (generator for PDFs) to save memory;
+                # pages are pulled lazily as worker slots free up.
+                for payload in page_payloads:
+                    yield lambda item=item, payload=payload, key=cache_key: replace(
+                        convert_page(item, payload, key), source_name=item.name, page_index=payload.page_index
+                    )
+
+        workers = self.max_workers
+        if converter is not None and converter.removes_background:
+            # Keep enough pages in flight for the rembg batcher to fill a batch.
+            workers = max(self.max_background_removal_workers, self.background_removal_batch_size)
+        full_encodes = 0
+        cacheable = _CacheableRun(conversion_cache, self.storage, req.dest_folder)
+        merged = _MergedPdf(self.storage.build_dest_path(req.dest_folder, MERGED_PDF_NAME)) if merge else None
+        try:
+            for outcome in self._run_in_order(page_jobs(), workers):
+                if merged is not None and outcome.pdf_pages:
+                    outcome = merged.append(outcome)
+                full_encodes += outcome.full_resolution_encodes
+                cacheable.add(outcome)
+                if on_page_done is not None:
+                    on_page_done(PageProgress(
+                        file=outcome.source_name,
+                        page_index=outcome.page_index,
+                        output=outcome.processed_file,
+                        error=outcome.error,
+                    ))
+                if outcome.error is not None:
+                    errors.append(outcome.error)
+                elif merged is None:
+                    processed.append(outcome.processed_file)
+        except BaseException:
+            # The inputs themselves failed (e.g. a rejected upload); the
+            # caller discards this run.
+            if merged is not None:
+                merged.abort()
+            raise
+        cacheable.flush()
+        if merged is not None:
+            finish_result = merged.finish()
+            if not finish_result.is_successful:
+                errors.append(finish_result.error)
+            elif finish_result.value:
+                processed.append(MERGED_PDF_NAME)
 
-        return CompressResult(processed_files=processed, errors=errors)
+        return CompressResult(
+            processed_files=processed,
+            errors=errors,
+            full_resolution_encodes=full_encodes if uses_target_size else None,
+        )
 
-    def _resize_if_needed(self, data: bytes, width: Optional[int]) -> bytes:
-        if width and width > 0:
-            return self.resizer.resize_image(data, width)
-        return data
+    def _iter_inputs(self, req: CompressRequest) -> Iterator[Tuple[FileItem, Callable[[], Result[bytes]]]]:
+        """
+        Files of `req.source_folder`, or `req.incoming_files` when the caller
+        streams uploads in; those are pulled one at a time as workers free up.
+        """
+        if req.incoming_files is None:
+            for item in self.storage.iter_files(req.source_folder):
+                yield item, lambda item=item: self.storage.read_bytes(item.path)
+            return
+        for incoming in req.incoming_files:
+            stem, _ = os.path.splitext(incoming.name)
+            yield FileItem(path=incoming.name, name=incoming.name, stem=stem), incoming.read_bytes
 
+    @staticmethod
+    def _in_merge_order(
+        req: CompressRequest, inputs: Iterator[Tuple[FileItem, Callable[[], Result[bytes]]]]
+    ) -> Iterable[Tuple[FileItem, Callable[[], Result[bytes]]]]:
+        """
+        Inputs in the order their pages go into the merged PDF. Sorting by name
+        waits for every streamed upload to arrive; streamed uploads in upload
+        order are passed through as they come.
+        """
+        if req.pdf_merge_order == PdfMergeOrder.NAME:
+            return sorted(inputs, key=lambda entry: natural_sort_key(entry[0].name))
+        if req.incoming_files is not None:
+            return inputs
+        position = {name: index for index, name in enumerate(req.upload_order)}
+        return sorted(
+            inputs,
+            key=lambda entry: (position.get(entry[0].name, len(position)), natural_sort_key(entry[0].name)),
+        )
+
+    @staticmethod
+    def _run_in_order(jobs: Iterable[_PageJob], workers: int) -> Iterator[_PageOutcome]:
+        """
+        Run page jobs on up to `workers` threads and yield their outcomes in
+        submission order. Pillow's encoders and onnxruntime release the GIL, so
+        threads are enough to keep several cores busy. At most `2 * workers`
+        pages are in flight, which keeps memory bounded for long PDFs.
+        """
+        if workers <= 1:
+            for job in jobs:
+                yield job()
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compress") as pool:
+            pending = deque()
+            for job in jobs:
+                pending.append(pool.submit(job))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _lossless_within_target(
+        self, req: CompressRequest, image: DecodedImage, target: TargetSize
+    ) -> Optional[bytes]:
+        """
+        The source JPEG, stripped of metadata, when JPEG output may keep it
+        (see `JpegConverter.lossless_copy`) and it already meets the target.
+        """
+        if req.image_format != ImageFormat.JPEG:
+            return None
+        converter = self.converter_factory.create_converter(
+            req.image_format, req.quality, self.logger, avif_threads=self.avif_threads
+        )
+        copy = converter.lossless_copy(image)
+        if copy is None or len(copy) > target.soft_limit:
+            return None
+        return copy
+
+    def _search_target_quality(self, encoder, image: DecodedImage, target: TargetSize):
+        """
+        Estimate on a proxy with `target_size_proxy_pixels` pixels when the page
+        is at least four times larger; otherwise search on the page directly.
+        """
+        budget = self.target_size_proxy_pixels
+        pixels = image.width * image.height
+        if budget and pixels >= 4 * budget:
+            proxy = self.resizer.downscale_to_pixel_budget(image, budget)
+            return find_best_quality_via_proxy(
+                encoder,
+                image,
+                proxy,
+                pixels / float(proxy.width * proxy.height),
+                target.soft_limit,
+                good_enough_bytes=target.band_floor,
+            )
+
+        full_encodes = 0
+
+        def counting_encoder(q: int, d: DecodedImage) -> bytes:
+            nonlocal full_encodes
+            full_encodes += 1
+            return encoder(q, d)
+
+        q, out, size = find_best_quality_under_target(
+            counting_encoder, image, target.soft_limit, good_enough_bytes=target.band_floor
+        )
+        return q, out, size, full_encodes
+
+    def _cache_params(self, req: CompressRequest, uses_target_size: bool, converter) -> dict:
+        """Every request setting that can change the files written for an input."""
+        removes_background = bool(converter is not None and converter.removes_background)
+        return {
+            "pipeline": "api",
+            "format": req.image_format.value,
+            "quality": req.quality,
+            "width": req.width,
+            "fast_downscale": req.fast_downscale,
+            "max_decoded_page_bytes": self.max_decoded_page_bytes,
+            "target_size": req.target_size.bytes if uses_target_size else None,
+            "target_size_proxy_pixels": self.target_size_proxy_pixels if uses_target_size else None,
+            "pdf_preset": req.pdf_preset,
+            "pdf_scale": req.pdf_scale,
+            "pdf_margin_mm": req.pdf_margin_mm,
+            "pdf_paginate": req.pdf_paginate,
+            "pdf_quality": req.pdf_quality.value,
+            "effort": req.effort.value,
+            "avif_autotiling": self.avif_threads.autotiling,
+            "rembg_model": getattr(converter, "model_name", None) if removes_background else None,
+        }
+
+    def _restore_from_cache(self, key: str, dest_folder: str, item: FileItem) -> Optional[list]:
+        hit = self.conversion_cache.lookup(key)
+        if hit is None:
+            return None
+        restored = self.conversion_cache.restore(hit, dest_folder, item.stem)
+        if not restored.is_successful:
+            return None
+        self.logger.log(f"{item.name}: reused {len(restored.value)} cached file(s).", "debug")
+        return restored.value
+
+    @staticmethod
+    def _converted(
+        item: FileItem,
+        dest_name: str,
+        metadata: ImageMetadata,
+        image: DecodedImage,
+        cache_key: Optional[str],
+        full_encodes: int = 0,
+    ) -> _PageOutcome:
+        cached_output = None
+        if cache_key is not None:
+            cached_output = CachedOutput(
+                suffix=dest_name[len(item.stem):],
+                original_width=metadata.width,
+                resized_width=image.width,
+            )
+        return _PageOutcome(
+            processed_file=dest_name,
+            full_resolution_encodes=full_encodes,
+            cache_key=cache_key,
+            cached_output=cached_output,
+        )
+
+    @staticmethod
+    def _needs_resize(metadata: ImageMetadata, width: Optional[int]) -> bool:
+        return bool(width and width > 0 and width != metadata.width)
 
     _BG_REMOVED_SUFFIX = "_ai-bg-removed"
 
@@ -142,3 +474,95 @@ class CompressImagesUseCase:
         if page_index is None:
             return stem + extension
         return f"{stem}_page-{page_index}{extension}"
+
+
+class _CacheableRun:
+    """
+    Collects the outcomes of one input (they arrive back to back) and stores
+    them in the cache once the input is complete and every page succeeded.
+    """
+
+    def __init__(self, cache: Optional[ConversionCache], storage, dest_folder: str):
+        self.cache = cache
+        self.storage = storage
+        self.dest_folder = dest_folder
+        self.key: Optional[str] = None
+        self.outcomes: list = []
+        self.failed = False
+
+    def add(self, outcome: _PageOutcome) -> None:
+        if self.cache is None:
+            return
+        # The same input uploaded twice in a row shares a key; a repeated
+        # suffix marks the start of the second copy.
+        if outcome.cache_key != self.key or self._repeats(outcome):
+            self.flush()
+            self.key = outcome.cache_key
+        if self.key is None:
+            return
+        if outcome.error is not None or outcome.cached_output is None:
+            self.failed = True
+        else:
+            self.outcomes.append(outcome)
+
+    def _repeats(self, outcome: _PageOutcome) -> bool:
+        return outcome.cached_output is not None and any(
+            seen.cached_output.suffix == outcome.cached_output.suffix for seen in self.outcomes
+        )
+
+    def flush(self) -> None:
+        if self.cache is not None and self.key is not None and not self.failed:
+            self.cache.store(self.key, [
+                (outcome.cached_output, self.storage.build_dest_path(self.dest_folder, outcome.processed_file))
+                for outcome in self.outcomes
+            ])
+        self.key = None
+        self.outcomes = []
+        self.failed = False
+
+
+class _MergedPdf:
+    """
+    The one PDF of a merge request. It is created with the first page. Pages
+    are written as their outcomes arrive, so only the pages in flight are held
+    in memory. After a write error, the file is dropped and every later page
+    fails.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.writer: Optional[StreamingPdfWriter] = None
+        self.error: Optional[str] = None
+
+    def append(self, outcome: _PageOutcome) -> _PageOutcome:
+        if self.error is None:
+            try:
+                if self.writer is None:
+                    self.writer = StreamingPdfWriter(self.path)
+                for page in outcome.pdf_pages:
+                    self.writer.add_page(page)
+                return replace(outcome, pdf_pages=())
+            except Exception as e:
+                self.error = f"{MERGED_PDF_NAME}: {e}"
+                self._discard()
+        return replace(outcome, processed_file=None, error=self.error, pdf_pages=())
+
+    def finish(self) -> Result[bool]:
+        """Close the document; False when no page made it in."""
+        if self.writer is None:
+            return Result.success(False)
+        try:
+            self.writer.close()
+        except Exception as e:
+            self._discard()
+            return Result.failure(f"{MERGED_PDF_NAME}: {e}")
+        return Result.success(True)
+
+    def abort(self) -> None:
+        """Drop the document of a run that stopped early."""
+        self._discard()
+
+    def _discard(self) -> None:
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
@@ -2,15 +2,27 @@
 """
 
 from dataclasses import asdict, dataclass, field
-from typing import List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
 
 from werkzeug.datastructures import FileStorage
 
 from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import InputBuffer
+from backend.image_converter.domain.pdf_merge import PdfMergeOrder
+from backend.image_converter.domain.encoder_effort import EncoderEffort
 from backend.image_converter.domain.pdf_quality import PdfQuality
 from backend.image_converter.domain.units import TargetSize
 
 
+@dataclass(frozen=True)
+class IncomingFile:
+    """An upload handed straight to the use case instead of via `source_folder`."""
+
+    name: str
+    read_bytes: Callable[[], Result[InputBuffer]]
+
+
 @dataclass
 class CompressRequest:
     source_folder: str
@@ -25,15 +37,44 @@ class CompressRequest:
     pdf_margin_mm: Optional[float] = None
     pdf_paginate: bool = False
     pdf_quality: PdfQuality = PdfQuality.HIGH
+    fast_downscale: bool = True
+    # AVIF and PNG only: CPU spent per encode for a smaller file.
+    effort: EncoderEffort = EncoderEffort.BALANCED
+    # When set, files are taken from here (as they arrive) instead of
+    # being listed from `source_folder`.
+    incoming_files: Optional[Iterable[IncomingFile]] = None
+    # PDF only: append every page to one document instead of writing a PDF
+    # per input.
+    pdf_merge: bool = False
+    pdf_merge_order: PdfMergeOrder = PdfMergeOrder.UPLOAD
+    # Names of the files in `source_folder` as they were uploaded; a folder
+    # listing does not keep that order.
+    upload_order: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class PageProgress:
+    """One finished page (or a file that failed before it had pages)."""
+
+    file: str
+    page_index: Optional[int] = None
+    output: Optional[str] = None
+    error: Optional[str] = None
 
 
 @dataclass
 class CompressResult:
     processed_files: list[str]
     errors: list[str]
+    # Full-resolution encodes spent searching for target-size quality;
+    # None when the request had no target size.
+    full_resolution_encodes: Optional[int] = None
 
     def to_json_dict(self) -> dict:
-        return {"processed_files": self.processed_files, "errors": self.errors}
+        payload = {"processed_files": self.processed_files, "errors": self.errors}
+        if self.full_resolution_encodes is not None:
+            payload["full_resolution_encodes"] = self.full_resolution_encodes
+        return payload
 
 
 @dataclass(frozen=True)
@@ -95,6 +136,10 @@ class CompressionFormData:
     pdf_margin_mm: float
     pdf_paginate: bool
     pdf_quality: str = "high"
+    fast_downscale: bool = True
+    pdf_merge: bool = False
+    pdf_merge_order: str = "upload"
+    effort: str = "balanced"
 
 
 @dataclass(frozen=True)
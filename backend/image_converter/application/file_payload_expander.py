@@ -1,16 +1,48 @@
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from itertools import count
+from typing import Iterable, Optional, Sequence
 
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.input_buffer import InputBuffer
+from backend.image_converter.domain.raster_target import RasterTarget
+from backend.image_converter.infrastructure.image_probe import ImageMetadata, ImageProbe
 from backend.image_converter.infrastructure.pdf_page_extractor import PdfPageExtractor
 from backend.image_converter.infrastructure.psd_renderer import PsdRenderer
 
 
 @dataclass
 class PagePayload:
-    data: bytes
+    """
+    One raster page. Producers set encoded `data` (bytes or a memory-mapped
+    file, passed along uncopied), an already decoded `image`, or both;
+    `decode()` hands out the decoded page, decoding `data` at most once.
+    """
+
+    data: Optional[InputBuffer]
     page_index: Optional[int]
     label: str
+    image: Optional[DecodedImage] = None
+
+    def decode(
+        self, draft_width: Optional[int] = None, memory_limit_bytes: Optional[int] = None
+    ) -> DecodedImage:
+        """
+        Decode once and cache. `draft_width` and `memory_limit_bytes` only
+        apply to the first call, so callers pass them when they know the page
+        is about to be downscaled.
+        """
+        if self.image is None:
+            self.image = DecodedImage.from_bytes(
+                self.data, draft_width=draft_width, memory_limit_bytes=memory_limit_bytes
+            )
+        return self.image
+
+    def probe(self, image_probe: ImageProbe) -> Result[ImageMetadata]:
+        """Describe the page without decoding pixels (if it is not decoded yet)."""
+        if self.image is not None:
+            return Result.success(image_probe.describe(self.image.image))
+        return image_probe.probe(self.data)
 
 
 class FilePayloadExpander:
@@ -22,9 +54,20 @@ class FilePayloadExpander:
         self.pdf_extractor = pdf_extractor
         self.psd_renderer = psd_renderer
 
-    def expand(self, source_name: str, data: bytes) -> Result[Iterable[PagePayload]]:
+    def expand(
+        self,
+        source_name: str,
+        data: InputBuffer,
+        page_numbers: Optional[Sequence[int]] = None,
+        raster_target: Optional[RasterTarget] = None,
+    ) -> Result[Iterable[PagePayload]]:
+        """
+        `page_numbers` (1-based) limits multi-page containers to a subset of
+        pages; single-image inputs ignore it. `raster_target` lets vector
+        sources render no larger than the conversion keeps.
+        """
         if self._is_pdf(source_name):
-            return self._expand_pdf_payloads(source_name, data)
+            return self._expand_pdf_payloads(source_name, data, page_numbers, raster_target)
         if self._is_psd(source_name):
             return self._expand_psd_payload(source_name, data)
         return Result.success([self._build_single_payload(source_name, data)])
@@ -37,33 +80,50 @@ class FilePayloadExpander:
     def _is_psd(source_name: str) -> bool:
         return source_name.lower().endswith(".psd")
 
-    def _expand_pdf_payloads(self, source_name: str, data: bytes) -> Result[Iterable[PagePayload]]:
-        pdf_pages_res = self.pdf_extractor.rasterize_pages(data, source_name)
+    def _expand_pdf_payloads(
+        self,
+        source_name: str,
+        data: InputBuffer,
+        page_numbers: Optional[Sequence[int]] = None,
+        raster_target: Optional[RasterTarget] = None,
+    ) -> Result[Iterable[PagePayload]]:
+        options = {}
+        if page_numbers is not None:
+            options["page_numbers"] = page_numbers
+        if raster_target is not None:
+            options["raster_target"] = raster_target
+        pdf_pages_res = self.pdf_extractor.rasterize_pages(data, source_name, **options)
         if not pdf_pages_res.is_successful:
             return Result.failure(pdf_pages_res.error)
 
+        indices = count(1) if page_numbers is None else page_numbers
+
         def payload_generator():
-            for index, page in enumerate(pdf_pages_res.value, start=1):
-                yield PagePayload(
-                    data=page,
-                    page_index=index,
-                    label=f"{source_name} (page {index})",
-                )
+            for index, page in zip(indices, pdf_pages_res.value):
+                label = f"{source_name} (page {index})"
+                if isinstance(page, (bytes, bytearray)):
+                    yield PagePayload(data=page, page_index=index, label=label)
+                else:
+                    yield PagePayload(
+                        data=None, page_index=index, label=label, image=DecodedImage.from_pil(page)
+                    )
 
         return Result.success(payload_generator())
 
-    def _expand_psd_payload(self, source_name: str, data: bytes) -> Result[Iterable[PagePayload]]:
-        rendered = self.psd_renderer.render(source_name, data)
+    def _expand_psd_payload(self, source_name: str, data: InputBuffer) -> Result[Iterable[PagePayload]]:
+        rendered = self.psd_renderer.render_image(source_name, data)
         if not rendered.is_successful:
             return Result.failure(rendered.error)
 
+        # The flattened composite is handed over decoded; no PNG round-trip.
         payload = PagePayload(
-            data=rendered.value,
+            data=None,
             page_index=None,
             label=source_name,
+            image=DecodedImage.from_pil(rendered.value),
         )
         return Result.success([payload])
 
     @staticmethod
-    def _build_single_payload(source_name: str, data: bytes) -> PagePayload:
+    def _build_single_payload(source_name: str, data: InputBuffer) -> PagePayload:
         return PagePayload(data=data, page_index=None, label=source_name)
@@ -4,7 +4,17 @@ from backend.image_converter.infrastructure.psd_renderer import PsdRenderer
 from backend.image_converter.infrastructure.logger import Logger
 
 
-def create_payload_expander(logger: Logger) -> FilePayloadExpander:
-    pdf_extractor = PdfPageExtractor(logger=logger)
+def create_payload_expander(
+    logger: Logger,
+    pdf_render_workers: int = 1,
+    pdf_max_pages_in_flight: int = 0,
+) -> FilePayloadExpander:
+    # Pages are handed over decoded; nothing downstream needs them as PNG.
+    pdf_extractor = PdfPageExtractor(
+        logger=logger,
+        image_format=None,
+        render_workers=pdf_render_workers,
+        max_pages_in_flight=pdf_max_pages_in_flight or None,
+    )
     psd_renderer = PsdRenderer(logger=logger)
     return FilePayloadExpander(pdf_extractor, psd_renderer)
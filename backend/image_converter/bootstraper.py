@@ -15,7 +15,7 @@ from backend.image_converter.infrastructure.logger import (
     enable_error_capture_in_docker_env,
 )
 from backend.image_converter.presentation.cli.app import main as cli_main
-from backend.image_converter.presentation.web.server import start_scheduler
+from backend.image_converter.presentation.web.server import WEB_WORKER_ENV, start_scheduler
 
 
 def _granian_stdout_logger() -> logging.Logger:
@@ -43,6 +43,7 @@ def launch_web_prod(web: WebConfig) -> None:
             "--port", str(web.port),
             "backend.image_converter.presentation.web.server:app",
         ],
+        env={**os.environ, WEB_WORKER_ENV: "1"},
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -1,7 +1,10 @@
 """Typed backend configuration models."""
 
+import os
 from dataclasses import dataclass
+from typing import Optional
 
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
 from backend.image_converter.domain.units import BYTES_PER_MEBIBYTE
 from backend.image_converter.domain.web_workers import WebWorkerCount
 
@@ -15,11 +18,20 @@ class TemporaryStorageConfig:
 @dataclass(frozen=True)
 class UploadsConfig:
     max_file_size_mebibytes: int
+    # Convert each file of /compress as soon as its part has arrived.
+    streaming_ingest: bool = True
+    # Streamed parts larger than this are spooled to the temp directory; at
+    # least 1, as a zero-sized SpooledTemporaryFile never rolls over to disk.
+    spool_threshold_mebibytes: int = 16
 
     @property
     def max_file_size_bytes(self) -> int:
         return self.max_file_size_mebibytes * BYTES_PER_MEBIBYTE
 
+    @property
+    def spool_threshold_bytes(self) -> int:
+        return self.spool_threshold_mebibytes * BYTES_PER_MEBIBYTE
+
 
 @dataclass(frozen=True)
 class WebConfig:
@@ -60,6 +72,89 @@ class FeaturesConfig:
 @dataclass(frozen=True)
 class RembgConfig:
     model_name: str
+    warm_up_on_boot: bool = False
+    max_concurrent_inferences: int = 1
+    # Seconds a loaded model may sit unused before it is unloaded; 0 = never.
+    idle_eviction_seconds: int = 0
+    # Images grouped into one ONNX call; 1 disables batching.
+    batch_size: int = 1
+    batch_wait_milliseconds: int = 20
+    # ONNX Runtime thread pools; 0 keeps onnxruntime's defaults.
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    # Pages one web worker converts at once, so the host runs web.workers
+    # times this many; "auto" splits the CPUs between the web workers.
+    max_concurrent_pages: WebWorkerCount
+    max_concurrent_background_removals: int
+    # Pixel budget of the proxy used to estimate target-size quality; 0 disables it.
+    target_size_proxy_pixels: int = 0
+
+    def pages_per_web_worker(self, web_workers: int) -> int:
+        """`max_concurrent_pages` for one of `web_workers` processes sharing the machine."""
+        return self.max_concurrent_pages.resolve(
+            fallback_when_auto=max(1, (os.cpu_count() or 1) // max(1, web_workers))
+        )
+
+
+@dataclass(frozen=True)
+class ProcessingConfig:
+    # Ceiling on one decoded page. Larger pages are reduced while they are
+    # read when they get downscaled anyway, and rejected otherwise; 0 = none.
+    # It is not a per-request budget: a request holds up to two pages per
+    # compression.max_concurrent_pages at once, in each web worker.
+    max_memory_mebibytes: int = 0
+    # Converter instances kept for reuse per process; 0 builds one per call.
+    converter_pool_size: int = 32
+
+    @property
+    def max_memory_bytes(self) -> Optional[int]:
+        return self.max_memory_mebibytes * BYTES_PER_MEBIBYTE or None
+
+
+@dataclass(frozen=True)
+class PdfConfig:
+    # Processes rasterizing PDF pages, shared by all PDFs of a web worker and
+    # capped at the CPU count; 1 renders in the calling thread.
+    render_workers: int = 4
+    # Rendered pages buffered ahead of the consumer; 0 means two per worker.
+    max_pages_in_flight: int = 0
+
+
+@dataclass(frozen=True)
+class AvifConfig:
+    # AVIF encoder threads for the whole machine; "auto" means one per CPU.
+    encoder_threads: WebWorkerCount = WebWorkerCount.auto()
+    autotiling: bool = True
+
+    def thread_budget(self, concurrent_encodes: int) -> EncoderThreadBudget:
+        """The budget shared by `concurrent_encodes` encodes running at once."""
+        return EncoderThreadBudget(
+            total_threads=self.encoder_threads.resolve(fallback_when_auto=os.cpu_count() or 1),
+            concurrent_encodes=max(1, concurrent_encodes),
+            autotiling=self.autotiling,
+        )
+
+
+@dataclass(frozen=True)
+class JobsConfig:
+    # Background /api/jobs conversions running at once per web worker.
+    max_concurrent: int = 1
+    # Further jobs accepted while all runners are busy; more get HTTP 503.
+    max_queued: int = 16
+
+
+@dataclass(frozen=True)
+class ConversionCacheConfig:
+    enabled: bool = True
+    max_size_mebibytes: int = 512
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self.max_size_mebibytes * BYTES_PER_MEBIBYTE
 
 
 @dataclass(frozen=True)
@@ -71,4 +166,10 @@ class AppConfig:
     crop_preview: CropPreviewConfig
     formats: FormatsConfig
     features: FeaturesConfig
-    rembg: RembgConfig
\ No newline at end of file
+    rembg: RembgConfig
+    compression: CompressionConfig
+    conversion_cache: ConversionCacheConfig = ConversionCacheConfig()
+    jobs: JobsConfig = JobsConfig()
+    pdf: PdfConfig = PdfConfig()
+    processing: ProcessingConfig = ProcessingConfig()
+    avif: AvifConfig = AvifConfig()
\ No newline at end of file
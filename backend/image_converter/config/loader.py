@@ -15,10 +15,16 @@ from typing import Callable, Optional, Tuple, TypeVar
 
 from backend.image_converter.config.app_config import (
     AppConfig,
+    AvifConfig,
+    CompressionConfig,
+    ConversionCacheConfig,
     CropPreviewConfig,
     FeaturesConfig,
     FormatsConfig,
+    JobsConfig,
     LoggingConfig,
+    PdfConfig,
+    ProcessingConfig,
     RembgConfig,
     TemporaryStorageConfig,
     UploadsConfig,
@@ -73,6 +79,10 @@ def load_from_file(path: Path) -> AppConfig:
     )
     uploads = UploadsConfig(
         max_file_size_mebibytes=reader.require_int(("uploads", "max_file_size_mebibytes"), minimum=1),
+        streaming_ingest=reader.optional_bool(("uploads", "streaming_ingest"), default=True),
+        spool_threshold_mebibytes=reader.optional_int(
+            ("uploads", "spool_threshold_mebibytes"), default=16, minimum=1
+        ),
     )
     web = WebConfig(
         host=reader.require_str(("web", "host")),
@@ -110,7 +120,59 @@ def load_from_file(path: Path) -> AppConfig:
             ("features", "is_dev_mode_enabled"),
         ),
     )
-    rembg = RembgConfig(model_name=reader.require_str(("rembg", "model_name")))
+    rembg = RembgConfig(
+        model_name=reader.require_str(("rembg", "model_name")),
+        warm_up_on_boot=reader.optional_bool(("rembg", "warm_up_on_boot"), default=False),
+        max_concurrent_inferences=reader.optional_int(
+            ("rembg", "max_concurrent_inferences"), default=1, minimum=1
+        ),
+        idle_eviction_seconds=reader.optional_int(
+            ("rembg", "idle_eviction_seconds"), default=0, minimum=0
+        ),
+        batch_size=reader.optional_int(("rembg", "batch_size"), default=1, minimum=1, maximum=32),
+        batch_wait_milliseconds=reader.optional_int(
+            ("rembg", "batch_wait_milliseconds"), default=20, minimum=0, maximum=1000
+        ),
+        intra_op_threads=reader.optional_int(("rembg", "intra_op_threads"), default=0, minimum=0),
+        inter_op_threads=reader.optional_int(("rembg", "inter_op_threads"), default=0, minimum=0),
+    )
+    compression = CompressionConfig(
+        max_concurrent_pages=reader.optional_worker_count(
+            ("compression", "max_concurrent_pages"),
+        ),
+        max_concurrent_background_removals=reader.optional_int(
+            ("compression", "max_concurrent_background_removals"), default=1, minimum=1
+        ),
+        target_size_proxy_pixels=reader.optional_int(
+            ("compression", "target_size_proxy_pixels"), default=0, minimum=0
+        ),
+    )
+    conversion_cache = ConversionCacheConfig(
+        enabled=reader.optional_bool(("conversion_cache", "enabled"), default=True),
+        max_size_mebibytes=reader.optional_int(
+            ("conversion_cache", "max_size_mebibytes"), default=512, minimum=0
+        ),
+    )
+    jobs = JobsConfig(
+        max_concurrent=reader.optional_int(("jobs", "max_concurrent"), default=1, minimum=1),
+        max_queued=reader.optional_int(("jobs", "max_queued"), default=16, minimum=0),
+    )
+    pdf = PdfConfig(
+        render_workers=reader.optional_int(("pdf", "render_workers"), default=4, minimum=1),
+        max_pages_in_flight=reader.optional_int(("pdf", "max_pages_in_flight"), default=0, minimum=0),
+    )
+    processing = ProcessingConfig(
+        max_memory_mebibytes=reader.optional_int(
+            ("processing", "max_memory_mebibytes"), default=0, minimum=0
+        ),
+        converter_pool_size=reader.optional_int(
+            ("processing", "converter_pool_size"), default=32, minimum=0
+        ),
+    )
+    avif = AvifConfig(
+        encoder_threads=reader.optional_worker_count(("avif", "encoder_threads")),
+        autotiling=reader.optional_bool(("avif", "autotiling"), default=True),
+    )
 
     if errors:
         raise ConfigError("invalid backend config:\n  - " + "\n  - ".join(errors))
@@ -124,6 +186,12 @@ def load_from_file(path: Path) -> AppConfig:
         formats=formats,
         features=features,
         rembg=rembg,
+        compression=compression,
+        conversion_cache=conversion_cache,
+        jobs=jobs,
+        pdf=pdf,
+        processing=processing,
+        avif=avif,
     )
 
 
@@ -220,10 +288,26 @@ class _Reader:
             fallback=False,
         )
 
+    def optional_bool(self, path: Tuple[str, ...], *, default: bool) -> bool:
+        """Like ``require_bool`` but returns ``default`` when the key is absent."""
+        if self._peek(path) is _SENTINEL:
+            return default
+        return self.require_bool(path)
+
     def require_web_workers(self, path: Tuple[str, ...]) -> WebWorkerCount:
         raw = self._lookup(path)
         if raw is _SENTINEL:
             return WebWorkerCount.auto()
+        return self._parse_worker_count(path, raw)
+
+    def optional_worker_count(self, path: Tuple[str, ...]) -> WebWorkerCount:
+        """Like ``require_web_workers`` but a missing key means ``"auto"``."""
+        raw = self._peek(path)
+        if raw is _SENTINEL:
+            return WebWorkerCount.auto()
+        return self._parse_worker_count(path, raw)
+
+    def _parse_worker_count(self, path: Tuple[str, ...], raw: object) -> WebWorkerCount:
         if isinstance(raw, str):
             if raw.strip().lower() != "auto":
                 self._errors.append(
@@ -1,12 +1,25 @@
+from typing import Optional
+
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
 
 class AvifConverter(BaseImageConverter):
     """Converts raw image bytes to an AVIF file on disk."""
 
-    def __init__(self, quality: int, logger: Logger):
+    def __init__(
+        self,
+        quality: int,
+        logger: Logger,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+        threads: Optional[EncoderThreadBudget] = None,
+    ):
         super().__init__(logger)
         self.quality = quality
+        self.effort = effort
+        self.threads = threads
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
-        return self._encode_to_avif(image_data, self.quality)
+    def encode_image(self, image: DecodedImage) -> bytes:
+        return self._encode_to_avif(image.image, self.quality, self.effort, self.threads)
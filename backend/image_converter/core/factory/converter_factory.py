@@ -1,15 +1,25 @@
+from typing import Optional
+
 from backend.image_converter.core.factory.ico_converter import IcoConverter
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.enums.image_format import ImageFormat
 from backend.image_converter.core.factory.jpeg_converter import JpegConverter
 from backend.image_converter.core.factory.png_converter import PngConverter
 from backend.image_converter.core.factory.pdf_converter import PdfConverter
+from backend.image_converter.core.factory.converter_pool import ConverterPoolStats, get_converter_pool
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
 from backend.image_converter.domain.pdf_quality import PdfQuality
 from ..interfaces.iconverter import IImageConverter
 from backend.image_converter.core.exceptions import ConversionError
 
 class ImageConverterFactory:
-    """Factory to produce the correct converter instance based on the desired ImageFormat."""
+    """
+    Factory to produce the correct converter instance based on the desired ImageFormat.
+
+    Instances come from the process's converter pool, so the same arguments
+    (logger included) return the same thread-safe converter.
+    """
 
     @staticmethod
     def create_converter(
@@ -22,6 +32,32 @@ class ImageConverterFactory:
         pdf_margin_mm: float | None = None,
         pdf_paginate: bool = False,
         pdf_quality: PdfQuality = PdfQuality.HIGH,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+        avif_threads: Optional[EncoderThreadBudget] = None,
+    ) -> IImageConverter:
+        args = (
+            image_format, quality, logger, use_rembg,
+            pdf_preset, pdf_scale, pdf_margin_mm, pdf_paginate, pdf_quality, effort, avif_threads,
+        )
+        return get_converter_pool().get(args, lambda: ImageConverterFactory._build_converter(*args))
+
+    @staticmethod
+    def pool_stats() -> ConverterPoolStats:
+        return get_converter_pool().stats()
+
+    @staticmethod
+    def _build_converter(
+        image_format: ImageFormat,
+        quality: int,
+        logger: Logger,
+        use_rembg: bool,
+        pdf_preset,
+        pdf_scale: str,
+        pdf_margin_mm: float | None,
+        pdf_paginate: bool,
+        pdf_quality: PdfQuality,
+        effort: EncoderEffort,
+        avif_threads: Optional[EncoderThreadBudget],
     ) -> IImageConverter:
         
         match (image_format, use_rembg):
@@ -30,21 +66,29 @@ class ImageConverterFactory:
             
             case (ImageFormat.PNG, True):
                 from backend.image_converter.core.factory.rembg_png_converter import RembgPngConverter
-                return RembgPngConverter(logger=logger)
+                from backend.image_converter.core.internals.rembg_batching import get_mask_batcher
+                return RembgPngConverter(logger=logger, mask_batcher=get_mask_batcher(), effort=effort)
             
             case (ImageFormat.PNG, False):
-                return PngConverter(logger=logger)
+                return PngConverter(logger=logger, effort=effort)
             
             case (ImageFormat.ICO, _):
                 return IcoConverter(logger=logger)
             
             case (ImageFormat.AVIF, True):
                 from backend.image_converter.core.factory.rembg_avif_converter import RembgAvifConverter
-                return RembgAvifConverter(quality=quality, logger=logger)
+                from backend.image_converter.core.internals.rembg_batching import get_mask_batcher
+                return RembgAvifConverter(
+                    quality=quality,
+                    logger=logger,
+                    mask_batcher=get_mask_batcher(),
+                    effort=effort,
+                    threads=avif_threads,
+                )
             
             case (ImageFormat.AVIF, False):
                 from backend.image_converter.core.factory.avif_converter import AvifConverter
-                return AvifConverter(quality=quality, logger=logger)
+                return AvifConverter(quality=quality, logger=logger, effort=effort, threads=avif_threads)
 
             case (ImageFormat.PDF, _):
                 return PdfConverter(
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from backend.image_converter.config import settings
+from backend.image_converter.core.interfaces.iconverter import IImageConverter
+
+
+@dataclass(frozen=True)
+class ConverterPoolStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+
+class ConverterPool:
+    """
+    Converter instances kept for reuse, keyed by every argument they were
+    built with, least recently used first out once `capacity` is reached.
+
+    Converters keep no per-call state, so one instance can serve any number
+    of threads; reusing it keeps whatever it set up (rembg session handles,
+    encoder settings) warm across pages and requests. A capacity of 0 builds
+    a fresh converter on every call.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = max(0, capacity)
+        self._lock = threading.Lock()
+        self._converters: "OrderedDict[Hashable, IImageConverter]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, build: Callable[[], IImageConverter]) -> IImageConverter:
+        with self._lock:
+            converter = self._converters.get(key)
+            if converter is not None:
+                self._converters.move_to_end(key)
+                self._hits += 1
+                return converter
+            self._misses += 1
+        # Built outside the lock; a racing build of the same key loses to
+        # whichever lands first.
+        converter = build()
+        if not self.capacity:
+            return converter
+        with self._lock:
+            existing = self._converters.setdefault(key, converter)
+            self._converters.move_to_end(key)
+            while len(self._converters) > self.capacity:
+                self._converters.popitem(last=False)
+                self._evictions += 1
+            return existing
+
+    def stats(self) -> ConverterPoolStats:
+        with self._lock:
+            return ConverterPoolStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._converters),
+                capacity=self.capacity,
+            )
+
+
+_pool: Optional[ConverterPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_converter_pool() -> ConverterPool:
+    """Return this process's pool, sized from `processing.converter_pool_size`."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConverterPool(capacity=settings.get().processing.converter_pool_size)
+        return _pool
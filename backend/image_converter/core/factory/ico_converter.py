@@ -1,7 +1,6 @@
 from io import BytesIO
 
-from PIL import Image
-
+from backend.image_converter.domain.decoded_image import DecodedImage
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
 
@@ -11,17 +10,17 @@ class IcoConverter(BaseImageConverter):
     but includes *only* one resolution.
 
     The caller (processor) is expected to resize the image_data
-    to the desired dimension before calling `encode_to_bytes`.
+    to the desired dimension before calling `encode_image`.
     """
 
     def __init__(self, logger: Logger):
         super().__init__(logger)
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
-        with Image.open(BytesIO(image_data)) as img:
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
+    def encode_image(self, image: DecodedImage) -> bytes:
+        img = image.image
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
 
-            buffer = BytesIO()
-            img.save(buffer, format="ICO")
-            return buffer.getvalue()
+        buffer = BytesIO()
+        img.save(buffer, format="ICO")
+        return buffer.getvalue()
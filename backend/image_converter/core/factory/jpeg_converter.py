@@ -1,41 +1,19 @@
 from io import BytesIO
-from PIL import Image, ImageOps
+from typing import Optional
 
 from backend.image_converter.application.dtos import ConversionDetails
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.jpeg_stream import passthrough_jpeg
+from backend.image_converter.domain.rgb_normalization import normalize_to_rgb
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
 
 
-def _normalize_for_jpeg(img: Image.Image) -> Image.Image:
-    """
-    Ensure deterministic, JPEG-safe pixel data:
-    - apply EXIF orientation
-    - flatten alpha onto white
-    - convert to RGB (handles P/CMYK/L/etc.)
-    """
-    try:
-        img = ImageOps.exif_transpose(img)
-    except Exception:
-        pass
-
-    if img.mode in ("RGBA", "LA"):
-        # composite over white
-        background = Image.new("RGB", img.size, (255, 255, 255))
-        alpha = img.getchannel("A")
-        background.paste(img.convert("RGB"), mask=alpha)
-        img = background
-    elif img.mode not in ("RGB",):
-        # Convert everything else to RGB
-        img = img.convert("RGB")
-
-    return img
-
-
 class JpegConverter(BaseImageConverter):
     """
     Converts raw image bytes to JPEG.
-    - Provides encode_to_bytes() for in-memory size search.
+    - Provides encode_image() / encode_to_bytes() for in-memory size search.
     - convert() reuses encode_to_bytes() and writes to dest_path.
     """
 
@@ -43,24 +21,33 @@ class JpegConverter(BaseImageConverter):
         super().__init__(logger)
         self.quality = int(quality)
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
+    def encode_image(self, image: DecodedImage) -> bytes:
         """
         Encode to JPEG fully in memory and return the encoded bytes.
         This is what your size-targeting binary search calls repeatedly.
-        """
-        with Image.open(BytesIO(image_data)) as img:
-            img = _normalize_for_jpeg(img)
 
-            out = BytesIO()
-            img.save(
-                out,
-                format="JPEG",
-                quality=self.quality,
-                optimize=True,
-                progressive=True,
-                subsampling="4:2:0",
-            )
-            return out.getvalue()
+        A JPEG source that needs no change and was saved at or below
+        `quality` is returned without its metadata instead of re-encoded.
+        """
+        lossless = self.lossless_copy(image)
+        if lossless is not None:
+            return lossless
+        img = normalize_to_rgb(image.image)
+
+        out = BytesIO()
+        img.save(
+            out,
+            format="JPEG",
+            quality=self.quality,
+            optimize=True,
+            progressive=True,
+            subsampling="4:2:0",
+        )
+        return out.getvalue()
+
+    def lossless_copy(self, image: DecodedImage) -> Optional[bytes]:
+        """The source JPEG of `image` stripped of metadata, when it can be kept as is."""
+        return passthrough_jpeg(image, self.quality)
 
     def convert(self, image_data: bytes, source_path: str, dest_path: str) -> Result[ConversionDetails]:
         """Convert bytes to JPEG on disk and return typed details."""
@@ -1,34 +1,29 @@
+import math
 from io import BytesIO
-from tempfile import NamedTemporaryFile
-import os
-from PIL import Image, ImageOps
+from typing import List, Optional
+
+from PIL import Image
 from fpdf import FPDF
 
 from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.jpeg_stream import passthrough_jpeg
+from backend.image_converter.domain.rgb_normalization import normalize_to_rgb
 from backend.image_converter.infrastructure.logger import Logger
+from backend.image_converter.infrastructure.streaming_pdf import PdfPage
 from backend.image_converter.domain.pdf_presets import PdfPreset
 from backend.image_converter.domain.pdf_quality import PdfQuality
 
 
-def _normalize_for_pdf(img: Image.Image) -> Image.Image:
-    try:
-        img = ImageOps.exif_transpose(img)
-    except Exception:
-        pass
-
-    if img.mode in ("RGBA", "LA"):
-        background = Image.new("RGB", img.size, (255, 255, 255))
-        alpha = img.getchannel("A")
-        background.paste(img.convert("RGB"), mask=alpha)
-        img = background
-    elif img.mode != "RGB":
-        img = img.convert("RGB")
-
-    return img
-
-
 class PdfConverter(BaseImageConverter):
-    """Converts raw image bytes to a PDF with optional page presets."""
+    """
+    Converts raw image bytes to a PDF with optional page presets.
+
+    Pages are laid out first (`layout_pages`) and embedded as JPEG from
+    memory. A JPEG source is copied into the PDF without its metadata (no
+    re-encode) when it is placed unchanged and was saved at or below the
+    quality preset's JPEG quality.
+    """
 
     def __init__(
         self,
@@ -46,21 +41,35 @@ class PdfConverter(BaseImageConverter):
         self.pdf_paginate = pdf_paginate
         self.quality = pdf_quality.preset
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
-        with Image.open(BytesIO(image_data)) as img:
-            img = _normalize_for_pdf(img)
-            if self.pdf_preset and self.pdf_preset.size:
-                return self._encode_with_preset(img)
-            return self._encode_original(img)
+    def encode_image(self, image: DecodedImage) -> bytes:
+        pages = self.layout_pages(image)
+        pdf = FPDF(unit="pt", format=(pages[0].page_width, pages[0].page_height))
+        for page in pages:
+            pdf.add_page()
+            pdf.image(BytesIO(page.jpeg), x=page.x, y=page.y, w=page.width, h=page.height)
+        return self._output_pdf(pdf)
+
+    def layout_pages(self, image: DecodedImage) -> List[PdfPage]:
+        """The pages `image` becomes, with their JPEGs already encoded."""
+        img = normalize_to_rgb(image.image)
+        source_jpeg = passthrough_jpeg(image, self.quality.jpeg_quality)
+        if self.pdf_preset and self.pdf_preset.size:
+            pages = self._layout_with_preset(img, source_jpeg)
+        else:
+            pages = [self._layout_original(img, source_jpeg)]
+        if not pages:
+            raise ValueError("The image is too small to place on a PDF page.")
+        return pages
 
-    def _encode_original(self, img: Image.Image) -> bytes:
+    def _layout_original(self, img: Image.Image, source_jpeg: Optional[bytes] = None) -> PdfPage:
         page_w, page_h = img.size
-        img = self._limit_original_dimensions(img)
-        pdf = FPDF(unit="pt", format=(page_w, page_h))
-        pdf.add_page()
-        return self._render_pdf(pdf, img, x=0, y=0, w=page_w, h=page_h)
+        limited = self._limit_original_dimensions(img)
+        return self._place(
+            limited, page_w, page_h, x=0, y=0, w=page_w, h=page_h,
+            source_jpeg=source_jpeg if limited is img else None,
+        )
 
-    def _encode_with_preset(self, img: Image.Image) -> bytes:
+    def _layout_with_preset(self, img: Image.Image, source_jpeg: Optional[bytes] = None) -> List[PdfPage]:
         page_w, page_h = self.pdf_preset.size
         if self.pdf_preset.auto_rotate:
             img_is_landscape = img.width > img.height
@@ -76,7 +85,7 @@ class PdfConverter(BaseImageConverter):
             raise ValueError("PDF margin is too large for the page size.")
 
         if self.pdf_paginate:
-            return self._encode_paginated(img, page_w, page_h, inner_w, inner_h, margin_pt)
+            return self._layout_paginated(img, page_w, page_h, inner_w, inner_h, margin_pt)
 
         if self.pdf_scale == "fill":
             img = self._crop_to_aspect(img, inner_w / inner_h)
@@ -91,13 +100,15 @@ class PdfConverter(BaseImageConverter):
             offset_x = margin_pt + (inner_w - target_w) / 2
             offset_y = margin_pt + (inner_h - target_h) / 2
 
-        img = self._downsample_for_render(img, target_w, target_h)
+        placed = self._downsample_for_render(img, target_w, target_h)
+        if placed is not img or self.pdf_scale == "fill":
+            source_jpeg = None
 
-        pdf = FPDF(unit="pt", format=(page_w, page_h))
-        pdf.add_page()
-        return self._render_pdf(pdf, img, x=offset_x, y=offset_y, w=target_w, h=target_h)
+        return [self._place(
+            placed, page_w, page_h, x=offset_x, y=offset_y, w=target_w, h=target_h, source_jpeg=source_jpeg
+        )]
 
-    def _encode_paginated(
+    def _layout_paginated(
         self,
         img: Image.Image,
         page_w: float,
@@ -105,7 +116,7 @@ class PdfConverter(BaseImageConverter):
         inner_w: float,
         inner_h: float,
         margin_pt: float,
-    ) -> bytes:
+    ) -> List[PdfPage]:
         scale = inner_w / img.width
         if scale <= 0:
             raise ValueError("Invalid scale for PDF pagination.")
@@ -113,10 +124,8 @@ class PdfConverter(BaseImageConverter):
         if slice_height_px <= 0:
             raise ValueError("Invalid slice height for PDF pagination.")
 
-        import math
         page_count = max(1, math.ceil(img.height / slice_height_px))
-        pdf = FPDF(unit="pt", format=(page_w, page_h))
-
+        pages = []
         for page_index in range(page_count):
             top_px = page_index * slice_height_px
             bottom_px = min((page_index + 1) * slice_height_px, img.height)
@@ -127,51 +136,36 @@ class PdfConverter(BaseImageConverter):
             slice_img = img.crop((0, top_i, img.width, bottom_i))
             target_h = (bottom_px - top_px) * scale
             slice_img = self._downsample_for_render(slice_img, inner_w, target_h)
+            pages.append(self._place(
+                slice_img, page_w, page_h, x=margin_pt, y=margin_pt, w=inner_w, h=target_h
+            ))
+        return pages
 
-            pdf.add_page()
-            self._render_pdf(
-                pdf,
-                slice_img,
-                x=margin_pt,
-                y=margin_pt,
-                w=inner_w,
-                h=target_h,
-                return_bytes=False,
-            )
-
-        return self._output_pdf(pdf)
-
-    def _render_pdf(
+    def _place(
         self,
-        pdf: FPDF,
         img: Image.Image,
+        page_w: float,
+        page_h: float,
         x: float,
         y: float,
         w: float,
         h: float,
-        return_bytes: bool = True,
-    ) -> bytes:
-        tmp_path = None
-        try:
-            with NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                tmp_path = tmp.name
-                img.save(
-                    tmp,
-                    format="JPEG",
-                    quality=self.quality.jpeg_quality,
-                    optimize=True,
-                    progressive=True,
-                )
-            pdf.image(tmp_path, x=x, y=y, w=w, h=h)
-            if return_bytes:
-                return self._output_pdf(pdf)
-            return b""
-        finally:
-            if tmp_path:
-                try:
-                    os.unlink(tmp_path)
-                except OSError:
-                    pass
+        source_jpeg: Optional[bytes] = None,
+    ) -> PdfPage:
+        """Encode `img` for a page; `source_jpeg` is embedded in its stead."""
+        if source_jpeg is not None:
+            jpeg = source_jpeg
+        else:
+            buffer = BytesIO()
+            img.save(
+                buffer,
+                format="JPEG",
+                quality=self.quality.jpeg_quality,
+                optimize=True,
+                progressive=True,
+            )
+            jpeg = buffer.getvalue()
+        return PdfPage(page_width=page_w, page_height=page_h, x=x, y=y, width=w, height=h, jpeg=jpeg)
 
     @staticmethod
     def _output_pdf(pdf: FPDF) -> bytes:
@@ -1,18 +1,14 @@
-from io import BytesIO
-
-from PIL import Image
-
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_effort import EncoderEffort
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
 
 class PngConverter(BaseImageConverter):
     """Converts raw image bytes to a PNG file on disk, preserving the alpha channel."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, effort: EncoderEffort = EncoderEffort.BALANCED):
         super().__init__(logger)
+        self.effort = effort
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
-        with Image.open(BytesIO(image_data)) as img:
-            buffer = BytesIO()
-            img.save(buffer, "PNG")
-            return buffer.getvalue()
+    def encode_image(self, image: DecodedImage) -> bytes:
+        return self._encode_to_png(image.image, self.effort)
@@ -1,35 +1,30 @@
 from typing import Optional
 
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
 from backend.image_converter.infrastructure.logger import Logger
-from backend.image_converter.core.internals.rembg_config import load_rembg_model_name
-from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
+from backend.image_converter.core.internals.rembg_batching import RembgMaskBatcher
+from backend.image_converter.core.internals.rembg_sessions import RembgSessionRegistry
+from backend.image_converter.core.interfaces.rembg_converter import RembgConverter
 
-class RembgAvifConverter(BaseImageConverter):
+class RembgAvifConverter(RembgConverter):
     """
     Converts raw image bytes to an AVIF with background removed using rembg.
     """
 
-    removes_background = True
-
-    def __init__(self, quality: int, logger: Logger, model_name: Optional[str] = None):
-        super().__init__(logger)
+    def __init__(
+        self,
+        quality: int,
+        logger: Logger,
+        model_name: Optional[str] = None,
+        session_registry: Optional[RembgSessionRegistry] = None,
+        mask_batcher: Optional[RembgMaskBatcher] = None,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+        threads: Optional[EncoderThreadBudget] = None,
+    ):
+        super().__init__(logger, model_name, session_registry, mask_batcher, effort)
         self.quality = quality
-        self.model_name = model_name or load_rembg_model_name()
-        self._session: Optional[object] = None
-
-    def _get_background_removal_session(self):
-        if self._session is None:
-            from rembg import new_session
-            self._session = new_session(self.model_name)
-        return self._session
+        self.threads = threads
 
-    def encode_to_bytes(self, image_data: bytes) -> bytes:
-        from rembg import remove
-        raw_output = remove(
-            image_data,
-            session=self._get_background_removal_session(),
-            post_process_mask=True,
-            alpha_matting=False,
-        )
-        
-        return self._encode_to_avif(raw_output, self.quality)
+    def _encode_cutout(self, cutout) -> bytes:
+        return self._encode_to_avif(self._as_image(cutout), self.quality, self.effort, self.threads)
@@ -1,12 +1,21 @@
-from dataclasses import asdict
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
 import os
 import json
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.internals.file_manager import FileManager
 from backend.image_converter.core.internals.image_loader import ImageLoader
 from backend.image_converter.domain.image_resizer import ImageResizer
+from backend.image_converter.infrastructure.image_probe import ImageProbe
+from backend.image_converter.infrastructure.conversion_cache import CachedOutput, ConversionCache
+from backend.image_converter.infrastructure.streaming_pdf import MERGED_PDF_NAME, StreamingPdfWriter
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
+from backend.image_converter.domain.pdf_merge import natural_sort_key
 from backend.image_converter.domain.pdf_quality import PdfQuality
+from backend.image_converter.domain.raster_target import RasterTarget
 from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
 from backend.image_converter.core.enums.image_format import ImageFormat
 from backend.image_converter.core.enums.conversion_error import ConversionError
@@ -22,12 +31,42 @@ from backend.image_converter.application.dtos import (
 )
 from backend.image_converter.core.internals.utilities import Result, T
 from backend.image_converter.application.payload_expander_factory import create_payload_expander
-from PIL import Image
-from io import BytesIO
 
 class PayloadExpansionError(RuntimeError):
     """Raised when result-wrapped operations fail during payload processing."""
 
+
+@dataclass(frozen=True)
+class _PoolTask:
+    """One unit of work for a pool worker: a whole file, or a range of PDF pages."""
+
+    file_path: str
+    page_numbers: Optional[Tuple[int, ...]] = None
+
+
+# Set once per worker process by `_init_pool_worker`; each worker owns its own
+# processor (and therefore its own converter, resizer and payload expander).
+_pool_processor: Optional["ImageConversionProcessor"] = None
+
+
+def _init_pool_worker(options: Dict[str, Any]) -> None:
+    global _pool_processor
+    try:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+    except ImportError:
+        pass
+    _pool_processor = ImageConversionProcessor(**options)
+
+
+def _run_pool_task(task: _PoolTask) -> Tuple[List[PageProcessingResult], List[dict]]:
+    processor = _pool_processor
+    results = processor._convert_file(task.file_path, page_numbers=task.page_numbers)
+    logs = list(processor.logger.logs)
+    processor.logger.logs.clear()
+    return results, logs
+
+
 class ImageConversionProcessor:
     def __init__(
         self,
@@ -43,8 +82,17 @@ class ImageConversionProcessor:
         pdf_quality: PdfQuality = PdfQuality.HIGH,
         use_rembg: bool = False,
         debug: bool = False,
-        json_output: bool = False
+        json_output: bool = False,
+        jobs: int = 1,
+        fast_downscale: bool = True,
+        conversion_cache: Optional[ConversionCache] = None,
+        max_decoded_page_bytes: Optional[int] = None,
+        pdf_merge: bool = False,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+        avif_threads: Optional[EncoderThreadBudget] = None,
     ):
+        if jobs < 1:
+            raise ConversionError(f"jobs must be >= 1, got {jobs}")
         self.source = source
         self.destination = destination
         self.image_format = image_format
@@ -58,11 +106,20 @@ class ImageConversionProcessor:
         self.use_rembg = use_rembg
         self.debug = debug
         self.json_output = json_output
+        self.jobs = jobs
+        self.fast_downscale = fast_downscale
+        self.conversion_cache = conversion_cache
+        self.max_decoded_page_bytes = max_decoded_page_bytes
+        self.pdf_merge = pdf_merge and image_format == ImageFormat.PDF
+        self.merged_pdf: Optional[StreamingPdfWriter] = None
+        self.effort = effort
+        self.avif_threads = avif_threads or EncoderThreadBudget.whole_machine()
 
         self.logger = Logger(debug=self.debug, json_output=self.json_output)
         self.file_manager = FileManager(self.source, self.destination, self.logger)
         self.image_loader = ImageLoader()
-        self.image_resizer = ImageResizer()
+        self.image_resizer = ImageResizer(fast_downscale=self.fast_downscale)
+        self.image_probe = ImageProbe()
         self.pdf_preset_config = None
         if self.image_format == ImageFormat.PDF and self.pdf_preset:
             from backend.image_converter.domain.pdf_presets import resolve_pdf_preset, resolve_pdf_scale
@@ -80,6 +137,14 @@ class ImageConversionProcessor:
             self.pdf_paginate = False
             self.pdf_margin_mm = None
         self.payload_expander = create_payload_expander(self.logger)
+        self.raster_target = RasterTarget.for_conversion(
+            self.width,
+            self.pdf_preset_config,
+            self.pdf_scale,
+            self.pdf_margin_mm,
+            self.pdf_paginate,
+            self.pdf_quality,
+        )
         self.converter = ImageConverterFactory.create_converter(
             image_format=self.image_format,
             quality=self.quality,
@@ -90,20 +155,37 @@ class ImageConversionProcessor:
             pdf_margin_mm=self.pdf_margin_mm,
             pdf_paginate=self.pdf_paginate,
             pdf_quality=self.pdf_quality,
+            effort=self.effort,
+            avif_threads=self.avif_threads,
         )
         self.results: List[PageProcessingResult] = []
 
     def run(self) -> None:
-        if os.path.isfile(self.source):
-            self.process_single_file(self.source)
-        elif os.path.isdir(self.source):
-            self.process_directory(self.source)
-        else:
-            raise ConversionError(f"Source path '{self.source}' is neither file nor directory.")
+        if self.pdf_merge:
+            self.file_manager.ensure_destination()
+            self.merged_pdf = StreamingPdfWriter(os.path.join(self.destination, MERGED_PDF_NAME))
+        try:
+            if os.path.isfile(self.source):
+                self.process_single_file(self.source)
+            elif os.path.isdir(self.source):
+                self.process_directory(self.source)
+            else:
+                raise ConversionError(f"Source path '{self.source}' is neither file nor directory.")
+        finally:
+            if self.merged_pdf is not None:
+                self._finish_merged_pdf()
 
         summary = self.generate_summary()
         self.output_results(summary)
 
+    def _finish_merged_pdf(self) -> None:
+        writer, self.merged_pdf = self.merged_pdf, None
+        if writer.page_count == 0:
+            writer.abort()
+            return
+        writer.close()
+        self.logger.log(f"Merged {writer.page_count} page(s) into {writer.path}", LogLevel.INFO.value)
+
     def process_single_file(self, file_path: str) -> None:
         self.logger.log(f"Processing single file: {file_path}", LogLevel.INFO.value)
         self.file_manager.ensure_destination()
@@ -114,18 +196,96 @@ class ImageConversionProcessor:
         self.logger.log(f"Processing directory: {directory}", LogLevel.INFO.value)
         self.file_manager.ensure_destination()
         supported_files = self.file_manager.list_supported_files()
-        for file_url in supported_files:
-            path = file_url.path
+        paths = [file_url.path for file_url in supported_files]
+        if self.merged_pdf is not None:
+            # Pages are appended in natural filename order, one file at a time.
+            paths.sort(key=lambda path: natural_sort_key(os.path.basename(path)))
+        elif self.jobs > 1 and paths:
+            self.results.extend(self._convert_files_in_pool(paths))
+            return
+        for path in paths:
             result = self._convert_file(path)
             self.results.extend(result)
 
-    def _convert_file(self, file_path: str) -> List[PageProcessingResult]:
+    def _convert_files_in_pool(self, paths: Sequence[str]) -> List[PageProcessingResult]:
+        """
+        Fan files out to a process pool and merge the per-file results back in
+        submission order, so the summary matches a sequential run.
+        """
+        tasks = self._plan_pool_tasks(paths)
+        workers = min(self.jobs, len(tasks))
+        self.logger.log(
+            f"Converting {len(paths)} file(s) as {len(tasks)} task(s) on {workers} worker process(es).",
+            LogLevel.DEBUG.value,
+        )
+        results: List[PageProcessingResult] = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pool_worker,
+            initargs=(self._pool_worker_options(),),
+        ) as pool:
+            for task_results, logs in pool.map(_run_pool_task, tasks):
+                results.extend(task_results)
+                self.logger.logs.extend(logs)
+        return results
+
+    def _plan_pool_tasks(self, paths: Sequence[str]) -> List[_PoolTask]:
+        """
+        One task per file, except PDFs, which are split into contiguous page
+        ranges so a single large document is rendered by several workers.
+        """
+        tasks: List[_PoolTask] = []
+        for path in paths:
+            if not path.lower().endswith(".pdf"):
+                tasks.append(_PoolTask(path))
+                continue
+            count_result = self.payload_expander.pdf_extractor.count_pages(path, os.path.basename(path))
+            if not count_result.is_successful or count_result.value <= 1:
+                tasks.append(_PoolTask(path))
+                continue
+            page_count = count_result.value
+            chunk_size = math.ceil(page_count / self.jobs)
+            for start in range(1, page_count + 1, chunk_size):
+                stop = min(start + chunk_size, page_count + 1)
+                tasks.append(_PoolTask(path, tuple(range(start, stop))))
+        return tasks
+
+    def _pool_worker_options(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "destination": self.destination,
+            "image_format": self.image_format,
+            "quality": self.quality,
+            "width": self.width,
+            "pdf_preset": self.pdf_preset,
+            "pdf_scale": self.pdf_scale,
+            "pdf_margin_mm": self.pdf_margin_mm,
+            "pdf_paginate": self.pdf_paginate,
+            "pdf_quality": self.pdf_quality,
+            "use_rembg": self.use_rembg,
+            "debug": self.debug,
+            "json_output": self.json_output,
+            "fast_downscale": self.fast_downscale,
+            "conversion_cache": self.conversion_cache,
+            "max_decoded_page_bytes": self.max_decoded_page_bytes,
+            "effort": self.effort,
+            "avif_threads": self.avif_threads,
+        }
+
+    def _convert_file(
+        self,
+        file_path: str,
+        page_numbers: Optional[Sequence[int]] = None,
+    ) -> List[PageProcessingResult]:
         """
         1) Load file bytes,
-        2) Expand into per-page payloads (PDF aware),
+        2) Expand into per-page payloads (PDF aware, optionally limited to `page_numbers`),
         3) Resize if needed,
         4) Convert (JPEG/PNG/ICO),
         5) Return list of result dicts (one per generated file).
+
+        Whole files are looked up in (and stored to) the conversion cache;
+        page ranges of a split PDF and merged PDFs bypass it.
         """
         base_name, _ = os.path.splitext(os.path.basename(file_path))
         extension = self.image_format.get_file_extension()
@@ -134,7 +294,18 @@ class ImageConversionProcessor:
         try:
             load_result = self.image_loader.load_image_as_bytes(file_path)
             image_data = self._unwrap_result(load_result)
-            payload_result = self.payload_expander.expand(os.path.basename(file_path), image_data)
+            cache_key = None
+            if self.conversion_cache is not None and page_numbers is None and self.merged_pdf is None:
+                cache_key = self.conversion_cache.build_key(image_data, self._cache_params())
+                cached = self._restore_from_cache(cache_key, file_path, base_name)
+                if cached is not None:
+                    return cached
+            payload_result = self.payload_expander.expand(
+                os.path.basename(file_path),
+                image_data,
+                page_numbers=page_numbers,
+                raster_target=self.raster_target,
+            )
             page_payloads = self._unwrap_result(payload_result)
         except Exception as e:
             error_msg = f"Error preparing {file_path}: {e}"
@@ -154,8 +325,62 @@ class ImageConversionProcessor:
                 )
             )
 
+        if cache_key is not None and results and all(r.is_successful for r in results):
+            self.conversion_cache.store(cache_key, [
+                (
+                    CachedOutput(
+                        suffix=r.file[len(base_name):],
+                        original_width=r.original_width,
+                        resized_width=r.resized_width,
+                    ),
+                    r.destination,
+                )
+                for r in results
+            ])
         return results
 
+    def _cache_params(self) -> Dict[str, Any]:
+        """Every setting that can change the files written for an input."""
+        return {
+            "pipeline": "cli",
+            "format": self.image_format.value,
+            "quality": self.quality,
+            "width": self.width,
+            "fast_downscale": self.fast_downscale,
+            "max_decoded_page_bytes": self.max_decoded_page_bytes,
+            "pdf_preset": self.pdf_preset,
+            "pdf_scale": self.pdf_scale,
+            "pdf_margin_mm": self.pdf_margin_mm,
+            "pdf_paginate": self.pdf_paginate,
+            "pdf_quality": self.pdf_quality.value,
+            "effort": self.effort.value,
+            "avif_autotiling": self.avif_threads.autotiling,
+            "rembg_model": getattr(self.converter, "model_name", None) if self.use_rembg else None,
+        }
+
+    def _restore_from_cache(
+        self, cache_key: str, file_path: str, base_name: str
+    ) -> Optional[List[PageProcessingResult]]:
+        hit = self.conversion_cache.lookup(cache_key)
+        if hit is None:
+            return None
+        restored = self.conversion_cache.restore(hit, self.destination, base_name)
+        if not restored.is_successful:
+            return None
+        self.logger.log(f"Reused cached conversion for {file_path}", LogLevel.DEBUG.value)
+        return [
+            PageProcessingResult(
+                file=name,
+                source=file_path,
+                destination=os.path.join(self.destination, name),
+                original_width=output.original_width,
+                resized_width=output.resized_width,
+                is_successful=True,
+                error=None,
+            )
+            for name, output in zip(restored.value, hit.outputs)
+        ]
+
     def _convert_page(
         self,
         file_path: str,
@@ -166,31 +391,46 @@ class ImageConversionProcessor:
         page_label = payload.label
 
         try:
-            data = payload.data
-            with Image.open(BytesIO(data)) as temp_img:
-                original_width, _ = temp_img.size
-            
-            self.logger.log(f"Opened image: {page_label} ({original_width}px, {len(data)} bytes)", LogLevel.DEBUG.value)
+            metadata = self._unwrap_result(payload.probe(self.image_probe))
+            original_width = metadata.width
+
+            self.logger.log(
+                f"Opened image: {page_label} ({metadata.width}x{metadata.height}px, {metadata.mode})",
+                LogLevel.DEBUG.value,
+            )
             new_width = original_width
 
-            if self.image_format == ImageFormat.PDF and self.pdf_preset_config:
-                data = payload.data
-            elif self.width and self.width > 0:
-                data = self.image_resizer.resize_image(payload.data, self.width)
-                with Image.open(BytesIO(data)) as resized_img:
-                    new_width, _ = resized_img.size
-
-            convert_result = self.converter.convert(
-                image_data=data,
-                source_path=file_path,
-                dest_path=dest_path
+            # PDF page presets size the image themselves; --width does not apply.
+            uses_pdf_preset = self.image_format == ImageFormat.PDF and self.pdf_preset_config
+            needs_resize = (
+                not uses_pdf_preset and self.width and self.width > 0 and self.width != original_width
             )
-            conv_result = self._unwrap_conversion_result(convert_result)
+            if needs_resize:
+                image = payload.decode(
+                    draft_width=self.image_resizer.draft_width(self.width),
+                    memory_limit_bytes=self.max_decoded_page_bytes,
+                )
+                image = self.image_resizer.resize(image, self.width)
+                new_width = image.width
+            else:
+                image = payload.decode(memory_limit_bytes=self.max_decoded_page_bytes)
+
+            if self.merged_pdf is not None:
+                for page in self.converter.layout_pages(image):
+                    self.merged_pdf.add_page(page)
+                dest_name, destination = MERGED_PDF_NAME, self.merged_pdf.path
+            else:
+                convert_result = self.converter.convert_image(
+                    image=image,
+                    source_path=file_path,
+                    dest_path=dest_path
+                )
+                destination = self._unwrap_conversion_result(convert_result).destination
 
             return PageProcessingResult(
                 file=dest_name,
                 source=file_path,
-                destination=conv_result.destination,
+                destination=destination,
                 original_width=original_width,
                 resized_width=new_width,
                 is_successful=True,
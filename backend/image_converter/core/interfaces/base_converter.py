@@ -1,8 +1,12 @@
 import traceback
 from io import BytesIO
+from typing import Callable, Optional, Union
 from PIL import Image
 from backend.image_converter.application.dtos import ConversionDetails
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.interfaces.iconverter import IImageConverter
 
@@ -10,6 +14,9 @@ class BaseImageConverter(IImageConverter):
     """
     Abstract base class for all image converters.
     Provides common functionality for saving converted images and stripping metadata.
+
+    Subclasses implement `encode_image`; the byte-based `encode_to_bytes` and
+    `convert` entry points are thin adapters that decode once and delegate.
     """
 
     # Converters that strip the background (e.g. rembg-based) set this to True so
@@ -23,8 +30,22 @@ class BaseImageConverter(IImageConverter):
         """
         Standard conversion flow: encode, write to disk, and return details.
         """
+        return self._convert_with(lambda: self.encode_to_bytes(image_data), source_path, dest_path)
+
+    def convert_image(self, image: DecodedImage, source_path: str, dest_path: str) -> Result[ConversionDetails]:
+        """
+        Same as `convert`, for a page that has already been decoded.
+        """
+        return self._convert_with(lambda: self.encode_image(image), source_path, dest_path)
+
+    def _convert_with(
+        self,
+        encode: Callable[[], bytes],
+        source_path: str,
+        dest_path: str,
+    ) -> Result[ConversionDetails]:
         try:
-            converted_data = self.encode_to_bytes(image_data)
+            converted_data = encode()
             self._write_to_disk(converted_data, dest_path)
             
             self.logger.log(f"Successfully converted and saved to {dest_path}", "debug")
@@ -41,6 +62,12 @@ class BaseImageConverter(IImageConverter):
             return Result.failure(error_traceback)
 
     def encode_to_bytes(self, image_data: bytes) -> bytes:
+        """
+        Decode the bytes once and encode them with `encode_image`.
+        """
+        return self.encode_image(DecodedImage.from_bytes(image_data))
+
+    def encode_image(self, image: DecodedImage) -> bytes:
         """
         To be implemented by subclasses to perform the actual encoding.
         """
@@ -51,24 +78,59 @@ class BaseImageConverter(IImageConverter):
         with open(destination_path, "wb") as file:
             file.write(data)
 
-    def strip_metadata_and_normalize(self, image_data: bytes, output_format: str) -> bytes:
+    def strip_metadata_and_normalize(self, image_data: Union[bytes, Image.Image], output_format: str) -> bytes:
         """
-        Normalizes image bytes by re-saving them, effectively stripping most metadata.
+        Normalizes an image (or image bytes) by re-saving it, effectively stripping most metadata.
         """
-        with Image.open(BytesIO(image_data)) as image:
-            output_buffer = BytesIO()
-            image.save(output_buffer, format=output_format)
-            return output_buffer.getvalue()
+        image = self._as_image(image_data)
+        output_buffer = BytesIO()
+        image.save(output_buffer, format=output_format)
+        return output_buffer.getvalue()
 
-    def _encode_to_avif(self, image_data: bytes, quality: int) -> bytes:
+    def _encode_to_avif(
+        self,
+        img: Image.Image,
+        quality: int,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+        threads: Optional[EncoderThreadBudget] = None,
+    ) -> bytes:
         """
-        Encodes image data to AVIF format with the specified quality.
+        Encodes an image to AVIF format with the specified quality and effort,
+        on this encode's share of the thread budget (all CPUs without one).
         Ensures the image is in a compatible mode (RGB or RGBA).
         """
-        with Image.open(BytesIO(image_data)) as img:
-            if img.mode not in ("RGB", "RGBA"):
-                img = img.convert("RGBA")
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+
+        threads = threads or EncoderThreadBudget.whole_machine()
+        buffer = BytesIO()
+        img.save(
+            buffer,
+            format="AVIF",
+            quality=quality,
+            speed=effort.avif.speed,
+            max_threads=threads.threads_per_encode,
+            autotiling=threads.autotiling,
+        )
+        return buffer.getvalue()
+
+    @staticmethod
+    def _encode_to_png(img: Image.Image, effort: EncoderEffort = EncoderEffort.BALANCED) -> bytes:
+        """Encodes an image to PNG with the zlib settings of `effort`."""
+        settings = effort.png
+        buffer = BytesIO()
+        img.save(
+            buffer,
+            format="PNG",
+            optimize=settings.optimize,
+            compress_level=settings.compress_level,
+            compress_type=settings.compress_type,
+        )
+        return buffer.getvalue()
 
-            buffer = BytesIO()
-            img.save(buffer, format="AVIF", quality=quality)
-            return buffer.getvalue()
+    @staticmethod
+    def _as_image(image_data: Union[bytes, Image.Image]) -> Image.Image:
+        """Accept either a decoded image or encoded bytes (e.g. rembg output)."""
+        if isinstance(image_data, Image.Image):
+            return image_data
+        return DecodedImage.from_bytes(image_data).image
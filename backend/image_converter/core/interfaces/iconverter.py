@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from backend.image_converter.application.dtos import ConversionDetails
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.decoded_image import DecodedImage
 
 
 class IImageConverter(ABC):
@@ -11,7 +12,17 @@ class IImageConverter(ABC):
         """Converts image data and saves it to the destination path."""
         pass
 
+    @abstractmethod
+    def convert_image(self, image: DecodedImage, source_path: str, dest_path: str) -> Result[ConversionDetails]:
+        """Converts an already decoded image and saves it to the destination path."""
+        pass
+
     @abstractmethod
     def encode_to_bytes(self, image_data: bytes) -> bytes:
         """Encodes image data to bytes in the target format."""
         pass
+
+    @abstractmethod
+    def encode_image(self, image: DecodedImage) -> bytes:
+        """Encodes an already decoded image to bytes in the target format."""
+        pass
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_effort import EncoderEffort
+from backend.image_converter.infrastructure.logger import Logger
+from backend.image_converter.core.internals.rembg_batching import RembgMaskBatcher
+from backend.image_converter.core.internals.rembg_config import load_rembg_model_name
+from backend.image_converter.core.internals.rembg_sessions import RembgSessionRegistry, get_session_registry
+from backend.image_converter.core.interfaces.base_converter import BaseImageConverter
+
+class RembgConverter(BaseImageConverter):
+    """
+    Base class for converters that remove the background with rembg before
+    encoding. Masks come from the shared batcher when batching is enabled,
+    otherwise from a leased model session.
+
+    Subclasses implement `_encode_cutout` for their output format.
+    """
+
+    removes_background = True
+
+    def __init__(
+        self,
+        logger: Logger,
+        model_name: Optional[str] = None,
+        session_registry: Optional[RembgSessionRegistry] = None,
+        mask_batcher: Optional[RembgMaskBatcher] = None,
+        effort: EncoderEffort = EncoderEffort.BALANCED,
+    ):
+        super().__init__(logger)
+        self.effort = effort
+        self.model_name = model_name or load_rembg_model_name()
+        self.session_registry = session_registry or get_session_registry()
+        self.mask_batcher = mask_batcher
+
+    def _get_background_removal_session(self):
+        return self.session_registry.get(self.model_name)
+
+    def encode_to_bytes(self, image_data: bytes) -> bytes:
+        # rembg decodes raw bytes itself, so skip the base-class decode.
+        return self._encode_cutout(self._remove_background(image_data))
+
+    def encode_image(self, image: DecodedImage) -> bytes:
+        return self._encode_cutout(self._remove_background(image.image))
+
+    def _remove_background(self, source):
+        if self.mask_batcher is not None and self.mask_batcher.max_batch_size > 1:
+            return self.mask_batcher.remove_background(self.model_name, source)
+        from rembg import remove
+        with self.session_registry.lease(self.model_name) as session:
+            return remove(
+                source,
+                session=session,
+                post_process_mask=True,
+                alpha_matting=False,
+            )
+
+    def _encode_cutout(self, cutout) -> bytes:
+        """
+        To be implemented by subclasses to encode the background-free image.
+        """
+        raise NotImplementedError
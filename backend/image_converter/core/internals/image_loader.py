@@ -1,23 +1,24 @@
 import os
 import traceback
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import InputBuffer
+from backend.image_converter.infrastructure.mapped_file import read_file_buffer
 
 class ImageLoader:
     """
     Loads image data as raw bytes from disk.
     """
 
-    def load_image_as_bytes(self, path: str) -> Result[bytes]:
+    def load_image_as_bytes(self, path: str) -> Result[InputBuffer]:
         """
-        Read the entire file as bytes and return a Result.
+        Read the file and return a Result; large files are memory-mapped
+        instead of being copied into a bytes object.
         """
         try:
             if not os.path.exists(path):
                 raise FileNotFoundError(f"File not found: {path}")
 
-            with open(path, "rb") as f:
-                data = f.read()
-            return Result.success(data)
+            return Result.success(read_file_buffer(path))
         except Exception:
             tb = traceback.format_exc()
             return Result.failure(tb)
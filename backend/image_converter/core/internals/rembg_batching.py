@@ -0,0 +1,167 @@
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from backend.image_converter.config import settings
+from backend.image_converter.core.internals.rembg_sessions import RembgSessionRegistry, get_session_registry
+
+
+@dataclass(frozen=True)
+class _Normalization:
+    mean: Tuple[float, float, float]
+    std: Tuple[float, float, float]
+    size: Tuple[int, int]
+
+
+_IMAGENET = ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225))
+
+# Models whose rembg session is "normalize -> run -> min/max-scale channel 0",
+# which is what lets several images share one ONNX call. Values mirror the
+# `predict` implementations in rembg.sessions.
+_BATCHABLE_MODELS: Dict[str, _Normalization] = {
+    "u2net": _Normalization(*_IMAGENET, (320, 320)),
+    "u2netp": _Normalization(*_IMAGENET, (320, 320)),
+    "u2net_human_seg": _Normalization(*_IMAGENET, (320, 320)),
+    "silueta": _Normalization(*_IMAGENET, (320, 320)),
+    "isnet-general-use": _Normalization((0.5, 0.5, 0.5), (1.0, 1.0, 1.0), (1024, 1024)),
+    "isnet-anime": _Normalization((0.485, 0.456, 0.406), (1.0, 1.0, 1.0), (1024, 1024)),
+}
+
+
+@dataclass
+class _MaskRequest:
+    image: Image.Image
+    result: Future
+
+
+class RembgMaskBatcher:
+    """
+    Groups background-removal requests for the same model into one inference.
+
+    Callers block in `remove_background` while a per-model collector thread
+    waits up to `max_wait_seconds` for up to `max_batch_size` images, runs them
+    through the session as one batch and hands each caller its masks. Models
+    that are not in `_BATCHABLE_MODELS`, or whose graph has a fixed batch
+    dimension of 1, fall back to one `predict` call per image.
+    """
+
+    def __init__(
+        self,
+        session_registry: RembgSessionRegistry,
+        max_batch_size: int = 4,
+        max_wait_seconds: float = 0.02,
+    ):
+        self.session_registry = session_registry
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self._lock = threading.Lock()
+        self._queues: Dict[str, "queue.Queue[_MaskRequest]"] = {}
+
+    def remove_background(self, model_name: str, source) -> Image.Image:
+        """Same cutout as `rembg.remove(..., post_process_mask=True)`."""
+        import numpy as np
+        from rembg.bg import fix_image_orientation, get_concat_v_multi, naive_cutout, post_process
+
+        img = Image.open(BytesIO(source)) if isinstance(source, bytes) else source
+        img = fix_image_orientation(img)
+        masks = self.predict_masks(model_name, img)
+        cutouts = [naive_cutout(img, Image.fromarray(post_process(np.array(mask)))) for mask in masks]
+        return get_concat_v_multi(cutouts) if cutouts else img
+
+    def predict_masks(self, model_name: str, image: Image.Image) -> List[Image.Image]:
+        if self.max_batch_size <= 1:
+            return self._run_batch(model_name, [image])[0]
+        request = _MaskRequest(image=image, result=Future())
+        self._queue_for(model_name).put(request)
+        return request.result.result()
+
+    def _queue_for(self, model_name: str) -> "queue.Queue[_MaskRequest]":
+        with self._lock:
+            pending = self._queues.get(model_name)
+            if pending is None:
+                pending = queue.Queue()
+                self._queues[model_name] = pending
+                threading.Thread(
+                    target=self._collect_forever,
+                    args=(model_name, pending),
+                    name=f"rembg-batch-{model_name}",
+                    daemon=True,
+                ).start()
+        return pending
+
+    def _collect_forever(self, model_name: str, pending: "queue.Queue[_MaskRequest]") -> None:
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(pending.get(timeout=self.max_wait_seconds))
+                except queue.Empty:
+                    break
+            try:
+                results = self._run_batch(model_name, [request.image for request in batch])
+            except Exception as exc:
+                for request in batch:
+                    request.result.set_exception(exc)
+                continue
+            for request, masks in zip(batch, results):
+                request.result.set_result(masks)
+
+    def _run_batch(self, model_name: str, images: List[Image.Image]) -> List[List[Image.Image]]:
+        with self.session_registry.lease(model_name) as session:
+            normalization = _BATCHABLE_MODELS.get(model_name)
+            if len(images) > 1 and normalization is not None and _accepts_batches(session):
+                try:
+                    return _predict_batch(session, normalization, images)
+                except Exception:
+                    # Some exported graphs reject batches despite a symbolic
+                    # batch dimension; single-image inference always works.
+                    pass
+            return [session.predict(image) for image in images]
+
+
+def _accepts_batches(session) -> bool:
+    try:
+        batch_dim = session.inner_session.get_inputs()[0].shape[0]
+    except Exception:
+        return False
+    return not isinstance(batch_dim, int) or batch_dim != 1
+
+
+def _predict_batch(session, normalization: _Normalization, images: List[Image.Image]) -> List[List[Image.Image]]:
+    import numpy as np
+
+    feeds = [session.normalize(image, normalization.mean, normalization.std, normalization.size) for image in images]
+    input_name = next(iter(feeds[0]))
+    batch = np.concatenate([feed[input_name] for feed in feeds], axis=0)
+    predictions = session.inner_session.run(None, {input_name: batch})[0][:, 0, :, :]
+
+    masks = []
+    for prediction, image in zip(predictions, images):
+        low, high = float(np.min(prediction)), float(np.max(prediction))
+        scaled = (prediction - low) / (high - low) if high > low else np.zeros_like(prediction)
+        mask = Image.fromarray((scaled.clip(0, 1) * 255).astype("uint8"), mode="L")
+        masks.append([mask.resize(image.size, Image.Resampling.LANCZOS)])
+    return masks
+
+
+_batcher: Optional[RembgMaskBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_mask_batcher() -> RembgMaskBatcher:
+    """Return this process's batcher, configured from the `rembg` settings."""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            rembg = settings.get().rembg
+            _batcher = RembgMaskBatcher(
+                get_session_registry(),
+                max_batch_size=rembg.batch_size,
+                max_wait_seconds=rembg.batch_wait_milliseconds / 1000.0,
+            )
+        return _batcher
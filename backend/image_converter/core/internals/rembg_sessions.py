@@ -0,0 +1,179 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from backend.image_converter.config import settings
+
+
+def _new_rembg_session(model_name: str, intra_op_threads: int = 0, inter_op_threads: int = 0):
+    # Imported here so rembg (and onnxruntime) only load when a session is needed.
+    if not intra_op_threads and not inter_op_threads:
+        from rembg import new_session
+        return new_session(model_name)
+
+    # rembg.new_session only reads thread counts from OMP_NUM_THREADS, so
+    # build the session options ourselves.
+    import onnxruntime as ort
+    from rembg.sessions import sessions_class
+
+    session_class = next((sc for sc in sessions_class if sc.name() == model_name), None)
+    if session_class is None:
+        raise ValueError(f"No session class found for model '{model_name}'")
+    options = ort.SessionOptions()
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+    return session_class(model_name, options)
+
+
+class RembgSessionRegistry:
+    """
+    Process-wide rembg sessions keyed by model name.
+
+    Loading a model is the expensive part of background removal, so each model
+    is loaded once per process and shared by every converter and request.
+    `lease` bounds how many inferences run on one model at a time (each holds
+    large intermediate tensors), and sessions unused for
+    `idle_eviction_seconds` are dropped to give the memory back; 0 keeps them
+    for the life of the process.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_inferences: int = 1,
+        idle_eviction_seconds: float = 0,
+        session_factory: Callable[[str], object] = _new_rembg_session,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrent_inferences = max(1, max_concurrent_inferences)
+        self.idle_eviction_seconds = max(0.0, idle_eviction_seconds)
+        self._session_factory = session_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, object] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_use: Dict[str, int] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+    def get(self, model_name: str):
+        """Return the shared session for `model_name`, loading it on first use."""
+        with self._lock:
+            session = self._sessions.get(model_name)
+            if session is not None:
+                self._last_used[model_name] = self._clock()
+                return session
+            model_lock = self._model_locks.setdefault(model_name, threading.Lock())
+
+        # Load outside the registry lock so other models stay usable; the
+        # per-model lock makes concurrent first requests share one load.
+        with model_lock:
+            with self._lock:
+                session = self._sessions.get(model_name)
+            if session is None:
+                session = self._session_factory(model_name)
+                with self._lock:
+                    self._sessions[model_name] = session
+                    self._last_used[model_name] = self._clock()
+                self._start_reaper()
+        return session
+
+    @contextmanager
+    def lease(self, model_name: str) -> Iterator[object]:
+        """Yield the session while holding one of the model's inference slots."""
+        with self._lock:
+            slots = self._slots.setdefault(
+                model_name, threading.BoundedSemaphore(self.max_concurrent_inferences)
+            )
+        with slots:
+            session = self.get(model_name)
+            with self._lock:
+                self._in_use[model_name] = self._in_use.get(model_name, 0) + 1
+            try:
+                yield session
+            finally:
+                with self._lock:
+                    self._in_use[model_name] -= 1
+                    self._last_used[model_name] = self._clock()
+
+    def warm_up(self, model_name: str) -> None:
+        self.get(model_name)
+
+    def warm_up_in_background(self, model_name: str, logger) -> threading.Thread:
+        """Load `model_name` on a daemon thread so startup is not blocked."""
+
+        def run() -> None:
+            started = time.perf_counter()
+            try:
+                self.warm_up(model_name)
+            except Exception as exc:
+                logger.log(f"rembg warm-up for '{model_name}' failed: {exc}", "warning")
+                return
+            logger.log(
+                f"rembg model '{model_name}' loaded in {time.perf_counter() - started:.1f}s.", "info"
+            )
+
+        thread = threading.Thread(target=run, name="rembg-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def evict_idle(self) -> Tuple[str, ...]:
+        """Drop sessions that are not in use and have been idle long enough."""
+        if not self.idle_eviction_seconds:
+            return ()
+        now = self._clock()
+        with self._lock:
+            evicted = tuple(
+                name
+                for name, last_used in self._last_used.items()
+                if not self._in_use.get(name) and now - last_used >= self.idle_eviction_seconds
+            )
+            for name in evicted:
+                self._sessions.pop(name, None)
+                self._last_used.pop(name, None)
+        return evicted
+
+    def loaded_models(self) -> Tuple[str, ...]:
+        with self._lock:
+            return tuple(sorted(self._sessions))
+
+    def _start_reaper(self) -> None:
+        if not self.idle_eviction_seconds:
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_forever, name="rembg-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_forever(self) -> None:
+        interval = min(self.idle_eviction_seconds, 60.0)
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+
+
+_registry: Optional[RembgSessionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> RembgSessionRegistry:
+    """Return this process's registry, configured from the `rembg` settings."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            rembg = settings.get().rembg
+            _registry = RembgSessionRegistry(
+                max_concurrent_inferences=rembg.max_concurrent_inferences,
+                idle_eviction_seconds=rembg.idle_eviction_seconds,
+                session_factory=partial(
+                    _new_rembg_session,
+                    intra_op_threads=rembg.intra_op_threads,
+                    inter_op_threads=rembg.inter_op_threads,
+                ),
+            )
+        return _registry
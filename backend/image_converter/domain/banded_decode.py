@@ -0,0 +1,116 @@
+import struct
+from typing import Iterator, Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from backend.image_converter.domain.input_buffer import InputBuffer, open_stream
+
+_RAW_CODEC = "raw"
+
+
+class DecodeMemoryLimitError(ValueError):
+    """Raised when a page cannot be decoded within the configured memory limit."""
+
+
+def open_without_pixel_limit(data: InputBuffer) -> Image.Image:
+    """
+    `Image.open` without Pillow's decompression-bomb check, which rejects any
+    image over ~179M px from its header alone. For callers that only read
+    the header, or that hold the decode to a memory limit of their own.
+
+    The check lives inside `Image.open` and reads a process-wide setting, so
+    rather than lifting that setting (which would disable the check for every
+    other thread) the registered format plugins are tried here directly, in
+    the order `Image.open` uses.
+    """
+    fp = open_stream(data)
+    prefix = fp.read(16)
+    tried = set()
+    for load_plugins in (Image.preinit, Image.init):
+        load_plugins()
+        for format_id in [i for i in Image.ID if i not in tried]:
+            tried.add(format_id)
+            factory, accept = Image.OPEN[format_id]
+            accepted = not accept or accept(prefix)
+            # Plugins return a message instead of True for files they recognise but refuse.
+            if not accepted or isinstance(accepted, str):
+                continue
+            fp.seek(0)
+            try:
+                return factory(fp, "")
+            except (SyntaxError, IndexError, TypeError, struct.error):
+                continue
+    raise UnidentifiedImageError("cannot identify image file")
+
+
+def decoded_size_bytes(img: Image.Image) -> int:
+    """Bytes `img` takes once loaded; Pillow keeps multi-band pixels in 4 bytes."""
+    if img.mode in ("1", "L", "P"):
+        pixel_bytes = 1
+    elif img.mode.startswith("I;16"):
+        pixel_bytes = 2
+    else:
+        pixel_bytes = 4
+    return img.width * img.height * pixel_bytes
+
+
+def supports_bands(img: Image.Image) -> bool:
+    """True when `img` is stored as uncompressed rows that can be read band by band."""
+    return _raw_layout(img) is not None
+
+
+def reduce_in_bands(img: Image.Image, factor: int, max_band_bytes: int) -> Image.Image:
+    """
+    `img.reduce(factor)` without loading `img`: rows are read and box-reduced
+    a band at a time, each band a multiple of `factor` rows, so the result
+    matches a full decode and peak memory is one band plus the output.
+    The caller checks `supports_bands` first.
+    """
+    layout = _raw_layout(img)
+    if layout is None:
+        raise ValueError(f"{img.format} images cannot be read in bands.")
+    width, height = img.size
+    row_bytes = max(1, decoded_size_bytes(img) // max(1, height))
+    rows = max(factor, (max_band_bytes // row_bytes) // factor * factor)
+
+    reduced = Image.new(img.mode, (-(-width // factor), -(-height // factor)))
+    for top, band in _iter_raw_bands(img, layout, rows):
+        reduced.paste(band.reduce(factor), (0, top // factor))
+    return reduced
+
+
+def _raw_layout(img: Image.Image) -> Optional[tuple]:
+    tiles = getattr(img, "tile", None)
+    if not tiles or len(tiles) != 1:
+        return None
+    codec, extents, offset, args = tiles[0][:4]
+    if codec != _RAW_CODEC or tuple(extents) != (0, 0, img.width, img.height):
+        return None
+    if not isinstance(args, tuple):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientation = args[2] if len(args) > 2 else 1
+    if not stride:
+        if rawmode != img.mode:
+            return None
+        stride = len(Image.new(img.mode, (img.width, 1)).tobytes())
+    if stride < 0 or orientation not in (1, -1):
+        return None
+    return rawmode, stride, orientation, offset
+
+
+def _iter_raw_bands(img: Image.Image, layout: tuple, rows: int) -> Iterator[tuple]:
+    rawmode, stride, orientation, offset = layout
+    width, height = img.size
+    fp = img.fp
+    for top in range(0, height, rows):
+        band_rows = min(rows, height - top)
+        # Bottom-up files store the last rows first.
+        first_stored_row = top if orientation == 1 else height - top - band_rows
+        fp.seek(offset + first_stored_row * stride)
+        data = fp.read(stride * band_rows)
+        if len(data) < stride * band_rows:
+            raise ValueError("Image data is truncated.")
+        band = Image.frombytes(img.mode, (width, band_rows), data, _RAW_CODEC, rawmode, stride, orientation)
+        yield top, band
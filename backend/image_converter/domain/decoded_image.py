@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from backend.image_converter.domain.banded_decode import (
+    DecodeMemoryLimitError,
+    decoded_size_bytes,
+    open_without_pixel_limit,
+    reduce_in_bands,
+    supports_bands,
+)
+from backend.image_converter.domain.input_buffer import InputBuffer, open_stream
+
+
+@dataclass
+class DecodedImage:
+    """
+    A decoded page plus the metadata encoders care about (ICC profile and EXIF).
+
+    Pipeline stages pass this handle along instead of re-encoding to bytes, so a
+    page is decoded once and encoded once. Stages must not mutate `image` in
+    place: the same handle may be encoded several times (e.g. size targeting).
+    """
+
+    image: Image.Image
+    icc_profile: Optional[bytes] = None
+    exif: Optional[bytes] = None
+    source_format: Optional[str] = None
+    # Size stored in the file when the decoder scaled the image down (JPEG
+    # draft mode); None when `image` has the full stored size.
+    stored_size: Optional[Tuple[int, int]] = None
+    # The encoded JPEG `image` was fully decoded from. Derived handles
+    # (`with_image`) drop it, so encoders may copy it instead of re-encoding.
+    source_jpeg: Optional[InputBuffer] = None
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: InputBuffer,
+        draft_width: Optional[int] = None,
+        memory_limit_bytes: Optional[int] = None,
+    ) -> "DecodedImage":
+        """
+        Decode `data`. With `draft_width`, JPEGs are decoded with DCT scaling
+        (1/2, 1/4 or 1/8) to the smallest size that is still at least that wide;
+        other formats ignore the hint.
+
+        A page that would take more than `memory_limit_bytes` decoded is
+        box-reduced while it is read, in row bands, when `draft_width` allows
+        it and the format stores plain rows (uncompressed TIFF, BMP, PPM).
+        Otherwise `DecodeMemoryLimitError` is raised before any pixel is read.
+        The memory limit takes the place of Pillow's pixel-count bomb check,
+        which would otherwise refuse such pages before they could be reduced.
+        """
+        if memory_limit_bytes:
+            img = open_without_pixel_limit(data)
+        else:
+            img = Image.open(open_stream(data))
+        stored_size = img.size
+        if draft_width and img.format == "JPEG" and draft_width < img.width:
+            draft_height = max(1, img.height * draft_width // img.width)
+            img.draft(img.mode, (draft_width, draft_height))
+        if memory_limit_bytes and decoded_size_bytes(img) > memory_limit_bytes:
+            reduced = cls(
+                image=_reduce_within_limit(img, draft_width, memory_limit_bytes),
+                icc_profile=img.info.get("icc_profile"),
+                exif=img.info.get("exif"),
+                source_format=img.format,
+                stored_size=stored_size,
+            )
+            img.close()
+            return reduced
+        img.load()
+        decoded = cls.from_pil(img)
+        if img.size != stored_size:
+            decoded.stored_size = stored_size
+        elif img.format == "JPEG":
+            decoded.source_jpeg = data
+        return decoded
+
+    @classmethod
+    def from_pil(cls, img: Image.Image) -> "DecodedImage":
+        return cls(
+            image=img,
+            icc_profile=img.info.get("icc_profile"),
+            exif=img.info.get("exif"),
+            source_format=img.format,
+        )
+
+    @property
+    def width(self) -> int:
+        return self.image.width
+
+    @property
+    def height(self) -> int:
+        return self.image.height
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.size
+
+    @property
+    def aspect_size(self) -> Tuple[int, int]:
+        """Size used for aspect-ratio maths: the stored size if decoding scaled it."""
+        return self.stored_size or self.image.size
+
+    def with_image(self, image: Image.Image) -> "DecodedImage":
+        """Return a handle for a derived image that keeps this page's metadata."""
+        return DecodedImage(
+            image=image,
+            icc_profile=self.icc_profile,
+            exif=self.exif,
+            source_format=self.source_format,
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode losslessly for byte-based callers. Deflate-compressed TIFF keeps
+        8-, 16- and 32-bit data intact along with the ICC profile and EXIF.
+        """
+        params = {"compression": "tiff_deflate"}
+        if self.icc_profile:
+            params["icc_profile"] = self.icc_profile
+        if self.exif:
+            params["exif"] = self.exif
+        buffer = BytesIO()
+        self.image.save(buffer, format="TIFF", **params)
+        return buffer.getvalue()
+
+
+def _reduce_within_limit(img: Image.Image, draft_width: Optional[int], limit: int) -> Image.Image:
+    needed_mib = -(-decoded_size_bytes(img) // (1024 * 1024))
+    limit_mib = limit // (1024 * 1024)
+    too_large = (
+        f"Decoding {img.width}x{img.height} px needs {needed_mib} MiB, "
+        f"over the {limit_mib} MiB processing memory limit"
+    )
+    if not draft_width or draft_width >= img.width:
+        raise DecodeMemoryLimitError(f"{too_large}; convert it to a smaller width.")
+    if not supports_bands(img):
+        raise DecodeMemoryLimitError(f"{too_large}, and {img.format} images cannot be read in bands.")
+    factor = img.width // draft_width
+    reduced_bytes = decoded_size_bytes(img) // (factor * factor)
+    if reduced_bytes >= limit:
+        raise DecodeMemoryLimitError(f"{too_large}; convert it to a smaller width.")
+    return reduce_in_bands(img, factor, limit - reduced_bytes)
@@ -0,0 +1,72 @@
+import zlib
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional
+
+from backend.image_converter.core.internals.utilities import Result
+
+
+@dataclass(frozen=True)
+class AvifEffortSettings:
+    # libavif speed, 0 (slowest, smallest) to 10 (fastest).
+    speed: int
+
+
+@dataclass(frozen=True)
+class PngEffortSettings:
+    # zlib level and strategy; `optimize` makes Pillow try harder on top.
+    compress_level: int
+    compress_type: int
+    optimize: bool
+
+
+class EncoderEffort(Enum):
+    """How much CPU the AVIF and PNG encoders spend on a smaller file."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    MAX = "max"
+
+    @classmethod
+    def default(cls) -> "EncoderEffort":
+        """
+        Returns the effort used when the caller does not specify one; it
+        matches the encoders' library defaults.
+        """
+        return cls.BALANCED
+
+    @classmethod
+    def from_string_result(cls, value: Optional[str]) -> Result["EncoderEffort"]:
+        """
+        Converts a string to an EncoderEffort member using the result pattern.
+        Blank or missing values fall back to the default effort.
+        """
+        if value is None or not value.strip():
+            return Result.success(cls.default())
+        try:
+            return Result.success(cls(value.strip().lower()))
+        except ValueError:
+            return Result.failure(f"Unsupported encoder effort: '{value}'")
+
+    @property
+    def avif(self) -> AvifEffortSettings:
+        return AVIF_EFFORT_SETTINGS[self]
+
+    @property
+    def png(self) -> PngEffortSettings:
+        return PNG_EFFORT_SETTINGS[self]
+
+
+AVIF_EFFORT_SETTINGS: Dict[EncoderEffort, AvifEffortSettings] = {
+    EncoderEffort.FAST: AvifEffortSettings(speed=9),
+    EncoderEffort.BALANCED: AvifEffortSettings(speed=6),
+    EncoderEffort.MAX: AvifEffortSettings(speed=4),
+}
+
+PNG_EFFORT_SETTINGS: Dict[EncoderEffort, PngEffortSettings] = {
+    EncoderEffort.FAST: PngEffortSettings(compress_level=1, compress_type=zlib.Z_RLE, optimize=False),
+    EncoderEffort.BALANCED: PngEffortSettings(
+        compress_level=6, compress_type=zlib.Z_DEFAULT_STRATEGY, optimize=False
+    ),
+    EncoderEffort.MAX: PngEffortSettings(compress_level=9, compress_type=zlib.Z_FILTERED, optimize=True),
+}
@@ -0,0 +1,34 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class EncoderThreadBudget:
+    """
+    Threads the AVIF encoder may use across the machine, split evenly
+    between the encodes that can run at once. With several web workers each
+    converting several pages, the library default (every CPU per encode)
+    oversubscribes the machine; a budget keeps the total near `total_threads`.
+
+    `autotiling` lets libavif cut large images into tiles that are encoded
+    in parallel.
+    """
+
+    total_threads: int
+    concurrent_encodes: int = 1
+    autotiling: bool = True
+
+    def __post_init__(self):
+        if self.total_threads < 1:
+            raise ValueError(f"total_threads must be >= 1, got {self.total_threads}")
+        if self.concurrent_encodes < 1:
+            raise ValueError(f"concurrent_encodes must be >= 1, got {self.concurrent_encodes}")
+
+    @classmethod
+    def whole_machine(cls) -> "EncoderThreadBudget":
+        """Every CPU for a single encode: what the encoder does by default."""
+        return cls(total_threads=os.cpu_count() or 1)
+
+    @property
+    def threads_per_encode(self) -> int:
+        return max(1, self.total_threads // self.concurrent_encodes)
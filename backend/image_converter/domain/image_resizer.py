@@ -1,40 +1,68 @@
 from PIL import Image, ImageOps
 from io import BytesIO
+from typing import Optional
+
+from backend.image_converter.domain.decoded_image import DecodedImage
 
 
 class ImageResizer:
     """
     Handles high-precision image resizing while maintaining data integrity.
 
-    This class supports 8-bit, 16-bit, and 32-bit (HDR) images by utilizing
-    the TIFF format for temporary storage, ensuring no color clipping or
-    bit-depth reduction occurs during the process.
-    """
-
-    def resize_image(self, image_data: bytes, target_width: int) -> bytes:
-        with Image.open(BytesIO(image_data)) as img:
-            if img.width <= 0:
-                raise ValueError("Original image width must be > 0.")
-
-            # Calculate dimensions
-            ratio = target_width / float(img.width)
-            new_size = (target_width, int(img.height * ratio))
-
-            # Metadata and High-Bit preservation
-            icc_profile = img.info.get("icc_profile")
+    `resize` works on decoded images so the pipeline never re-encodes between
+    stages. The byte-based `resize_image` adapter supports 8-bit, 16-bit, and
+    32-bit (HDR) images by utilizing the TIFF format for its output, ensuring
+    no color clipping or bit-depth reduction occurs during the process.
 
-            # Resampling with LANCZOS for high-quality downscaling
-            resized_img = img.resize(new_size, Image.Resampling.LANCZOS)
+    With `fast_downscale` (the default), JPEGs that are being shrunk are decoded
+    with the decoder's DCT scaling to at least twice the target width (the same
+    reducing gap `Image.thumbnail` uses) and then finished with LANCZOS. Output
+    dimensions are unchanged; pixels differ slightly from a full decode, so
+    callers that need bit-exact output turn it off.
+    """
 
-            buffer = BytesIO()
-            resized_img.save(
-                buffer,
-                format="TIFF",
-                icc_profile=icc_profile,
-                compression="tiff_deflate"
-            )
+    _DRAFT_REDUCING_GAP = 2
+
+    def __init__(self, fast_downscale: bool = True):
+        self.fast_downscale = fast_downscale
+
+    def draft_width(self, target_width: Optional[int]) -> Optional[int]:
+        """Width hint for `DecodedImage.from_bytes`, or None to decode at full size."""
+        if not self.fast_downscale or not target_width or target_width <= 0:
+            return None
+        return target_width * self._DRAFT_REDUCING_GAP
+
+    def resize(self, image: DecodedImage, target_width: int) -> DecodedImage:
+        if image.width <= 0:
+            raise ValueError("Original image width must be > 0.")
+        if target_width <= 0:
+            raise ValueError("Target width must be > 0.")
+
+        # Calculate dimensions from the stored size, so a draft-decoded image
+        # ends up exactly as large as a fully decoded one.
+        stored_width, stored_height = image.aspect_size
+        ratio = target_width / float(stored_width)
+        new_size = (target_width, int(stored_height * ratio))
+
+        # Resampling with LANCZOS for high-quality downscaling; the handle
+        # carries the ICC profile and EXIF over to the resized image.
+        resized_img = image.image.resize(new_size, Image.Resampling.LANCZOS)
+        return image.with_image(resized_img)
+
+    def downscale_to_pixel_budget(self, image: DecodedImage, max_pixels: int) -> DecodedImage:
+        """Shrink (never enlarge) to at most `max_pixels`, keeping the aspect ratio."""
+        width, height = image.size
+        if max_pixels <= 0 or width * height <= max_pixels:
+            return image
+        ratio = (max_pixels / float(width * height)) ** 0.5
+        new_size = (max(1, int(width * ratio)), max(1, int(height * ratio)))
+        # reducing_gap lets Pillow shrink by an integer factor first, which is
+        # much cheaper than a full LANCZOS pass and plenty for a size estimate.
+        return image.with_image(image.image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0))
 
-            return buffer.getvalue()
+    def resize_image(self, image_data: bytes, target_width: int) -> bytes:
+        decoded = DecodedImage.from_bytes(image_data, draft_width=self.draft_width(target_width))
+        return self.resize(decoded, target_width).to_bytes()
 
     def resize_to_canvas(
         self,
@@ -0,0 +1,54 @@
+"""Read-only input data: a bytes object or a memory-mapped file."""
+
+import io
+import mmap
+from typing import BinaryIO, Union
+
+InputBuffer = Union[bytes, mmap.mmap]
+
+
+def open_stream(data: InputBuffer) -> BinaryIO:
+    """
+    A seekable stream over `data` that does not copy it. Every call gets its
+    own position, so several readers can work on one buffer.
+    """
+    if isinstance(data, bytes):
+        # BytesIO shares an initial bytes object until it is written to.
+        return io.BytesIO(data)
+    return io.BufferedReader(_BufferReader(data))
+
+
+class _BufferReader(io.RawIOBase):
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # Release the export so the mapping can be closed.
+        self._view.release()
+        super().close()
@@ -0,0 +1,31 @@
+from typing import Mapping, Optional, Sequence
+
+# Luminance table of the JPEG specification (Annex K), which libjpeg scales by
+# its 1-100 quality setting.
+_STANDARD_LUMINANCE_TABLE = (
+    16, 11, 10, 16, 24, 40, 51, 61,
+    12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56,
+    14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77,
+    24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101,
+    72, 92, 95, 98, 112, 100, 103, 99,
+)
+
+
+def estimate_jpeg_quality(quantization: Optional[Mapping[int, Sequence[int]]]) -> Optional[int]:
+    """
+    The libjpeg quality a JPEG was most likely saved with, from its
+    quantization tables (Pillow's `Image.quantization`). Files written with
+    custom tables get the quality whose standard table is closest in overall
+    coarseness. None when there is no luminance table.
+    """
+    if not quantization or 0 not in quantization or len(quantization[0]) != 64:
+        return None
+    scale = 100.0 * sum(quantization[0]) / sum(_STANDARD_LUMINANCE_TABLE)
+    if scale <= 100:
+        quality = (200 - scale) / 2
+    else:
+        quality = 5000 / scale
+    return max(1, min(100, round(quality)))
@@ -0,0 +1,103 @@
+from typing import Iterator, Optional, Tuple
+
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.input_buffer import InputBuffer
+from backend.image_converter.domain.jpeg_quality import estimate_jpeg_quality
+
+_SOI = b"\xff\xd8"
+_SOS = 0xDA
+_COM = 0xFE
+_APP_MARKERS = range(0xE0, 0xF0)
+# Start-of-frame markers carry the frame size; C4, C8 and CC share the range
+# but are tables and extensions.
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+# Application segments that change how pixels decode or look, by signature.
+_PIXEL_APP_SEGMENTS = {
+    0xE0: b"JFIF\x00",
+    0xE2: b"ICC_PROFILE\x00",
+    0xEE: b"Adobe",
+}
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def passthrough_jpeg(image: DecodedImage, max_quality: int) -> Optional[bytes]:
+    """
+    The JPEG `image` was decoded from, stripped of metadata, when it can stand
+    in for re-encoding the pixels at `max_quality`: the pixels are unchanged,
+    upright without EXIF rotation, RGB or grayscale, and saved at or below
+    that quality. None otherwise.
+    """
+    source = image.source_jpeg
+    if source is None or image.image.mode not in ("RGB", "L"):
+        return None
+    if image.image.getexif().get(_EXIF_ORIENTATION_TAG, 1) != 1:
+        return None
+    quality = estimate_jpeg_quality(getattr(image.image, "quantization", None))
+    if quality is None or quality > max_quality:
+        return None
+    try:
+        return strip_jpeg_metadata(source)
+    except ValueError:
+        return None
+
+
+def strip_jpeg_metadata(jpeg: InputBuffer) -> bytes:
+    """
+    `jpeg` without EXIF, XMP, IPTC and comment segments. The JFIF, ICC and
+    Adobe segments and everything from the first scan on are copied
+    unchanged, so the image decodes to the same pixels.
+    """
+    parts = [_SOI]
+    for marker, start, end in iter_jpeg_segments(jpeg):
+        if marker == _SOS:
+            parts.append(jpeg[start:])
+            return b"".join(parts)
+        if marker == _COM or (marker in _APP_MARKERS and not _is_pixel_segment(jpeg, marker, start)):
+            continue
+        parts.append(jpeg[start:end])
+    raise ValueError("JPEG stream has no scan.")
+
+
+def jpeg_frame(jpeg: InputBuffer) -> Tuple[int, int, int]:
+    """Width, height and component count from a JPEG's start-of-frame header."""
+    for marker, start, end in iter_jpeg_segments(jpeg):
+        if marker in _SOF_MARKERS and end - start >= 10:
+            height = int.from_bytes(jpeg[start + 5:start + 7], "big")
+            width = int.from_bytes(jpeg[start + 7:start + 9], "big")
+            return width, height, jpeg[start + 9]
+    raise ValueError("JPEG stream has no frame header.")
+
+
+def iter_jpeg_segments(jpeg: InputBuffer) -> Iterator[Tuple[int, int, int]]:
+    """
+    `(marker, start, end)` of each header segment, up to and including the
+    first start-of-scan. `start` is the offset of the segment's 0xFF byte.
+    """
+    if jpeg[:2] != _SOI:
+        raise ValueError("Not a JPEG stream.")
+    pos = 2
+    size = len(jpeg)
+    while pos + 4 <= size:
+        if jpeg[pos] != 0xFF:
+            raise ValueError("Malformed JPEG stream.")
+        marker = jpeg[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        end = pos + 2 + int.from_bytes(jpeg[pos + 2:pos + 4], "big")
+        if end > size:
+            raise ValueError("JPEG stream is truncated.")
+        yield marker, pos, end
+        if marker == _SOS:
+            return
+        pos = end
+    raise ValueError("JPEG stream is truncated.")
+
+
+def _is_pixel_segment(jpeg: InputBuffer, marker: int, start: int) -> bool:
+    signature = _PIXEL_APP_SEGMENTS.get(marker)
+    return signature is not None and jpeg[start + 4:start + 4 + len(signature)] == signature
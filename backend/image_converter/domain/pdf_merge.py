@@ -0,0 +1,38 @@
+import re
+from enum import Enum
+from typing import Optional, Tuple
+
+from backend.image_converter.core.internals.utilities import Result
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+class PdfMergeOrder(Enum):
+    """The order inputs are appended in when every page goes into one PDF."""
+
+    UPLOAD = "upload"
+    NAME = "name"
+
+    @classmethod
+    def default(cls) -> "PdfMergeOrder":
+        return cls.UPLOAD
+
+    @classmethod
+    def from_string_result(cls, value: Optional[str]) -> Result["PdfMergeOrder"]:
+        """
+        Converts a string to a PdfMergeOrder member using the result pattern.
+        Blank or missing values fall back to the default order.
+        """
+        if value is None or not value.strip():
+            return Result.success(cls.default())
+        try:
+            return Result.success(cls(value.strip().lower()))
+        except ValueError:
+            return Result.failure(f"Unsupported PDF merge order: '{value}'")
+
+
+def natural_sort_key(name: str) -> Tuple:
+    """Sort key that orders "page2" before "page10" and ignores case."""
+    parts = _DIGITS.split(name.casefold())
+    # Digit runs land on the odd indices.
+    return tuple(int(part) if index % 2 else part for index, part in enumerate(parts))
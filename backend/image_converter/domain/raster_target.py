@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from backend.image_converter.domain.pdf_presets import PdfPreset
+from backend.image_converter.domain.pdf_quality import PdfQuality
+
+_POINTS_PER_INCH = 72.0
+_POINTS_PER_MM = 72.0 / 25.4
+
+
+@dataclass(frozen=True)
+class RasterTarget:
+    """
+    The largest raster a page is reduced to further down the pipeline, so a
+    rasterizer can skip resolution that would only be thrown away.
+
+    `width` is an exact output width (the resizer scales to it). `box` is a
+    pixel box the page is fitted into, or made to cover with `cover`; with
+    `auto_rotate` the box turns to match the page's orientation.
+    """
+
+    width: Optional[int] = None
+    box: Optional[Tuple[int, int]] = None
+    cover: bool = False
+    auto_rotate: bool = False
+
+    @classmethod
+    def for_conversion(
+        cls,
+        width: Optional[int],
+        pdf_preset: Optional[PdfPreset] = None,
+        pdf_scale: str = "fit",
+        pdf_margin_mm: Optional[float] = None,
+        pdf_paginate: bool = False,
+        pdf_quality: PdfQuality = PdfQuality.HIGH,
+    ) -> Optional["RasterTarget"]:
+        """
+        The target of one conversion, or None when the page is kept at full
+        resolution. A sized `pdf_preset` (PDF output only) takes precedence
+        over `width`, mirroring the pipeline, which skips the resize then.
+        """
+        if pdf_preset is not None and pdf_preset.size is not None:
+            margin_mm = pdf_margin_mm if pdf_margin_mm is not None else pdf_preset.margin_mm
+            pixels_per_point = pdf_quality.preset.dpi / _POINTS_PER_INCH
+            page_w, page_h = pdf_preset.size
+            inner_w = page_w - 2 * margin_mm * _POINTS_PER_MM
+            inner_h = page_h - 2 * margin_mm * _POINTS_PER_MM
+            if inner_w <= 0 or inner_h <= 0:
+                return None
+            box_w = max(1, round(inner_w * pixels_per_point))
+            box_h = max(1, round(inner_h * pixels_per_point))
+            if pdf_paginate:
+                # Slices span the page width; the height is split across pages.
+                return cls(width=box_w)
+            return cls(box=(box_w, box_h), cover=pdf_scale == "fill", auto_rotate=pdf_preset.auto_rotate)
+        if width and width > 0:
+            return cls(width=width)
+        return None
+
+    def scale_for(self, page_width: float, page_height: float, max_scale: float) -> float:
+        """
+        Smallest render scale, capped at `max_scale`, at which a page of
+        `page_width` x `page_height` units still covers this target.
+        """
+        scale = max_scale
+        if self.width:
+            scale = min(scale, self.width / page_width)
+        if self.box:
+            box_w, box_h = self.box
+            if self.auto_rotate and (box_w > box_h) != (page_width > page_height):
+                box_w, box_h = box_h, box_w
+            ratios = (box_w / page_width, box_h / page_height)
+            scale = min(scale, max(ratios) if self.cover else min(ratios))
+        return scale
@@ -0,0 +1,42 @@
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+WHITE = (255, 255, 255)
+
+_EXIF_ORIENTATION_TAG = 0x0112
+# Modes Pillow pastes onto RGB directly, blending by their own alpha band.
+_PASTABLE_ALPHA_MODES = ("RGBA", "RGBa", "LA")
+_OTHER_ALPHA_MODES = ("La", "PA")
+
+
+def normalize_to_rgb(img: Image.Image, background: Tuple[int, int, int] = WHITE) -> Image.Image:
+    """
+    `img` upright and in RGB, with any transparency flattened onto
+    `background`, ready for encoders without alpha (JPEG, PDF pages).
+
+    Images that need no change are returned as is rather than copied. An
+    alpha image is blended onto one new canvas by its own alpha band, with
+    no separate RGB or mask copies.
+    """
+    img = apply_exif_orientation(img)
+
+    if img.mode in _OTHER_ALPHA_MODES or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+    if img.mode in _PASTABLE_ALPHA_MODES:
+        canvas = Image.new("RGB", img.size, background)
+        canvas.paste(img, mask=img)
+        return canvas
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def apply_exif_orientation(img: Image.Image) -> Image.Image:
+    """`img` turned upright by its EXIF orientation; `img` itself when it already is."""
+    try:
+        if img.getexif().get(_EXIF_ORIENTATION_TAG, 1) == 1:
+            return img
+        return ImageOps.exif_transpose(img)
+    except Exception:
+        return img
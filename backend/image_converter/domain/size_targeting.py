@@ -1,30 +1,187 @@
-from typing import Callable, Optional, Tuple
+import math
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# d(log size)/d(quality) seen on typical photos for JPEG and AVIF; only used
+# to place the second probe, before the image's own curve can be fitted.
+_TYPICAL_LOG_SIZE_SLOPE = 0.025
+_MAX_ATTEMPTS = 10
+
+
+class _Probes:
+    """
+    Encodes of one image by quality. The size of every encode is kept, for
+    the search model, but only the outputs the search can still return: the
+    best one under the target so far, and the q_min fallback.
+    """
+
+    def __init__(self, encoder: Callable[[int, Any], bytes], data: Any, target_bytes: int, q_min: int):
+        self.encoder = encoder
+        self.data = data
+        self.target_bytes = target_bytes
+        self.q_min = q_min
+        self.sizes: Dict[int, int] = {}
+        self._outputs: Dict[int, bytes] = {}
+
+    def size(self, q: int) -> int:
+        if q not in self.sizes:
+            self._record(q, self.encoder(q, self.data))
+        return self.sizes[q]
+
+    def output(self, q: int) -> bytes:
+        if q not in self._outputs:
+            self._record(q, self.encoder(q, self.data))
+        return self._outputs[q]
+
+    def _record(self, q: int, output: bytes) -> None:
+        size = self.sizes[q] = len(output)
+        best = max((kept for kept in self._outputs if kept != self.q_min), default=None)
+        if q == self.q_min:
+            self._outputs[q] = output
+        elif size <= self.target_bytes and (best is None or q > best):
+            self._outputs.pop(best, None)
+            self._outputs[q] = output
+
 
 def find_best_quality_under_target(
-    encoder: Callable[[int, bytes], bytes],
-    data: bytes,
+    encoder: Callable[[int, Any], bytes],
+    data: Any,
     target_bytes: int,
     *,
     q_min: int = 10,
     q_max: int = 95,
-    max_attempts: int = 10,
+    max_attempts: int = _MAX_ATTEMPTS,
+    good_enough_bytes: Optional[int] = None,
 ) -> Tuple[int, bytes, int]:
-    low, high = q_min, q_max
-    best: Optional[Tuple[int, bytes, int]] = None
+    """
+    Find the highest quality in [q_min, q_max] whose output fits `target_bytes`.
 
-    for _ in range(max_attempts):
-        if low > high:
-            break
-        q = (low + high) // 2
-        out = encoder(q, data)
-        size = len(out)
+    Output size grows roughly exponentially with quality, so each next quality
+    comes from a secant on log(size) through the probes closest to the current
+    bracket (a typical slope stands in after the first probe), clamped inside
+    the bracket; bisection is used when the model is degenerate. Every quality
+    is encoded at most once. If `good_enough_bytes` is given, the search stops
+    as soon as an output lands in [good_enough_bytes, target_bytes].
+
+    When nothing fits, the q_min output is returned.
+    """
+    probes = _Probes(encoder, data, target_bytes, q_min)
+    return _search(probes, q_max, max_attempts, good_enough_bytes)
+
+
+def _search(
+    probes: _Probes, q_max: int, max_attempts: int, good_enough_bytes: Optional[int]
+) -> Tuple[int, bytes, int]:
+    """The search of `find_best_quality_under_target`, continuing from `probes`."""
+    sizes, target_bytes, q_min = probes.sizes, probes.target_bytes, probes.q_min
+
+    def in_band(size: int) -> bool:
+        return good_enough_bytes is not None and good_enough_bytes <= size <= target_bytes
+
+    # Invariant: `low` is the best quality known to fit (q_min - 1 if none),
+    # `high` the lowest quality known not to fit (q_max + 1 if none).
+    in_range = [q for q in sizes if q_min <= q <= q_max]
+    low = max((q for q in in_range if sizes[q] <= target_bytes), default=q_min - 1)
+    high = min((q for q in in_range if sizes[q] > target_bytes), default=q_max + 1)
+
+    done = high - low <= 1 or (low >= q_min and in_band(sizes[low]))
+    q = (q_min + q_max) // 2
+    if not done and in_range:
+        q = _predict_quality(sizes, target_bytes, good_enough_bytes, low, high) or (low + high) // 2
+
+    for _ in range(0 if done else max_attempts):
+        size = probes.size(q)
         if size <= target_bytes:
-            best = (q, out, size)
-            low = q + 1
+            low = q
+            if in_band(size):
+                break
         else:
-            high = q - 1
+            high = q
+        if high - low <= 1:
+            break
+
+        predicted = _predict_quality(sizes, target_bytes, good_enough_bytes, low, high)
+        q = predicted if predicted is not None else (low + high) // 2
+
+    if low < q_min:
+        low = q_min
+    return low, probes.output(low), probes.size(low)
+
+
+def _predict_quality(
+    sizes: Dict[int, int],
+    target_bytes: int,
+    good_enough_bytes: Optional[int],
+    low: int,
+    high: int,
+) -> Optional[int]:
+    """Secant on log(size) through the probes closest to the bracket."""
+    nearest = sorted(sizes, key=lambda q: min(abs(q - low), abs(q - high)))[:2]
+    q1 = nearest[0]
+    s1 = sizes[q1]
+    if s1 <= 0:
+        return None
+    if len(nearest) < 2:
+        slope = _TYPICAL_LOG_SIZE_SLOPE
+    else:
+        q2 = nearest[1]
+        s2 = sizes[q2]
+        if s2 <= 0 or s1 == s2:
+            return None
+        slope = (math.log(s2) - math.log(s1)) / (q2 - q1)
+        if slope <= 0:
+            return None
+
+    # Aim for the middle of the accepted band so one probe can end the search.
+    aim = target_bytes if good_enough_bytes is None else (good_enough_bytes + target_bytes) / 2
+    predicted = q1 + (math.log(aim) - math.log(s1)) / slope
+    if not math.isfinite(predicted):
+        return None
+    return min(max(int(math.floor(predicted)), low + 1), high - 1)
+
+
+def find_best_quality_via_proxy(
+    encoder: Callable[[int, Any], bytes],
+    data: Any,
+    proxy: Any,
+    pixel_scale: float,
+    target_bytes: int,
+    *,
+    q_min: int = 10,
+    q_max: int = 95,
+    good_enough_bytes: Optional[int] = None,
+    max_confirmations: int = 2,
+) -> Tuple[int, bytes, int, int]:
+    """
+    Like `find_best_quality_under_target`, but searches on a downscaled `proxy`
+    first and only encodes `data` to confirm the prediction.
+
+    `pixel_scale` is full-resolution pixels per proxy pixel. The proxy search
+    targets `target_bytes / pixel_scale` (equal bits per pixel); each full
+    encode then corrects that bits-per-pixel ratio before the next prediction.
+    Unless a confirmation lands in the accepted band, the regular search then
+    continues on `data` from the confirmed encodes. Returns
+    (quality, output, size, full_resolution_encodes).
+    """
+    full = _Probes(encoder, data, target_bytes, q_min)
+
+    correction = 1.0
+    for _ in range(max_confirmations):
+        scale = pixel_scale * correction
+        proxy_floor = None if good_enough_bytes is None else int(good_enough_bytes / scale)
+        q, _, proxy_size = find_best_quality_under_target(
+            encoder, proxy, int(target_bytes / scale),
+            q_min=q_min, q_max=q_max, good_enough_bytes=proxy_floor,
+        )
+        if q in full.sizes:
+            break
+        size = full.size(q)
+        if good_enough_bytes is not None and good_enough_bytes <= size <= target_bytes:
+            break
+        if proxy_size > 0:
+            correction = size / (proxy_size * pixel_scale)
 
-    if best is None:
-        out = encoder(q_min, data)
-        return q_min, out, len(out)
-    return best
+    # Finish on full resolution, starting from the confirmed encodes; this
+    # costs nothing more when a confirmation already landed in the band.
+    q, out, size = _search(full, q_max, _MAX_ATTEMPTS, good_enough_bytes)
+    return q, out, size, len(full.sizes)
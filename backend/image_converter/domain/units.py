@@ -14,10 +14,16 @@ class TargetSize:
     bytes: int
     tolerance: float = 0.02
     margin: float = 0.98
+    # Outputs within this fraction below the soft limit end the quality search.
+    band: float = 0.05
 
     @property
     def soft_limit(self) -> int:
         return int(self.bytes * self.margin)
 
+    @property
+    def band_floor(self) -> int:
+        return int(self.soft_limit * (1 - self.band))
+
     def within_tolerance(self, actual: int) -> bool:
         return actual <= int(self.bytes * (1 + self.tolerance))
@@ -1,3 +1,4 @@
+import json
 import os
 import shutil
 import time
@@ -16,16 +17,25 @@ from backend.image_converter.domain.units import BYTES_PER_MEBIBYTE
 
 _KIND_DIRECTORY = "directory"
 _KIND_ZIP = "zip"
+_KIND_CACHE_ENTRY = "cache_entry"
+_KIND_JOB = "job"
 _ZIP_FOLDER_LABEL = "zip"
+# States of CompressionJobService jobs that have not finished yet.
+_LIVE_JOB_STATES = ("queued", "running")
 
 
 class CleanupService:
-    """Deletes expired temp conversion folders/ZIPs and reports what was kept."""
+    """
+    Deletes expired temp conversion folders/ZIPs and reports what was kept.
+    A forced cleanup also empties the conversion cache, which otherwise keeps
+    itself within its size budget as entries are stored.
+    """
 
-    def __init__(self, temp_dir: str, expiration_time: int, logger):
+    def __init__(self, temp_dir: str, expiration_time: int, logger, conversion_cache=None):
         self.temp_dir = temp_dir
         self.expiration_time = expiration_time
         self.logger = logger
+        self.conversion_cache = conversion_cache
 
     def cleanup_temp_folders(self, force: bool = False) -> Result[CleanupSummary]:
         summary = CleanupSummary()
@@ -43,6 +53,13 @@ class CleanupService:
             ):
                 result = self._maybe_delete_zip(item_path, force, current_time)
                 self._record_cleanup_outcome(summary, _KIND_ZIP, item_path, result)
+            elif os.path.isfile(item_path) and item.startswith("job_"):
+                # Background job status files; rewritten on every progress update.
+                result = self._maybe_delete_job_file(item_path, force, current_time)
+                self._record_cleanup_outcome(summary, _KIND_JOB, item_path, result)
+
+        if force and self.conversion_cache is not None:
+            self._clear_cache_entries(summary)
 
         return Result.success(summary)
 
@@ -110,6 +127,49 @@ class CleanupService:
             self.logger.log(f"Error deleting folder {dir_path}: {tb}", "error")
             return Result.failure(tb)
 
+    def _maybe_delete_file(
+        self,
+        file_path: str,
+        force: bool,
+        current_time: float,
+    ) -> Result[bool]:
+        try:
+            if force or (current_time - os.path.getctime(file_path) > self.expiration_time):
+                os.remove(file_path)
+                return Result.success(True)
+            return Result.success(False)
+        except FileNotFoundError:
+            return Result.success(False)
+        except Exception:
+            tb = traceback.format_exc()
+            self.logger.log(f"Error deleting file {file_path}: {tb}", "error")
+            return Result.failure(tb)
+
+    def _maybe_delete_job_file(
+        self,
+        file_path: str,
+        force: bool,
+        current_time: float,
+    ) -> Result[bool]:
+        if self._is_live_job(file_path, current_time):
+            return Result.success(False)
+        return self._maybe_delete_file(file_path, force, current_time)
+
+    def _is_live_job(self, file_path: str, current_time: float) -> bool:
+        """
+        True for a queued or running job, whose status file is still being
+        read and rewritten. A job not updated for `expiration_time` is taken
+        to be abandoned by a worker that died.
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(job, dict) or job.get("state") not in _LIVE_JOB_STATES:
+            return False
+        return current_time - float(job.get("updated_at") or 0) <= self.expiration_time
+
     def _maybe_delete_zip(
         self,
         zip_path: str,
@@ -128,6 +188,19 @@ class CleanupService:
             self.logger.log(f"Error deleting ZIP file {zip_path}: {tb}", "error")
             return Result.failure(tb)
 
+    def _clear_cache_entries(self, summary: CleanupSummary) -> None:
+        try:
+            evicted = self.conversion_cache.clear()
+        except Exception:
+            tb = traceback.format_exc()
+            self.logger.log(f"Error clearing conversion cache entries: {tb}", "error")
+            summary.errors.append(CleanupError(kind=_KIND_CACHE_ENTRY, path=self.conversion_cache.root, error=tb))
+            return
+        for path in evicted:
+            summary.deleted.append(CleanedItem(kind=_KIND_CACHE_ENTRY, path=path))
+        if evicted:
+            self.logger.log(f"Evicted {len(evicted)} conversion cache entries.", "info")
+
     @staticmethod
     def _record_cleanup_outcome(
         summary: CleanupSummary,
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from backend.image_converter.config.app_config import AppConfig
+from backend.image_converter.core.internals.utilities import Result
+
+# Bump when the stored layout or the conversion output changes meaning.
+_CACHE_VERSION = 1
+_MANIFEST = "manifest.json"
+CACHE_DIRECTORY_NAME = "conversion_cache"
+# A process sweeps the store again after storing this fraction of the budget.
+_EVICT_EVERY_FRACTION = 8
+
+
+@dataclass(frozen=True)
+class CachedOutput:
+    """One output file of a cached conversion; `suffix` follows the input's stem."""
+
+    suffix: str
+    original_width: Optional[int] = None
+    resized_width: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class CacheHit:
+    outputs: Tuple[CachedOutput, ...]
+    directory: str
+
+    def path_for(self, index: int) -> str:
+        return os.path.join(self.directory, str(index))
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+
+    def to_json_dict(self) -> dict:
+        return asdict(self)
+
+
+class ConversionCache:
+    """
+    Content-addressed store of finished conversions.
+
+    An entry is keyed by the SHA-256 of the input bytes plus every conversion
+    parameter, and holds the output files of that input together with a
+    manifest. Entries are written to a scratch directory and renamed into
+    place, so readers never see half-written entries and concurrent workers
+    can share the directory. `evict` trims the store to `max_bytes`,
+    least recently used first; hits refresh an entry's mtime.
+
+    The store bounds itself: `store` runs `evict` on a process's first store
+    and again whenever that process has stored another 1/8 of the budget, so
+    the directory stays within `max_bytes` plus that slack per process
+    without a sweep on every write.
+
+    Hit/miss counters are per process.
+    """
+
+    def __init__(self, root: str, max_bytes: int, logger=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        # Bytes this process stored since its last sweep; None before the first.
+        self._stored_since_evict: Optional[int] = None
+        self._counter_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to CLI pool workers; locks and loggers stay in this process.
+        state = self.__dict__.copy()
+        del state["_counter_lock"]
+        state["logger"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._counter_lock = threading.Lock()
+
+    @staticmethod
+    def build_key(data: bytes, params: Mapping[str, Any]) -> str:
+        digest = hashlib.sha256()
+        digest.update(data)
+        digest.update(json.dumps(
+            {"version": _CACHE_VERSION, "params": params}, sort_keys=True, default=str
+        ).encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[CacheHit]:
+        directory = self._entry_dir(key)
+        try:
+            with open(os.path.join(directory, _MANIFEST), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            outputs = tuple(CachedOutput(**output) for output in manifest["outputs"])
+            os.utime(directory)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except Exception:
+            self._log(f"Ignoring unreadable cache entry {key}: {traceback.format_exc()}", "warning")
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        return CacheHit(outputs=outputs, directory=directory)
+
+    def restore(self, hit: CacheHit, dest_folder: str, stem: str) -> Result[List[str]]:
+        """Copy a hit's files into `dest_folder`, named after `stem`."""
+        names = []
+        try:
+            for index, output in enumerate(hit.outputs):
+                name = stem + output.suffix
+                shutil.copyfile(hit.path_for(index), os.path.join(dest_folder, name))
+                names.append(name)
+        except Exception:
+            self._log(f"Failed to restore cache entry {hit.directory}: {traceback.format_exc()}", "warning")
+            return Result.failure("Failed to restore cached conversion.")
+        return Result.success(names)
+
+    def store(self, key: str, outputs: Sequence[Tuple[CachedOutput, str]]) -> None:
+        """Store `(output, file_path)` pairs under `key`; failures are only logged."""
+        if not outputs or self.max_bytes <= 0:
+            return
+        scratch = None
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            scratch = tempfile.mkdtemp(prefix=".incoming_", dir=self.root)
+            for index, (_, path) in enumerate(outputs):
+                shutil.copyfile(path, os.path.join(scratch, str(index)))
+            with open(os.path.join(scratch, _MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({"outputs": [asdict(output) for output, _ in outputs]}, f)
+            try:
+                os.rename(scratch, self._entry_dir(key))
+                scratch = None
+            except OSError:
+                # Another worker stored the same key first.
+                return
+            self._evict_if_due(sum(os.path.getsize(path) for _, path in outputs))
+        except Exception:
+            self._log(f"Failed to store cache entry {key}: {traceback.format_exc()}", "warning")
+        finally:
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """Delete least recently used entries until the store fits; return their paths."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        evicted = []
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= limit:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted.append(path)
+        self._remove_stale_scratch()
+        return evicted
+
+    def clear(self) -> List[str]:
+        return self.evict(max_bytes=0)
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(entries),
+            size_bytes=sum(size for _, _, size in entries),
+        )
+
+    def _evict_if_due(self, stored_bytes: int) -> None:
+        with self._counter_lock:
+            pending = self._stored_since_evict
+            due = pending is None or pending + stored_bytes >= self.max_bytes // _EVICT_EVERY_FRACTION
+            self._stored_since_evict = 0 if due else pending + stored_bytes
+        if due:
+            evicted = self.evict()
+            if evicted:
+                self._log(f"Evicted {len(evicted)} conversion cache entries.", "debug")
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        entries = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            path = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+                entries.append((path, os.path.getmtime(path), size))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _remove_stale_scratch(self, max_age_seconds: float = 3600) -> None:
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.root, name)
+            try:
+                if name.startswith(".incoming_") and now - os.path.getmtime(path) > max_age_seconds:
+                    shutil.rmtree(path, ignore_errors=True)
+            except FileNotFoundError:
+                continue
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _count(self, hit: bool) -> None:
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _log(self, message: str, level: str) -> None:
+        if self.logger is not None:
+            self.logger.log(message, level)
+
+
+def create_conversion_cache(config: AppConfig, logger=None) -> Optional[ConversionCache]:
+    """Build the cache under the temp directory, or None when it is disabled."""
+    cache_config = config.conversion_cache
+    if not cache_config.enabled or cache_config.max_size_bytes <= 0:
+        return None
+    return ConversionCache(
+        os.path.join(config.temporary_storage.directory, CACHE_DIRECTORY_NAME),
+        cache_config.max_size_bytes,
+        logger=logger,
+    )
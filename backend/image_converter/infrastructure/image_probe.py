@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.banded_decode import open_without_pixel_limit
+from backend.image_converter.domain.input_buffer import InputBuffer
+
+_EXIF_ORIENTATION_TAG = 0x0112
+_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+
+@dataclass(frozen=True)
+class ImageMetadata:
+    width: int
+    height: int
+    mode: str
+    format: Optional[str]
+    orientation: int
+    has_icc_profile: bool
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def display_size(self) -> Tuple[int, int]:
+        """Size after the EXIF orientation has been applied."""
+        if self.orientation in _TRANSPOSED_ORIENTATIONS:
+            return self.height, self.width
+        return self.width, self.height
+
+
+class ImageProbe:
+    """
+    Reads dimensions, mode, orientation and ICC presence from container headers.
+
+    `Image.open` only parses the header; this class never calls `load()`, so no
+    pixel data is decoded. EXIF is read from the header copy in `info` (or the
+    TIFF tag directory) rather than `getexif()`, which may decode some formats.
+    For the same reason Pillow's pixel-count bomb check is skipped: the decode
+    step applies the memory limit (or that check) itself.
+    """
+
+    def probe(self, data: InputBuffer) -> Result[ImageMetadata]:
+        try:
+            with open_without_pixel_limit(data) as img:
+                return Result.success(self.describe(img))
+        except Exception as exc:
+            return Result.failure(f"Could not read image header: {exc}")
+
+    def describe(self, img: Image.Image) -> ImageMetadata:
+        return ImageMetadata(
+            width=img.width,
+            height=img.height,
+            mode=img.mode,
+            format=img.format,
+            orientation=self._read_orientation(img),
+            has_icc_profile=bool(img.info.get("icc_profile")),
+        )
+
+    @staticmethod
+    def _read_orientation(img: Image.Image) -> int:
+        exif_bytes = img.info.get("exif")
+        if exif_bytes:
+            exif = Image.Exif()
+            try:
+                exif.load(exif_bytes)
+            except Exception:
+                return 1
+            return int(exif.get(_EXIF_ORIENTATION_TAG, 1) or 1)
+
+        tags = getattr(img, "tag_v2", None)
+        if tags is not None:
+            return int(tags.get(_EXIF_ORIENTATION_TAG, 1) or 1)
+        return 1
@@ -4,7 +4,9 @@ from dataclasses import dataclass
 from typing import Iterable
 
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import InputBuffer
 from backend.image_converter.infrastructure.logger import Logger
+from backend.image_converter.infrastructure.mapped_file import read_file_buffer
 
 @dataclass
 class FileItem:
@@ -23,10 +25,10 @@ class LocalStorage:
                 stem, _ = os.path.splitext(name)
                 yield FileItem(path=p, name=name, stem=stem)
 
-    def read_bytes(self, path: str) -> Result[bytes]:
+    def read_bytes(self, path: str) -> Result[InputBuffer]:
+        """File contents; large files come back memory-mapped rather than copied."""
         try:
-            with open(path, "rb") as f:
-                return Result.success(f.read())
+            return Result.success(read_file_buffer(path))
         except Exception:
             self._log_failure("read", path)
             return Result.failure("Failed to read file.")
@@ -0,0 +1,46 @@
+import mmap
+import os
+from typing import Optional
+
+from backend.image_converter.domain.input_buffer import InputBuffer
+
+# Below this, reading into bytes is cheaper than setting up a mapping.
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+class FileMapping(mmap.mmap):
+    """A read-only mapping that remembers the path of the file it maps."""
+
+    path: str = ""
+
+
+def read_file_buffer(path: str) -> InputBuffer:
+    """
+    The contents of `path` as an `InputBuffer`. Large files are memory-mapped
+    read-only, so pages are loaded by the kernel as decoders touch them and
+    no copy is held on the Python heap.
+    """
+    with open(path, "rb") as f:
+        return map_open_file(f, path)
+
+
+def map_open_file(f, path: str = "") -> InputBuffer:
+    """
+    Like `read_file_buffer`, for a file object that is already open. `path`
+    is kept on the mapping so other processes can open the same file.
+    """
+    # Writes still sitting in the file object's buffer are not in the mapping.
+    f.flush()
+    size = os.fstat(f.fileno()).st_size
+    if size < MMAP_MIN_BYTES:
+        f.seek(0)
+        return f.read()
+    # The mapping holds its own reference to the file; `f` may be closed.
+    mapping = FileMapping(f.fileno(), 0, access=mmap.ACCESS_READ)
+    mapping.path = path
+    return mapping
+
+
+def mapped_path(data: InputBuffer) -> Optional[str]:
+    """The path of the file `data` maps, or None for bytes and unnamed mappings."""
+    return getattr(data, "path", None) or None
@@ -1,58 +1,269 @@
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+import multiprocessing
+import os
+import tempfile
+import threading
 import traceback
-from typing import Any, Optional
+from typing import Any, Iterator, Optional, Sequence
 
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import open_stream
+from backend.image_converter.domain.raster_target import RasterTarget
+from backend.image_converter.infrastructure.mapped_file import mapped_path
+
+
+# Documents a render worker keeps open between tasks, most recent last. The
+# pool outlives any one document, so each worker opens a document the first
+# time it renders one of its pages and reuses it for the next.
+_WORKER_OPEN_DOCUMENTS = 2
+_worker_documents: "OrderedDict[tuple, Any]" = OrderedDict()
+
+# Fewer pages than this are rendered in the calling thread: a worker parses
+# the whole document before its first page, which only pays off past a few.
+MIN_PAGES_FOR_POOL = 3
+
+
+def _render_page_in_worker(
+    document_key: tuple,
+    page_index: int,
+    max_scale: float,
+    raster_target: Optional[RasterTarget],
+    image_format: Optional[str],
+) -> Any:
+    return _render_page(_worker_document(document_key)[page_index], max_scale, raster_target, image_format)
+
+
+def _worker_document(document_key: tuple) -> Any:
+    document = _worker_documents.get(document_key)
+    if document is not None:
+        _worker_documents.move_to_end(document_key)
+        return document
+    import pypdfium2 as pdfium
+    document = pdfium.PdfDocument(document_key[0])
+    _worker_documents[document_key] = document
+    while len(_worker_documents) > _WORKER_OPEN_DOCUMENTS:
+        _worker_documents.popitem(last=False)[1].close()
+    return document
+
+
+def _document_key(path: str) -> tuple:
+    # The path alone is not enough: temp names are reused once a file is gone.
+    stat = os.stat(path)
+    return path, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _render_page(
+    page: Any, max_scale: float, raster_target: Optional[RasterTarget], image_format: Optional[str]
+) -> Any:
+    try:
+        scale = max_scale
+        if raster_target is not None:
+            scale = raster_target.scale_for(*page.get_size(), max_scale=max_scale)
+        # pdfium fills the bitmap in RGB order, so PIL takes the rows as they
+        # are instead of swapping channels.
+        pil_image = page.render(scale=scale, rev_byteorder=True).to_pil()
+        if image_format is None:
+            return pil_image
+        with BytesIO() as buffer:
+            pil_image.save(buffer, format=image_format)
+            return buffer.getvalue()
+    finally:
+        page.close()
+
+
+def _pool_context():
+    # Workers come from a clean server process rather than a fork of this
+    # (threaded) one, so they never inherit a lock held mid-render.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
 
 
 class PdfPageExtractor:
     """
     Renders PDF byte streams into individual rasterized pages so they can be
     processed by the existing image pipeline.
+
+    Pages come out encoded as `image_format`, or as decoded PIL images when
+    `image_format` is None, which spares the pipeline an encode and a decode
+    per page.
+
+    With `render_workers` above 1, documents of `MIN_PAGES_FOR_POOL` pages or
+    more are rendered by a process pool that is started on first use and
+    shared by every document this extractor renders. Workers open the
+    document by path: memory-mapped input by the path of the file it maps,
+    other input from a temporary copy on disk. Pages are still yielded in
+    order. The pool never has more workers than CPUs; when that leaves one,
+    rendering stays in the calling thread. At most `max_pages_in_flight`
+    pages per document (default: two per worker) are queued or waiting to be
+    consumed, so memory stays flat on long documents.
+
+    `dpi` is an upper bound: given a `RasterTarget`, each page is rendered at
+    the lowest resolution that still covers it.
     """
 
-    def __init__(self, logger: Optional[Logger] = None, dpi: int = 300, image_format: str = "PNG"):
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        dpi: int = 300,
+        image_format: Optional[str] = "PNG",
+        render_workers: int = 1,
+        max_pages_in_flight: Optional[int] = None,
+    ):
         self.logger = logger
         self.dpi = dpi
         self.image_format = image_format
+        self.render_workers = max(1, render_workers)
+        self.max_pages_in_flight = max_pages_in_flight
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
 
-    def rasterize_pages(self, pdf_bytes: bytes, source_hint: str = "") -> Result[Any]:
+    def rasterize_pages(
+        self,
+        pdf_bytes: bytes,
+        source_hint: str = "",
+        page_numbers: Optional[Sequence[int]] = None,
+        raster_target: Optional[RasterTarget] = None,
+    ) -> Result[Any]:
         """
-        Convert the provided PDF bytes into a generator of image-encoded page bytes.
+        Convert the provided PDF bytes into a generator of pages (encoded bytes,
+        or PIL images without an `image_format`).
+        `page_numbers` (1-based) restricts rendering to a subset of pages, in the
+        given order; by default every page is rendered. `raster_target` lowers
+        the render scale to what the rest of the pipeline keeps.
         """
         try:
             document = self._open_document(pdf_bytes)
-            
+            if page_numbers is None:
+                page_indices = range(len(document))
+            else:
+                page_indices = [number - 1 for number in page_numbers]
+                self._validate_page_indices(page_indices, len(document))
+
+            workers = min(self.render_workers, os.cpu_count() or 1)
+            if workers > 1 and len(page_indices) >= MIN_PAGES_FOR_POOL:
+                document.close()
+                return Result.success(self._render_in_pool(pdf_bytes, page_indices, workers, raster_target))
+
             def page_generator():
                 try:
                     scale = self._dpi_to_scale()
-                    for page_index in range(len(document)):
+                    for page_index in page_indices:
                         page = document[page_index]
-                        yield self._render_single_page(page, scale)
+                        yield self._render_single_page(page, scale, raster_target)
                 finally:
                     document.close()
-            
+
             return Result.success(page_generator())
         except Exception:
             self._log_failure(traceback.format_exc(), source_hint)
             return Result.failure("PDF could not be rendered.")
 
-    def _open_document(self, pdf_bytes: bytes) -> Any:
+    def count_pages(self, pdf_source: Any, source_hint: str = "") -> Result[int]:
+        """
+        Return the number of pages without rendering any of them. `pdf_source`
+        may be raw bytes or a file path.
+        """
+        try:
+            document = self._open_document(pdf_source)
+            try:
+                return Result.success(len(document))
+            finally:
+                document.close()
+        except Exception:
+            self._log_failure(traceback.format_exc(), source_hint)
+            return Result.failure("PDF could not be rendered.")
+
+    def _open_document(self, pdf_source: Any) -> Any:
         import pypdfium2 as pdfium
-        document = pdfium.PdfDocument(pdf_bytes)
+        if not isinstance(pdf_source, (bytes, str)):
+            # Memory-mapped input: pdfium reads it through a stream.
+            pdf_source = open_stream(pdf_source)
+        document = pdfium.PdfDocument(pdf_source)
         if len(document) == 0:
             raise ValueError("PDF contains no renderable pages.")
         return document
 
-    def _render_single_page(self, page: Any, scale: float) -> bytes:
+    def _render_single_page(
+        self, page: Any, scale: float, raster_target: Optional[RasterTarget] = None
+    ) -> Any:
+        return _render_page(page, scale, raster_target, self.image_format)
+
+    def _render_in_pool(
+        self,
+        pdf_bytes: Any,
+        page_indices: Sequence[int],
+        workers: int,
+        raster_target: Optional[RasterTarget],
+    ) -> Iterator[Any]:
+        window = max(1, self.max_pages_in_flight or 2 * workers)
+        pool = self._render_pool(workers)
+        path = mapped_path(pdf_bytes)
+        copy_path = None
+        pending: deque = deque()
+
         try:
-            pil_image = page.render(scale=scale).to_pil()
-            with BytesIO() as buffer:
-                pil_image.save(buffer, format=self.image_format)
-                return buffer.getvalue()
+            if path is None:
+                # Workers open documents by path, so bytes go to disk once.
+                fd, copy_path = tempfile.mkstemp(prefix=".pdf_render_", suffix=".pdf")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pdf_bytes)
+                path = copy_path
+            document_key = _document_key(path)
+            scale = self._dpi_to_scale()
+            remaining = iter(page_indices)
+
+            def submit_next() -> None:
+                page_index = next(remaining, None)
+                if page_index is not None:
+                    pending.append(pool.submit(
+                        _render_page_in_worker, document_key, page_index, scale, raster_target, self.image_format
+                    ))
+
+            for _ in range(window):
+                submit_next()
+            while pending:
+                page = pending.popleft().result()
+                submit_next()
+                yield page
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); the next document gets a fresh pool.
+            self._discard_pool(pool)
+            raise
         finally:
-            page.close()
+            # Also reached when the consumer stops early: drop queued pages.
+            for future in pending:
+                future.cancel()
+            if copy_path is not None:
+                # Workers that still have the copy open keep reading it unlinked.
+                os.unlink(copy_path)
+
+    def _render_pool(self, workers: int) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers != workers:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+                self._pool_workers = workers
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _validate_page_indices(page_indices: Sequence[int], page_count: int) -> None:
+        for page_index in page_indices:
+            if not 0 <= page_index < page_count:
+                raise ValueError(f"Page {page_index + 1} is out of range (1-{page_count}).")
 
     def _dpi_to_scale(self) -> float:
         return self.dpi / 72.0
@@ -1,6 +1,7 @@
 from io import BytesIO
 
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import InputBuffer, open_stream
 
 
 class PsdRenderer:
@@ -8,13 +9,28 @@ class PsdRenderer:
         self.logger = logger
 
     def render(self, source_name: str, data: bytes) -> Result[bytes]:
+        """Render the PSD composite and return it as PNG bytes."""
+        rendered = self.render_image(source_name, data)
+        if not rendered.is_successful:
+            return Result.failure(rendered.error)
+
+        try:
+            buffer = BytesIO()
+            rendered.value.save(buffer, format="PNG", optimize=False, compress_level=6)
+            return Result.success(buffer.getvalue())
+        except Exception as exc:
+            self.logger.log(f"Failed to render PSD '{source_name}': {exc!r}", "error")
+            return Result.failure("PSD could not be rendered.")
+
+    def render_image(self, source_name: str, data: InputBuffer):
+        """Render the PSD composite as a PIL image in an RGB/RGBA/L/LA mode."""
         try:
             from psd_tools import PSDImage
         except ImportError:
             return Result.failure("psd-tools is not installed; cannot process PSD files.")
 
         try:
-            psd = PSDImage.open(BytesIO(data))
+            psd = PSDImage.open(open_stream(data))
             flattened = psd.composite()
             if flattened is None:
                 raise ValueError(f"{source_name}: PSD contains no composite data")
@@ -25,9 +41,7 @@ class PsdRenderer:
                 else:
                     flattened = flattened.convert("RGB")
 
-            buffer = BytesIO()
-            flattened.save(buffer, format="PNG", optimize=False, compress_level=6)
-            return Result.success(buffer.getvalue())
+            return Result.success(flattened)
         except Exception as exc:
             self.logger.log(f"Failed to render PSD '{source_name}': {exc!r}", "error")
             return Result.failure("PSD could not be rendered.")
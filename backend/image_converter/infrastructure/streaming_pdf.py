@@ -0,0 +1,143 @@
+import os
+import re
+from array import array
+from dataclasses import dataclass
+
+from backend.image_converter.domain.jpeg_stream import jpeg_frame
+
+MERGED_PDF_NAME = "merged.pdf"
+
+_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+_CATALOG_ID = 1
+_PAGES_ID = 2
+_KIDS_PER_LINE = 64
+
+_COLOR_SPACES = {1: b"/DeviceGray", 3: b"/DeviceRGB", 4: b"/DeviceCMYK"}
+
+
+@dataclass(frozen=True)
+class PdfPage:
+    """
+    One page of output: `jpeg` placed at `x`, `y` (from the top-left corner)
+    and stretched to `width` x `height`, on a `page_width` x `page_height`
+    page. All lengths are in points.
+    """
+
+    page_width: float
+    page_height: float
+    x: float
+    y: float
+    width: float
+    height: float
+    jpeg: bytes
+
+
+class StreamingPdfWriter:
+    """
+    A PDF written one page at a time.
+
+    `add_page` writes the page's image, content stream and page object to
+    disk straight away. Only object offsets and page ids stay in memory, so
+    a document of thousands of pages costs about as much as one page. The
+    page tree, catalog and cross-reference table go out in `close`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        # Indexed by object id; the catalog and page tree are written last.
+        self._offsets = array("Q", [0, 0, 0])
+        self._page_ids = array("Q")
+        self._file.write(_HEADER)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def add_page(self, page: PdfPage) -> None:
+        pixel_w, pixel_h, components = jpeg_frame(page.jpeg)
+        color_space = _COLOR_SPACES.get(components)
+        if color_space is None:
+            raise ValueError(f"JPEGs with {components} components cannot be placed in a PDF.")
+
+        image_id = self._begin_object()
+        self._file.write(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s"
+            b" /BitsPerComponent 8 /Filter /DCTDecode" % (pixel_w, pixel_h, color_space)
+        )
+        if components == 4:
+            # Adobe writes CMYK JPEGs inverted.
+            self._file.write(b" /Decode [1 0 1 0 1 0 1 0]")
+        self._write_stream_body(page.jpeg)
+
+        # PDF space starts at the bottom-left corner.
+        bottom = page.page_height - page.y - page.height
+        content = b"q %s 0 0 %s %s %s cm /Im0 Do Q" % (
+            _num(page.width), _num(page.height), _num(page.x), _num(bottom)
+        )
+        content_id = self._begin_object()
+        self._write_stream_body(content, dictionary=b"<<")
+
+        page_id = self._begin_object()
+        self._file.write(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s]"
+            b" /Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>\nendobj\n"
+            % (_PAGES_ID, _num(page.page_width), _num(page.page_height), image_id, content_id)
+        )
+        self._page_ids.append(page_id)
+
+    def close(self) -> None:
+        """Finish the document. A PDF needs at least one page."""
+        if not self._page_ids:
+            raise ValueError("A PDF needs at least one page.")
+        try:
+            self._begin_object(_PAGES_ID)
+            self._file.write(b"<< /Type /Pages /Count %d /Kids [" % len(self._page_ids))
+            for start in range(0, len(self._page_ids), _KIDS_PER_LINE):
+                chunk = self._page_ids[start:start + _KIDS_PER_LINE]
+                self._file.write(b"\n" + b" ".join(b"%d 0 R" % page_id for page_id in chunk))
+            self._file.write(b"\n] >>\nendobj\n")
+
+            self._begin_object(_CATALOG_ID)
+            self._file.write(b"<< /Type /Catalog /Pages %d 0 R >>\nendobj\n" % _PAGES_ID)
+
+            xref_offset = self._file.tell()
+            self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self._offsets))
+            for offset in self._offsets[1:]:
+                self._file.write(b"%010d 00000 n \n" % offset)
+            self._file.write(
+                b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                % (len(self._offsets), _CATALOG_ID, xref_offset)
+            )
+        finally:
+            self._file.close()
+
+    def abort(self) -> None:
+        """Close and delete a document that will not be finished."""
+        self._file.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _begin_object(self, object_id: int = 0) -> int:
+        if not object_id:
+            object_id = len(self._offsets)
+            self._offsets.append(0)
+        self._offsets[object_id] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % object_id)
+        return object_id
+
+    def _write_stream_body(self, data: bytes, dictionary: bytes = b"") -> None:
+        self._file.write(dictionary + b" /Length %d >>\nstream\n" % len(data))
+        self._file.write(data)
+        self._file.write(b"\nendstream\nendobj\n")
+
+
+_TRAILING_ZEROS = re.compile(rb"\.?0+$")
+
+
+def _num(value: float) -> bytes:
+    text = b"%.4f" % value
+    text = _TRAILING_ZEROS.sub(b"", text) if b"." in text else text
+    return b"0" if text in (b"", b"-", b"-0") else text
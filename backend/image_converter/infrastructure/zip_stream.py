@@ -0,0 +1,225 @@
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Fields at or above these limits move to ZIP64 extra records, leaving the
+# marker value in the classic field.
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_COUNT_LIMIT = 0xFFFF
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_COUNT_MARKER = 0xFFFF
+
+_FLAG_DATA_DESCRIPTOR = 0x0008
+_FLAG_UTF8 = 0x0800
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_DESCRIPTOR = struct.Struct("<IIII")
+_DESCRIPTOR64 = struct.Struct("<IIQQ")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_END_RECORD64 = struct.Struct("<IQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<IIQI")
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    name: str
+    path: str
+    size: int
+    mtime: float
+
+    @classmethod
+    def from_path(cls, name: str, path: str) -> "ZipEntry":
+        stat = os.stat(path)
+        return cls(name=name, path=path, size=stat.st_size, mtime=stat.st_mtime)
+
+
+@dataclass(frozen=True)
+class _PlannedEntry:
+    entry: ZipEntry
+    encoded_name: bytes
+    offset: int
+
+    @property
+    def is_zip64(self) -> bool:
+        return self.entry.size >= _ZIP64_LIMIT or self.offset >= _ZIP64_LIMIT
+
+
+class ZipStream:
+    """
+    A ZIP archive produced while it is being sent.
+
+    Every entry is STORED. The outputs being archived are JPEG, AVIF, PNG and
+    PDF files that deflate gains next to nothing on. Because nothing is
+    compressed, the archive's exact length is known before the first byte,
+    and `content_length` can go out as Content-Length. CRCs are computed
+    while streaming and sent in data descriptors after each file. ZIP64
+    records are used once sizes, offsets or the entry count need them.
+    """
+
+    def __init__(self, entries: Sequence[ZipEntry]):
+        self._planned: List[_PlannedEntry] = []
+        offset = 0
+        for entry in entries:
+            planned = _PlannedEntry(entry, entry.name.encode("utf-8"), offset)
+            self._planned.append(planned)
+            offset += _local_header_size(planned) + entry.size + _descriptor_size(planned)
+        self._central_offset = offset
+        self._central_size = sum(_central_header_size(p) for p in self._planned)
+        self.content_length = self._central_offset + self._central_size + self._end_records_size()
+
+    def __iter__(self) -> Iterator[bytes]:
+        crcs = []
+        for planned in self._planned:
+            yield self._local_header(planned)
+            crc = 0
+            remaining = planned.entry.size
+            with open(planned.entry.path, "rb") as f:
+                while remaining:
+                    chunk = f.read(min(_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise IOError(f"{planned.entry.path} shrank while it was being archived.")
+                    crc = zlib.crc32(chunk, crc)
+                    remaining -= len(chunk)
+                    yield chunk
+            crcs.append(crc)
+            yield self._descriptor(planned, crc)
+        yield b"".join(self._central_header(p, crc) for p, crc in zip(self._planned, crcs))
+        yield self._end_records()
+
+    def _local_header(self, planned: _PlannedEntry) -> bytes:
+        size = planned.entry.size
+        extra = b""
+        if planned.is_zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, size, size)
+            size = _ZIP64_MARKER
+        dos_time, dos_date = _dos_timestamp(planned.entry.mtime)
+        return _LOCAL_HEADER.pack(
+            0x04034B50,
+            _VERSION_ZIP64 if planned.is_zip64 else _VERSION_DEFAULT,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            0,
+            dos_time,
+            dos_date,
+            0,
+            size,
+            size,
+            len(planned.encoded_name),
+            len(extra),
+        ) + planned.encoded_name + extra
+
+    @staticmethod
+    def _descriptor(planned: _PlannedEntry, crc: int) -> bytes:
+        size = planned.entry.size
+        if planned.is_zip64:
+            return _DESCRIPTOR64.pack(0x08074B50, crc, size, size)
+        return _DESCRIPTOR.pack(0x08074B50, crc, size, size)
+
+    @staticmethod
+    def _central_header(planned: _PlannedEntry, crc: int) -> bytes:
+        size, offset = planned.entry.size, planned.offset
+        extra = b""
+        if planned.is_zip64:
+            extra = struct.pack("<HHQQQ", 0x0001, 24, size, size, offset)
+            size = offset = _ZIP64_MARKER
+        dos_time, dos_date = _dos_timestamp(planned.entry.mtime)
+        version = _VERSION_ZIP64 if planned.is_zip64 else _VERSION_DEFAULT
+        return _CENTRAL_HEADER.pack(
+            0x02014B50,
+            (3 << 8) | version,  # made by: Unix
+            version,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            0,
+            dos_time,
+            dos_date,
+            crc,
+            size,
+            size,
+            len(planned.encoded_name),
+            len(extra),
+            0,
+            0,
+            0,
+            (0o100644 << 16),
+            offset,
+        ) + planned.encoded_name + extra
+
+    def _needs_zip64_end(self) -> bool:
+        return (
+            len(self._planned) >= _ZIP64_COUNT_LIMIT
+            or self._central_offset >= _ZIP64_LIMIT
+            or self._central_size >= _ZIP64_LIMIT
+        )
+
+    def _end_records_size(self) -> int:
+        size = _END_RECORD.size
+        if self._needs_zip64_end():
+            size += _END_RECORD64.size + _END_LOCATOR64.size
+        return size
+
+    def _end_records(self) -> bytes:
+        count = len(self._planned)
+        if not self._needs_zip64_end():
+            return _END_RECORD.pack(
+                0x06054B50, 0, 0, count, count, self._central_size, self._central_offset, 0
+            )
+        end64_offset = self._central_offset + self._central_size
+        end64 = _END_RECORD64.pack(
+            0x06064B50,
+            _END_RECORD64.size - 12,
+            (3 << 8) | _VERSION_ZIP64,
+            _VERSION_ZIP64,
+            0,
+            0,
+            count,
+            count,
+            self._central_size,
+            self._central_offset,
+        )
+        locator = _END_LOCATOR64.pack(0x07064B50, 0, end64_offset, 1)
+        end = _END_RECORD.pack(
+            0x06054B50, 0, 0, _ZIP64_COUNT_MARKER, _ZIP64_COUNT_MARKER, _ZIP64_MARKER, _ZIP64_MARKER, 0
+        )
+        return end64 + locator + end
+
+
+def collect_entries(folder: str) -> List[ZipEntry]:
+    """Every file below `folder`, named relative to it, in a stable order."""
+    entries = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            arcname = os.path.relpath(path, folder).replace(os.sep, "/")
+            entries.append(ZipEntry.from_path(arcname, path))
+    return entries
+
+
+def _local_header_size(planned: _PlannedEntry) -> int:
+    extra = 20 if planned.is_zip64 else 0
+    return _LOCAL_HEADER.size + len(planned.encoded_name) + extra
+
+
+def _descriptor_size(planned: _PlannedEntry) -> int:
+    return _DESCRIPTOR64.size if planned.is_zip64 else _DESCRIPTOR.size
+
+
+def _central_header_size(planned: _PlannedEntry) -> int:
+    extra = 28 if planned.is_zip64 else 0
+    return _CENTRAL_HEADER.size + len(planned.encoded_name) + extra
+
+
+def _dos_timestamp(mtime: float):
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, min(dos_date, 0xFFFF)
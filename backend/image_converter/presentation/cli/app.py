@@ -1,9 +1,13 @@
+import os
 import sys
 import traceback
 from backend.image_converter.presentation.cli.argument_parser import parse_arguments
 from backend.image_converter.core.image_conversion_processor import ImageConversionProcessor
 from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.config import settings
+from backend.image_converter.domain.encoder_effort import EncoderEffort
 from backend.image_converter.domain.pdf_quality import PdfQuality
+from backend.image_converter.infrastructure.conversion_cache import create_conversion_cache
 from backend.image_converter.infrastructure.logger import Logger
 
 def main(argv=None):
@@ -26,11 +30,17 @@ def main(argv=None):
         pdf_scale = args.pdf_scale
         pdf_margin_mm = args.pdf_margin_mm
         pdf_paginate = args.pdf_paginate
+        pdf_merge = args.pdf_merge
         if image_format != ImageFormat.PDF:
             pdf_preset = None
             pdf_scale = "fit"
             pdf_margin_mm = None
             pdf_paginate = False
+            pdf_merge = False
+        jobs = args.jobs or os.cpu_count() or 1
+        # Only directory runs fan out to worker processes, each encoding one
+        # file at a time; everything else encodes in this process.
+        concurrent_encodes = jobs if os.path.isdir(args.source) and not pdf_merge else 1
         processor = ImageConversionProcessor(
             source=args.source,
             destination=args.destination,
@@ -44,7 +54,14 @@ def main(argv=None):
             pdf_quality=PdfQuality.default(),
             use_rembg=args.remove_background,
             debug=args.debug,
-            json_output=args.json_output
+            json_output=args.json_output,
+            jobs=jobs,
+            fast_downscale=args.fast_downscale,
+            conversion_cache=create_conversion_cache(settings.get(), logger) if args.use_cache else None,
+            max_decoded_page_bytes=settings.get().processing.max_memory_bytes,
+            pdf_merge=pdf_merge,
+            effort=EncoderEffort(args.effort),
+            avif_threads=settings.get().avif.thread_budget(concurrent_encodes=concurrent_encodes),
         )
 
         processor.run()
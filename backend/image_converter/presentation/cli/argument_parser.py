@@ -1,5 +1,16 @@
 import argparse
 
+
+def _positive_int(value: str) -> int:
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: '{value}'")
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {parsed}")
+    return parsed
+
+
 def parse_arguments(argv=None) -> argparse.Namespace:
     """Parse command-line arguments for the image conversion script."""
     parser = argparse.ArgumentParser(
@@ -67,11 +78,44 @@ def parse_arguments(argv=None) -> argparse.Namespace:
         action="store_true",
         help="Split long images across multiple PDF pages (presets only)."
     )
+    parser.add_argument(
+        "--pdf-merge",
+        action="store_true",
+        help="Write every page into a single merged.pdf, in natural filename order, "
+             "instead of one PDF per input (only used with --format pdf)."
+    )
     parser.add_argument(
         "--remove-background",
         action="store_true",
         help="Remove image background using local AI (works with --format png or --format avif)"
     )
+    parser.add_argument(
+        "--effort",
+        type=str,
+        choices=["fast", "balanced", "max"],
+        default="balanced",
+        help="AVIF and PNG encoder effort: fast, balanced or max (default: balanced). "
+             "Higher effort gives smaller files at the cost of encode time."
+    )
+    parser.add_argument(
+        "--no-fast-downscale",
+        dest="fast_downscale",
+        action="store_false",
+        help="Fully decode JPEGs before resizing instead of using the decoder's DCT scaling "
+             "(slower, but bit-exact with a plain LANCZOS resize)."
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Always convert instead of reusing earlier results from the conversion cache."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Number of worker processes used for directory runs (default: CPU count)."
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
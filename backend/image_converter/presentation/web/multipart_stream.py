@@ -0,0 +1,202 @@
+import io
+import mmap
+import tempfile
+import weakref
+from collections import deque
+from typing import IO, Callable, Iterator, List, Optional, Tuple, Union
+
+from flask import Request
+from werkzeug.datastructures import MultiDict
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+from werkzeug.utils import secure_filename
+
+from backend.image_converter.application.dtos import IncomingFile
+from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.domain.input_buffer import InputBuffer
+from backend.image_converter.infrastructure.mapped_file import map_open_file
+
+_CHUNK_SIZE = 64 * 1024
+# Hidden, so temp-folder cleanup never mistakes a spooled upload for its own files.
+_SPOOL_PREFIX = ".upload_"
+
+_FileStarted = object()
+_Event = Union[Tuple[str, str], IncomingFile, object]
+
+
+class UploadRejectedError(ValueError):
+    """A streamed upload the client has to fix: malformed, late fields or unsupported files."""
+
+
+class _SpooledUpload:
+    """
+    A file part as it arrives: in memory up to the spool threshold, then in a
+    named file in the spool directory. A spooled part is handed out mapped,
+    and its file keeps its name until the mapping is released, so other
+    processes (PDF render workers) can open it by path.
+    """
+
+    def __init__(self, spool_dir: str, spool_threshold_bytes: int):
+        self._spool_dir = spool_dir
+        self._spool_threshold_bytes = spool_threshold_bytes
+        self._container: IO[bytes] = io.BytesIO()
+        self._spooled = False
+
+    def write(self, data: bytes) -> None:
+        if not self._spooled and self._container.tell() + len(data) > self._spool_threshold_bytes:
+            spool = tempfile.NamedTemporaryFile(dir=self._spool_dir, prefix=_SPOOL_PREFIX)
+            spool.write(self._container.getvalue())
+            self._container, self._spooled = spool, True
+        self._container.write(data)
+
+    def read_bytes(self) -> Result[InputBuffer]:
+        # Each upload is read exactly once, so release it straight away. Parts
+        # that rolled over to disk are mapped rather than read back in.
+        keep_file = False
+        try:
+            if not self._spooled:
+                return Result.success(self._container.getvalue())
+            data = map_open_file(self._container, self._container.name)
+            if isinstance(data, mmap.mmap):
+                weakref.finalize(data, self._container.close)
+                keep_file = True
+            return Result.success(data)
+        except Exception as exc:
+            return Result.failure(f"Failed to read upload: {exc}")
+        finally:
+            if not keep_file:
+                self.close()
+
+    def close(self) -> None:
+        self._container.close()
+
+
+class StreamingMultipartReader:
+    """
+    Parses a multipart/form-data body while it is still arriving.
+
+    `read_fields` consumes the form fields that precede the first file part.
+    `iter_files` then yields each file part as soon as its closing boundary
+    has been read, so conversion of file N can start while file N+1 is still
+    uploading. Parts stay in memory up to `spool_threshold_bytes` and roll
+    over to an anonymous file in `spool_dir` past that.
+
+    A client that sends files before any field is served in buffered mode:
+    the whole body is read (and spooled) before the first file is handed out,
+    so every setting is known.
+
+    Parts are checked as they arrive. A file `accept_file` refuses, a field
+    that follows files in streaming mode (conversion already started without
+    it) or a malformed body raises `UploadRejectedError`; in buffered mode
+    that happens in `read_fields`, before anything is converted.
+    """
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        boundary: bytes,
+        spool_dir: str,
+        spool_threshold_bytes: int,
+        file_field: str = "files[]",
+        accept_file: Callable[[str], bool] = lambda name: True,
+    ):
+        self.spool_dir = spool_dir
+        self.spool_threshold_bytes = spool_threshold_bytes
+        self.file_field = file_field
+        self.accept_file = accept_file
+        self.fields: MultiDict = MultiDict()
+        self.buffered = False
+        self._pending: deque = deque()
+        self._events = self._parse(stream, boundary)
+
+    @classmethod
+    def from_request(
+        cls,
+        request: Request,
+        spool_dir: str,
+        spool_threshold_bytes: int,
+        accept_file: Callable[[str], bool] = lambda name: True,
+    ) -> Optional["StreamingMultipartReader"]:
+        """Return a reader for multipart requests, or None for anything else."""
+        boundary = request.mimetype_params.get("boundary")
+        if request.mimetype != "multipart/form-data" or not boundary:
+            return None
+        return cls(
+            request.stream,
+            boundary.encode("latin-1"),
+            spool_dir,
+            spool_threshold_bytes,
+            accept_file=accept_file,
+        )
+
+    def read_fields(self) -> MultiDict:
+        """Read fields up to the first file part; buffer the body if no field came first."""
+        for event in self._events:
+            if event is _FileStarted:
+                if not self.fields:
+                    self._buffer_remaining()
+                break
+            if isinstance(event, tuple):
+                self.fields.add(*event)
+        return self.fields
+
+    def iter_files(self) -> Iterator[IncomingFile]:
+        while self._pending:
+            yield self._pending.popleft()
+        for event in self._events:
+            if isinstance(event, tuple):
+                raise UploadRejectedError(f"Form fields must be sent before files: {event[0]}")
+            if isinstance(event, IncomingFile):
+                yield event
+
+    def _buffer_remaining(self) -> None:
+        self.buffered = True
+        for event in self._events:
+            if isinstance(event, tuple):
+                self.fields.add(*event)
+            elif isinstance(event, IncomingFile):
+                self._pending.append(event)
+
+    def _parse(self, stream: IO[bytes], boundary: bytes) -> Iterator[_Event]:
+        decoder = MultipartDecoder(boundary)
+        part: Optional[Union[Field, File]] = None
+        field_chunks: List[bytes] = []
+        container: Optional[_SpooledUpload] = None
+
+        while True:
+            try:
+                event = decoder.next_event()
+                if isinstance(event, NeedData):
+                    chunk = stream.read(_CHUNK_SIZE)
+                    decoder.receive_data(chunk or None)
+                    continue
+            except ValueError as exc:
+                raise UploadRejectedError(f"Malformed upload: {exc}") from exc
+            if isinstance(event, Epilogue):
+                return
+            if isinstance(event, Field):
+                part, field_chunks = event, []
+            elif isinstance(event, File):
+                part = event
+                container = None
+                if event.name == self.file_field:
+                    name = secure_filename(event.filename or "upload")
+                    if name and not self.accept_file(name):
+                        raise UploadRejectedError(f"Unsupported file types: {event.filename}")
+                    yield _FileStarted
+                    container = _SpooledUpload(self.spool_dir, self.spool_threshold_bytes)
+            elif isinstance(event, Data):
+                if isinstance(part, Field):
+                    field_chunks.append(event.data)
+                elif container is not None:
+                    container.write(event.data)
+                if event.more_data:
+                    continue
+                if isinstance(part, Field):
+                    yield part.name, b"".join(field_chunks).decode("utf-8", "replace")
+                elif container is not None:
+                    name = secure_filename(part.filename or "upload")
+                    if name:
+                        yield IncomingFile(name=name, read_bytes=container.read_bytes)
+                    else:
+                        container.close()
+                    container = None
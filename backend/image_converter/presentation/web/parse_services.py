@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Mapping, Optional, Sequence
 
 from flask import Request
+from werkzeug.datastructures import FileStorage
 
 from backend.image_converter.application.dtos import CompressionFormData
 from backend.image_converter.core.enums.image_format import ImageFormat
@@ -9,7 +10,17 @@ from backend.image_converter.infrastructure.logger import Logger
 
 
 def extract_form_data(request: Request, logger: Logger) -> Result[CompressionFormData]:
-    uploaded_files = request.files.getlist("files[]")
+    return _build_form_data(request.form, request.files.getlist("files[]"), logger)
+
+
+def extract_streamed_form_data(fields: Mapping[str, str], logger: Logger) -> Result[CompressionFormData]:
+    """Form data for a streamed upload: the files are read later, one by one."""
+    return _build_form_data(fields, [], logger)
+
+
+def _build_form_data(
+    form: Mapping[str, str], uploaded_files: Sequence[FileStorage], logger: Logger
+) -> Result[CompressionFormData]:
     allowed_files = [f for f in uploaded_files if is_file_supported(f.filename)]
     unsupported_files = [f for f in uploaded_files if not is_file_supported(f.filename)]
 
@@ -17,23 +28,27 @@ def extract_form_data(request: Request, logger: Logger) -> Result[CompressionFor
         unsupported_names = ", ".join(f.filename for f in unsupported_files)
         return Result.failure(f"Unsupported file types: {unsupported_names}")
 
-    raw_format = request.form.get("format", ImageFormat.JPEG.value).lower()
+    raw_format = form.get("format", ImageFormat.JPEG.value).lower()
     format_result = ImageFormat.from_string_result(raw_format)
     if not format_result.is_successful:
         return Result.failure(format_result.error or "Unsupported image format")
 
     form_data = CompressionFormData(
         uploaded_files=tuple(allowed_files),
-        quality=_parse_quality(request.form.get("quality", "85"), logger),
-        width=_parse_width(request.form.get("width", ""), logger),
+        quality=_parse_quality(form.get("quality", "85"), logger),
+        width=_parse_width(form.get("width", ""), logger),
         image_format=format_result.value,
-        target_size_kb=_parse_target_size_kb(request.form.get("target_size_kb", ""), logger),
-        use_rembg=_parse_bool(request.form.get("use_rembg")),
-        pdf_preset=request.form.get("pdf_preset", "").strip(),
-        pdf_scale=request.form.get("pdf_scale", "").strip(),
-        pdf_margin_mm=_parse_margin_mm(request.form.get("pdf_margin_mm", ""), logger),
-        pdf_paginate=_parse_bool(request.form.get("pdf_paginate")),
-        pdf_quality=request.form.get("pdf_quality", "high").strip(),
+        target_size_kb=_parse_target_size_kb(form.get("target_size_kb", ""), logger),
+        use_rembg=_parse_bool(form.get("use_rembg")),
+        pdf_preset=form.get("pdf_preset", "").strip(),
+        pdf_scale=form.get("pdf_scale", "").strip(),
+        pdf_margin_mm=_parse_margin_mm(form.get("pdf_margin_mm", ""), logger),
+        pdf_paginate=_parse_bool(form.get("pdf_paginate")),
+        pdf_quality=form.get("pdf_quality", "high").strip(),
+        fast_downscale=_parse_bool(form.get("fast_downscale"), default=True),
+        pdf_merge=_parse_bool(form.get("pdf_merge")),
+        pdf_merge_order=form.get("pdf_merge_order", "upload").strip(),
+        effort=form.get("effort", "balanced").strip(),
     )
     return Result.success(form_data)
 
@@ -78,9 +93,9 @@ def _parse_target_size_kb(value: str, logger: Logger) -> Optional[int]:
         return None
 
 
-def _parse_bool(value: Optional[str]) -> bool:
+def _parse_bool(value: Optional[str], default: bool = False) -> bool:
     if value is None:
-        return False
+        return default
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
@@ -1,17 +1,22 @@
+import os
 from datetime import datetime, timezone
 
-from flask import Blueprint, Response, request, jsonify, send_file, send_from_directory
+from flask import Blueprint, Response, request, jsonify, send_file
 
 from backend.image_converter.application.compress_images_usecase import CompressImagesUseCase
 from backend.image_converter.application.payload_expander_factory import create_payload_expander
 from backend.image_converter.config import settings
 from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
-from backend.image_converter.core.internals.utilities import has_internet
+from backend.image_converter.core.factory.converter_pool import get_converter_pool
+from backend.image_converter.core.internals.utilities import has_internet, is_file_supported
 from backend.image_converter.domain.image_resizer import ImageResizer
+from backend.image_converter.infrastructure.conversion_cache import create_conversion_cache
 from backend.image_converter.infrastructure.local_storage import LocalStorage
 from backend.image_converter.infrastructure.logger import Logger
-from backend.image_converter.presentation.web.parse_services import extract_form_data
+from backend.image_converter.presentation.web.multipart_stream import StreamingMultipartReader, UploadRejectedError
+from backend.image_converter.presentation.web.parse_services import extract_form_data, extract_streamed_form_data
 from backend.image_converter.presentation.web.services.backend_diagnostics_service import BackendDiagnosticsService
+from backend.image_converter.presentation.web.services.compression_job_service import CompressionJobService
 from backend.image_converter.presentation.web.services.compression_service import CompressionService
 from backend.image_converter.presentation.web.services.configuration_service import ConfigurationService
 from backend.image_converter.presentation.web.services.crop_bitmap_request_service import CropBitmapRequestService
@@ -29,11 +34,41 @@ logger = Logger(debug=False, json_output=False)
 
 resizer = ImageResizer()
 storage = LocalStorage(logger=logger)
-payload_expander = create_payload_expander(logger)
-use_case = CompressImagesUseCase(logger, resizer, ImageConverterFactory, storage, payload_expander)
+payload_expander = create_payload_expander(
+    logger,
+    pdf_render_workers=_config.pdf.render_workers,
+    pdf_max_pages_in_flight=_config.pdf.max_pages_in_flight,
+)
+conversion_cache = create_conversion_cache(_config, logger)
+web_workers = _config.web.workers.resolve(fallback_when_auto=os.cpu_count() or 1)
+# Every Granian worker runs its own page pool, so the CPUs (and the AVIF
+# thread budget) are shared by all of their pages.
+max_concurrent_pages = _config.compression.pages_per_web_worker(web_workers)
+avif_threads = _config.avif.thread_budget(concurrent_encodes=web_workers * max_concurrent_pages)
+use_case = CompressImagesUseCase(
+    logger,
+    resizer,
+    ImageConverterFactory,
+    storage,
+    payload_expander,
+    max_workers=max_concurrent_pages,
+    max_background_removal_workers=_config.compression.max_concurrent_background_removals,
+    target_size_proxy_pixels=_config.compression.target_size_proxy_pixels,
+    background_removal_batch_size=_config.rembg.batch_size,
+    conversion_cache=conversion_cache,
+    max_decoded_page_bytes=_config.processing.max_memory_bytes,
+    avif_threads=avif_threads,
+)
 
-temp_folder_service = TemporaryFolderService(TEMP_DIR, EXPIRATION_TIME, logger)
+temp_folder_service = TemporaryFolderService(TEMP_DIR, EXPIRATION_TIME, logger, conversion_cache)
 compression_service = CompressionService(logger, use_case, temp_folder_service)
+compression_job_service = CompressionJobService(
+    logger,
+    compression_service,
+    TEMP_DIR,
+    max_concurrent_jobs=_config.jobs.max_concurrent,
+    max_queued_jobs=_config.jobs.max_queued,
+)
 storage_management_service = StorageManagementService(
     is_enabled=_config.features.is_storage_management_enabled,
 )
@@ -49,6 +84,9 @@ backend_diagnostics_service = BackendDiagnosticsService(
     logger,
     TEMP_DIR,
     storage_management_service,
+    conversion_cache=conversion_cache,
+    converter_pool=get_converter_pool(),
+    avif_threads=avif_threads,
 )
 
 
@@ -60,15 +98,69 @@ def _storage_management_disabled_response():
 def compress_images():
     temp_folder_service.cleanup()
 
+    reader = None
+    if _config.uploads.streaming_ingest:
+        reader = StreamingMultipartReader.from_request(
+            request, TEMP_DIR, _config.uploads.spool_threshold_bytes, accept_file=is_file_supported
+        )
+
+    try:
+        if reader is None:
+            data_result = extract_form_data(request, logger)
+        else:
+            data_result = extract_streamed_form_data(reader.read_fields(), logger)
+        if not data_result.is_successful:
+            return jsonify({"error": str(data_result.error)}), 400
+
+        if reader is None:
+            result = compression_service.compress(data_result.value)
+        else:
+            result = compression_service.compress_streamed(data_result.value, reader)
+    except UploadRejectedError as e:
+        return jsonify({"error": str(e)}), 400
+    if not result.is_successful:
+        return jsonify({"error": "Compression failed", "message": result.error}), 500
+
+    return jsonify({"status": "ok", **result.value.to_json_dict()}), 200
+
+
+@api_blueprint.route("/jobs", methods=["POST"])
+def submit_compression_job():
+    temp_folder_service.cleanup()
+
     data_result = extract_form_data(request, logger)
     if not data_result.is_successful:
         return jsonify({"error": str(data_result.error)}), 400
 
-    result = compression_service.compress(data_result.value)
+    result = compression_job_service.submit(data_result.value)
     if not result.is_successful:
-        return jsonify({"error": "Compression failed", "message": result.error}), 500
+        status = 503 if result.error == CompressionJobService.QUEUE_FULL_ERROR else 400
+        return jsonify({"error": result.error}), status
 
-    return jsonify({"status": "ok", **result.value.to_json_dict()}), 200
+    job_id = result.value.job_id
+    return jsonify({
+        "job_id": job_id,
+        "status_url": f"/api/jobs/{job_id}",
+        "events_url": f"/api/jobs/{job_id}/events",
+    }), 202
+
+
+@api_blueprint.route("/jobs/<job_id>", methods=["GET"])
+def compression_job_status(job_id):
+    job = compression_job_service.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job.to_json_dict()), 200
+
+
+@api_blueprint.route("/jobs/<job_id>/events", methods=["GET"])
+def compression_job_events(job_id):
+    if compression_job_service.get(job_id) is None:
+        return jsonify({"error": "Job not found."}), 404
+    response = Response(compression_job_service.events(job_id), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 @api_blueprint.route("/download", methods=["GET"])
@@ -98,7 +190,11 @@ def download_all():
 
     if not result.is_successful:
         return jsonify({"error": result.error}), 400
-    return send_from_directory(TEMP_DIR, result.value, as_attachment=True, mimetype="application/zip")
+    archive = result.value
+    response = Response(archive.stream, mimetype="application/zip", direct_passthrough=True)
+    response.headers["Content-Length"] = str(archive.stream.content_length)
+    response.headers["Content-Disposition"] = f'attachment; filename="{archive.download_name}"'
+    return response
 
 
 @api_blueprint.route("/storage_info", methods=["GET"])
@@ -1,3 +1,4 @@
+import os
 import traceback
 
 import pillow_heif
@@ -6,7 +7,9 @@ from flask import Flask, jsonify
 from werkzeug.exceptions import HTTPException
 
 from backend.image_converter.config import settings
+from backend.image_converter.core.internals.rembg_sessions import get_session_registry
 from backend.image_converter.infrastructure.cleanup_service import CleanupService
+from backend.image_converter.infrastructure.conversion_cache import create_conversion_cache
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.presentation.web.error_handlers import (
     handle_http_exception,
@@ -21,6 +24,10 @@ pillow_heif.register_heif_opener()
 
 _config = settings.get()
 
+# Set by the bootstrapper on Granian worker processes (not the supervisor that
+# also imports this module), so per-worker startup work only runs there.
+WEB_WORKER_ENV = "IMGCOMPRESS_WEB_WORKER"
+
 TEMP_DIR = _config.temporary_storage.directory
 EXPIRATION_TIME = _config.temporary_storage.max_age_seconds
 
@@ -60,7 +67,9 @@ def global_handle_exception(e):
 
 
 def start_scheduler():
-    cleanup_service = CleanupService(TEMP_DIR, EXPIRATION_TIME, app_logger)
+    cleanup_service = CleanupService(
+        TEMP_DIR, EXPIRATION_TIME, app_logger, create_conversion_cache(_config, app_logger)
+    )
 
     def scheduled_cleanup():
         result = cleanup_service.cleanup_temp_folders()
@@ -79,6 +88,16 @@ def start_scheduler():
     app_logger.log("Scheduler started for periodic temp folder cleanup.", "info")
 
 
+def warm_up_background_removal():
+    if _config.rembg.warm_up_on_boot:
+        get_session_registry().warm_up_in_background(_config.rembg.model_name, app_logger)
+
+
+if os.environ.get(WEB_WORKER_ENV) == "1":
+    warm_up_background_removal()
+
+
 if __name__ == "__main__":
     start_scheduler()
+    warm_up_background_removal()
     app.run(host=_config.web.host, port=_config.web.port, threaded=True)
@@ -23,12 +23,18 @@ class BackendDiagnosticsService:
         storage_management_service,
         log_path_provider=get_backend_log_file_path,
         log_reader=read_backend_log_file,
+        conversion_cache=None,
+        converter_pool=None,
+        avif_threads=None,
     ):
         self.logger = logger
         self.temp_dir = temp_dir
         self.storage_management_service = storage_management_service
         self.log_path_provider = log_path_provider
         self.log_reader = log_reader
+        self.conversion_cache = conversion_cache
+        self.converter_pool = converter_pool
+        self.avif_threads = avif_threads
 
     def build_log_document(self) -> DiagnosticsDocument:
         return DiagnosticsDocument(
@@ -46,10 +52,42 @@ class BackendDiagnosticsService:
             f"temp_dir: {self.temp_dir}",
             f"log_file: {self.log_path_provider()}",
             f"storage_management_enabled: {self.storage_management_service.is_storage_management_enabled()}",
+            f"conversion_cache: {self._conversion_cache_line()}",
+            f"converter_pool: {self._converter_pool_line()}",
+            f"avif_encoder: {self._avif_encoder_line()}",
             "## Captured backend logs",
             self._captured_logs(),
         ]
 
+    def _conversion_cache_line(self) -> str:
+        if self.conversion_cache is None:
+            return "disabled"
+        stats = self.conversion_cache.stats()
+        # Hits and misses are counted per worker process; entries are shared.
+        return (
+            f"hits={stats.hits} misses={stats.misses} "
+            f"entries={stats.entries} size_bytes={stats.size_bytes}"
+        )
+
+    def _converter_pool_line(self) -> str:
+        if self.converter_pool is None:
+            return "disabled"
+        stats = self.converter_pool.stats()
+        # Converters are pooled per worker process.
+        return (
+            f"hits={stats.hits} misses={stats.misses} evictions={stats.evictions} "
+            f"size={stats.size} capacity={stats.capacity}"
+        )
+
+    def _avif_encoder_line(self) -> str:
+        if self.avif_threads is None:
+            return "library defaults"
+        budget = self.avif_threads
+        return (
+            f"threads_per_encode={budget.threads_per_encode} total_threads={budget.total_threads} "
+            f"concurrent_encodes={budget.concurrent_encodes} autotiling={budget.autotiling}"
+        )
+
     def _captured_logs(self) -> str:
         return (
             self.log_reader()
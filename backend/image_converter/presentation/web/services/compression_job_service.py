@@ -0,0 +1,236 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Iterator, List, Optional
+
+from backend.image_converter.application.dtos import CompressionFormData, PageProgress
+from backend.image_converter.core.internals.utilities import Result
+
+
+JOB_FILE_PREFIX = "job_"
+# Scratch copies of status files; the leading dot keeps temp cleanup off them.
+_JOB_SCRATCH_PREFIX = f".{JOB_FILE_PREFIX}"
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_SUCCEEDED = "succeeded"
+STATE_FAILED = "failed"
+_FINISHED_STATES = (STATE_SUCCEEDED, STATE_FAILED)
+
+
+@dataclass
+class FileProgress:
+    name: str
+    pages_done: int = 0
+    pages_failed: int = 0
+    outputs: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CompressionJob:
+    job_id: str
+    state: str
+    files: List[FileProgress]
+    created_at: float
+    updated_at: float
+    # Bumped on every save so event streams can tell new progress apart.
+    revision: int = 0
+    # The /compress response body once the job succeeded.
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in _FINISHED_STATES
+
+    def to_json_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json_dict(cls, data: dict) -> "CompressionJob":
+        files = [FileProgress(**entry) for entry in data.pop("files")]
+        return cls(files=files, **data)
+
+
+class CompressionJobService:
+    """
+    Runs /compress requests in the background and tracks their progress.
+
+    Submitting saves the uploads in the request thread (the body has to be
+    read there) and queues the conversion on a bounded executor. Job status
+    lives in `<temp_dir>/job_<id>.json` rather than in memory, so any web
+    worker process can answer status and event-stream requests for a job
+    another worker runs. Finished jobs point at a regular `converted_` folder,
+    which /api/download and /api/download_all serve as before.
+    """
+
+    QUEUE_FULL_ERROR = "Too many compression jobs are waiting; try again later."
+
+    def __init__(
+        self,
+        logger,
+        compression_service,
+        temp_dir: str,
+        max_concurrent_jobs: int = 1,
+        max_queued_jobs: int = 16,
+        poll_interval_seconds: float = 0.5,
+        heartbeat_seconds: float = 15.0,
+    ):
+        self.logger = logger
+        self.compression_service = compression_service
+        self.temp_dir = temp_dir
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.max_queued_jobs = max(0, max_queued_jobs)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def submit(self, form_data: CompressionFormData) -> Result[CompressionJob]:
+        if not self._reserve_slot():
+            return Result.failure(self.QUEUE_FULL_ERROR)
+        prepared = None
+        try:
+            prepared = self.compression_service.prepare(form_data)
+            if not prepared.is_successful:
+                self._release_slot()
+                return Result.failure(prepared.error)
+
+            now = time.time()
+            job = CompressionJob(
+                job_id=uuid.uuid4().hex,
+                state=STATE_QUEUED,
+                files=[FileProgress(name=name) for name in prepared.value.file_names],
+                created_at=now,
+                updated_at=now,
+            )
+            self._save(job)
+            self._get_executor().submit(self._run, job, prepared.value)
+        except Exception:
+            self._release_slot()
+            if prepared is not None and prepared.is_successful:
+                self.compression_service.discard(prepared.value)
+            self.logger.log(f"Failed to queue compression job: {traceback.format_exc()}", "error")
+            return Result.failure("Failed to queue compression job.")
+        return Result.success(job)
+
+    def get(self, job_id: str) -> Optional[CompressionJob]:
+        path = self._job_path(job_id)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CompressionJob.from_json_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def events(self, job_id: str) -> Iterator[str]:
+        """Server-sent events: `progress` on every change, then one `done`."""
+        last_revision = None
+        last_sent = time.monotonic()
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                yield _sse("error", {"error": "Job not found."})
+                return
+            if job.is_finished:
+                yield _sse("done", job.to_json_dict())
+                return
+            if job.revision != last_revision:
+                last_revision = job.revision
+                last_sent = time.monotonic()
+                yield _sse("progress", job.to_json_dict())
+            elif time.monotonic() - last_sent >= self.heartbeat_seconds:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            time.sleep(self.poll_interval_seconds)
+
+    def _run(self, job: CompressionJob, prepared) -> None:
+        try:
+            job.state = STATE_RUNNING
+            self._save(job)
+
+            def on_page_done(progress: PageProgress) -> None:
+                self._record_page(job, progress)
+                self._save(job)
+
+            result = self.compression_service.run(prepared, on_page_done=on_page_done)
+            if result.is_successful:
+                job.state = STATE_SUCCEEDED
+                job.result = {"status": "ok", **result.value.to_json_dict()}
+            else:
+                job.state = STATE_FAILED
+                job.error = result.error
+            self._save(job)
+        except Exception:
+            self.logger.log(f"Compression job {job.job_id} crashed: {traceback.format_exc()}", "error")
+            job.state = STATE_FAILED
+            job.error = "Unexpected compression failure."
+            self._save(job)
+        finally:
+            self._release_slot()
+
+    @staticmethod
+    def _record_page(job: CompressionJob, progress: PageProgress) -> None:
+        entry = next((f for f in job.files if f.name == progress.file), None)
+        if entry is None:
+            entry = FileProgress(name=progress.file)
+            job.files.append(entry)
+        if progress.error is not None:
+            entry.pages_failed += 1
+            entry.errors.append(progress.error)
+        else:
+            entry.pages_done += 1
+            entry.outputs.append(progress.output)
+
+    def _save(self, job: CompressionJob) -> None:
+        job.revision += 1
+        job.updated_at = time.time()
+        # Write-then-rename so readers in other processes never see half a file.
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{_JOB_SCRATCH_PREFIX}{job.job_id}.", dir=self.temp_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(job.to_json_dict(), f)
+            os.replace(tmp_path, self._job_path(job.job_id))
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def _job_path(self, job_id: str) -> Optional[str]:
+        if not _JOB_ID.match(job_id or ""):
+            return None
+        return os.path.join(self.temp_dir, f"{JOB_FILE_PREFIX}{job_id}.json")
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._active >= self.max_concurrent_jobs + self.max_queued_jobs:
+                return False
+            self._active += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so importing the routes starts no threads.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_jobs, thread_name_prefix="compress-job"
+                )
+            return self._executor
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
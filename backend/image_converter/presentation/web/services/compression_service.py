@@ -2,8 +2,10 @@ import os
 import shutil
 import time
 import traceback
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple
 
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 
 from backend.image_converter.application.compress_images_usecase import CompressImagesUseCase
@@ -11,6 +13,8 @@ from backend.image_converter.application.dtos import (
     CompressionFormData,
     CompressionResponse,
     CompressRequest,
+    IncomingFile,
+    PageProgress,
 )
 from backend.image_converter.core.enums.image_format import ImageFormat
 from backend.image_converter.core.internals.utilities import Result
@@ -20,8 +24,26 @@ from backend.image_converter.domain.pdf_presets import (
     resolve_pdf_preset,
     resolve_pdf_scale,
 )
+from backend.image_converter.domain.pdf_merge import PdfMergeOrder
+from backend.image_converter.domain.encoder_effort import EncoderEffort
 from backend.image_converter.domain.pdf_quality import PdfQuality
 from backend.image_converter.domain.units import TargetSize, to_bytes
+from backend.image_converter.infrastructure.zip_stream import ZipStream, collect_entries
+from backend.image_converter.presentation.web.multipart_stream import UploadRejectedError
+
+
+@dataclass(frozen=True)
+class ZipDownload:
+    stream: ZipStream
+    download_name: str
+
+
+@dataclass(frozen=True)
+class PreparedCompression:
+    """A validated request whose uploads are saved and ready to convert."""
+
+    request: CompressRequest
+    file_names: Tuple[str, ...] = ()
 
 
 class CompressionService:
@@ -30,29 +52,62 @@ class CompressionService:
         self.use_case = use_case
         self.temp_folder_service = temp_folder_service
 
-    def create_all_files_zip(self, folder_param: str) -> Result[str]:
+    def create_all_files_zip(self, folder_param: str) -> Result[ZipDownload]:
+        """Plan a ZIP of the folder; the archive is produced while it is sent."""
         folder_path = self.temp_folder_service.get_validated_path(folder_param)
 
         if not folder_path:
             return Result.failure("Invalid or unauthorized folder.")
 
         try:
-            zip_name = f"converted_{int(time.time())}.zip"
-            zip_path = os.path.join(self.temp_folder_service.temp_dir, zip_name)
-            shutil.make_archive(zip_path[:-4], "zip", root_dir=folder_path)
-            return Result.success(zip_name)
+            return Result.success(ZipDownload(
+                stream=ZipStream(collect_entries(folder_path)),
+                download_name=f"converted_{int(time.time())}.zip",
+            ))
         except Exception:
             self.logger.log(f"ZIP creation error: {traceback.format_exc()}", "error")
             return Result.failure("Failed to create archive.")
 
     def compress(self, form_data: CompressionFormData) -> Result[CompressionResponse]:
+        prepared = self.prepare(form_data)
+        if not prepared.is_successful:
+            return Result.failure(prepared.error)
+        return self.run(prepared.value)
+
+    def compress_streamed(self, form_data: CompressionFormData, reader) -> Result[CompressionResponse]:
+        """
+        Like `compress`, but converts the files of a `StreamingMultipartReader`
+        as they arrive instead of saving the whole upload first.
+
+        An `UploadRejectedError` raised by the reader stops the run and is
+        passed on to the caller, since it is the client's error, not ours.
+        """
+        prepared = self.prepare(form_data, incoming_files=reader.iter_files())
+        if not prepared.is_successful:
+            return Result.failure(prepared.error)
+        return self.run(prepared.value)
+
+    def prepare(
+        self,
+        form_data: CompressionFormData,
+        incoming_files: Optional[Iterable[IncomingFile]] = None,
+    ) -> Result[PreparedCompression]:
+        """
+        Validate the form, create the temp folders and save the uploads (unless
+        `incoming_files` streams them in). `run` does the conversion itself.
+        """
         fmt = form_data.image_format
+        effort_res = EncoderEffort.from_string_result(form_data.effort)
+        if not effort_res.is_successful:
+            return Result.failure(effort_res.error)
 
         pdf_preset = normalize_pdf_preset(form_data.pdf_preset)
         pdf_scale = normalize_pdf_scale(form_data.pdf_scale)
         pdf_margin_mm = form_data.pdf_margin_mm
         pdf_paginate = form_data.pdf_paginate
         pdf_quality = PdfQuality.default()
+        pdf_merge = form_data.pdf_merge
+        pdf_merge_order = PdfMergeOrder.default()
         if fmt == ImageFormat.PDF:
             preset_res = resolve_pdf_preset(pdf_preset)
             if not preset_res.is_successful:
@@ -64,6 +119,10 @@ class CompressionService:
             if not quality_res.is_successful:
                 return Result.failure(quality_res.error)
             pdf_quality = quality_res.value
+            order_res = PdfMergeOrder.from_string_result(form_data.pdf_merge_order)
+            if not order_res.is_successful:
+                return Result.failure(order_res.error)
+            pdf_merge_order = order_res.value
             if preset_res.value.size is None:
                 pdf_preset = None
                 pdf_margin_mm = None
@@ -73,18 +132,21 @@ class CompressionService:
             pdf_scale = "fit"
             pdf_margin_mm = None
             pdf_paginate = False
+            pdf_merge = False
 
         src: Optional[str] = None
         dst: Optional[str] = None
-        dest_ready = False
+        file_names: Tuple[str, ...] = ()
 
         try:
-            src = self.temp_folder_service.create_temp_dir(prefix="source_")
             dst = self.temp_folder_service.create_temp_dir(prefix="converted_")
-
-            save_res = self._save_uploaded_files(form_data.uploaded_files, src)
-            if not save_res.is_successful:
-                return Result.failure(save_res.error)
+            if incoming_files is None:
+                src = self.temp_folder_service.create_temp_dir(prefix="source_")
+                save_res = self._save_uploaded_files(form_data.uploaded_files, src)
+                if not save_res.is_successful:
+                    self._remove_folders(src, dst)
+                    return Result.failure(save_res.error)
+                file_names = tuple(save_res.value)
 
             target: Optional[TargetSize] = None
             if form_data.target_size_kb:
@@ -93,7 +155,7 @@ class CompressionService:
                 )
 
             req = CompressRequest(
-                source_folder=src,
+                source_folder=src or "",
                 dest_folder=dst,
                 image_format=fmt,
                 quality=form_data.quality,
@@ -105,13 +167,40 @@ class CompressionService:
                 pdf_margin_mm=pdf_margin_mm,
                 pdf_paginate=pdf_paginate,
                 pdf_quality=pdf_quality,
+                fast_downscale=form_data.fast_downscale,
+                effort=effort_res.value,
+                incoming_files=incoming_files,
+                pdf_merge=pdf_merge,
+                pdf_merge_order=pdf_merge_order,
+                upload_order=file_names,
             )
+            return Result.success(PreparedCompression(
+                request=req, file_names=file_names
+            ))
+        except Exception:
+            self.logger.log(
+                f"Unexpected compression failure: {traceback.format_exc()}",
+                "error",
+            )
+            self._remove_folders(src, dst)
+            return Result.failure("Unexpected compression failure.")
 
-            result = self.use_case.execute(req)
+    def run(
+        self,
+        prepared: PreparedCompression,
+        on_page_done: Optional[Callable[[PageProgress], None]] = None,
+    ) -> Result[CompressionResponse]:
+        """Convert a prepared request; the source folder is always removed afterwards."""
+        req = prepared.request
+        dest_ready = False
+
+        try:
+            result = self.use_case.execute(req, on_page_done=on_page_done)
 
             if not result.processed_files:
                 return Result.failure(f"Image processing failed: {'; '.join(result.errors)}")
 
+            dst = req.dest_folder
             converted = [f for f in os.listdir(dst) if os.path.isfile(os.path.join(dst, f))]
             if not converted:
                 return Result.failure("No files were converted")
@@ -123,6 +212,10 @@ class CompressionService:
                 process_summary=result,
             ))
 
+        except (UploadRejectedError, HTTPException):
+            # Raised while reading a streamed body (bad part, body over
+            # MAX_CONTENT_LENGTH): the route answers these with a 4xx.
+            raise
         except Exception:
             self.logger.log(
                 f"Unexpected compression failure: {traceback.format_exc()}",
@@ -130,14 +223,22 @@ class CompressionService:
             )
             return Result.failure("Unexpected compression failure.")
         finally:
-            if src:
-                shutil.rmtree(src, ignore_errors=True)
-            if dst and not dest_ready:
-                shutil.rmtree(dst, ignore_errors=True)
+            self._remove_folders(req.source_folder, None if dest_ready else req.dest_folder)
+
+    def discard(self, prepared: PreparedCompression) -> None:
+        """Drop a prepared request that will never run."""
+        self._remove_folders(prepared.request.source_folder, prepared.request.dest_folder)
+
+    @staticmethod
+    def _remove_folders(*folders: Optional[str]) -> None:
+        for folder in folders:
+            if folder:
+                shutil.rmtree(folder, ignore_errors=True)
 
-    def _save_uploaded_files(self, files, folder: str) -> Result[None]:
+    def _save_uploaded_files(self, files, folder: str) -> Result[List[str]]:
         try:
             os.makedirs(folder, exist_ok=True)
+            saved = []
             for file in files:
                 name = secure_filename(file.filename or "upload")
                 if not name:
@@ -149,8 +250,9 @@ class CompressionService:
                         if not chunk:
                             break
                         f.write(chunk)
+                saved.append(name)
                 self.logger.log(f"Saved file: {path}", "info")
-            return Result.success(None)
+            return Result.success(saved)
         except Exception:
             self.logger.log(f"Failed saving upload: {traceback.format_exc()}", "error")
             return Result.failure("Failed to save uploaded files.")
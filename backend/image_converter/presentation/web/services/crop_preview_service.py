@@ -7,6 +7,7 @@ from typing import Callable, Iterable, Optional
 from PIL import Image, UnidentifiedImageError
 
 from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.infrastructure.image_probe import ImageProbe
 
 
 class CropPreviewService:
@@ -18,10 +19,12 @@ class CropPreviewService:
         payload_expander,
         unsupported_extensions: Iterable[str],
         max_attempts: int,
+        image_probe: Optional[ImageProbe] = None,
     ):
         self.logger = logger
         self.payload_expander = payload_expander
         self.max_attempts = max_attempts
+        self.image_probe = image_probe or ImageProbe()
         self.unsupported_extensions = frozenset(
             extension.strip().lower()
             for extension in unsupported_extensions
@@ -66,7 +69,7 @@ class CropPreviewService:
                     f"decoding '{filename}' ({byte_count} bytes), "
                     f"attempt {attempt}/{self.max_attempts}",
                 )
-                return Result.success(self._build_preview_png(filename, load_bytes()))
+                return Result.success(self._build_preview_png(filename, load_bytes(), rid))
             except self._PERMANENT_ERROR_TYPES as exc:
                 self._log(rid, f"permanent failure for '{filename}': {exc}", "error")
                 return Result.failure("Could not decode this format for cropping.")
@@ -85,7 +88,7 @@ class CropPreviewService:
             f"after {self.max_attempts} attempts."
         )
 
-    def _build_preview_png(self, filename: str, raw_bytes: bytes) -> BytesIO:
+    def _build_preview_png(self, filename: str, raw_bytes: bytes, request_id: str) -> BytesIO:
         expanded = self.payload_expander.expand(filename, raw_bytes)
         if not expanded.is_successful:
             raise RuntimeError(expanded.error)
@@ -94,11 +97,14 @@ class CropPreviewService:
         if first_payload is None:
             raise RuntimeError("No content to render.")
 
-        with Image.open(BytesIO(first_payload.data)) as img:
-            img.load()
-            normalized = self._normalize_image(img)
-            buffer = BytesIO()
-            normalized.save(buffer, format="PNG", optimize=False, compress_level=6)
+        metadata = first_payload.probe(self.image_probe)
+        if metadata.is_successful:
+            width, height = metadata.value.size
+            self._log(request_id, f"'{filename}' is {width}x{height} ({metadata.value.mode})")
+
+        normalized = self._normalize_image(first_payload.decode().image)
+        buffer = BytesIO()
+        normalized.save(buffer, format="PNG", optimize=False, compress_level=6)
 
         buffer.seek(0)
         return buffer
@@ -18,10 +18,10 @@ class DownloadTarget:
 class TemporaryFolderService:
     """Owns temp-directory path validation before files are read, zipped, or served."""
 
-    def __init__(self, temp_dir: str, expiration_time: int, logger):
+    def __init__(self, temp_dir: str, expiration_time: int, logger, conversion_cache=None):
         self.temp_dir = temp_dir
         self.base_dir = Path(temp_dir).resolve()
-        self.cleanup_service = CleanupService(temp_dir, expiration_time, logger)
+        self.cleanup_service = CleanupService(temp_dir, expiration_time, logger, conversion_cache)
 
     def cleanup(self, force: bool = False):
         return self.cleanup_service.cleanup_temp_folders(force=force)
@@ -293,8 +293,9 @@ function HomePageContent() {
         return;
       }
 
+      // Settings go first: the backend starts converting each file as soon as
+      // its part has arrived, which needs every setting up front.
       const formData = new FormData();
-      processedFiles.forEach((file) => formData.append("files[]", file));
       if ((outputFormat === "jpeg" || outputFormat === "avif") && compressionMode === "quality") {
         formData.append("quality", quality);
       }
@@ -322,6 +323,7 @@ function HomePageContent() {
       if ((outputFormat === "png" || outputFormat === "avif") && useRembg) {
         formData.append("use_rembg", "true");
       }
+      processedFiles.forEach((file) => formData.append("files[]", file));
 
       try {
         const controller = new AbortController();
@@ -90,3 +90,25 @@ def test_factory_returns_avif_converters(mock_logger):
         use_rembg=True
     )
     assert isinstance(converter_rembg, RembgAvifConverter)
+
+def test_avif_converter_encodes_with_its_share_of_the_thread_budget(mock_logger, monkeypatch):
+    """Ensure the per-encode thread count and tiling reach the AVIF encoder."""
+    from backend.image_converter.domain.decoded_image import DecodedImage
+    from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
+
+    saved = {}
+    original_save = Image.Image.save
+
+    def spy_save(self, fp, format=None, **params):
+        saved.update(params)
+        return original_save(self, fp, format, **params)
+
+    monkeypatch.setattr(Image.Image, "save", spy_save)
+    budget = EncoderThreadBudget(total_threads=8, concurrent_encodes=4, autotiling=False)
+    converter = AvifConverter(quality=80, logger=mock_logger, threads=budget)
+
+    data = converter.encode_image(DecodedImage(image=Image.new("RGB", (16, 16), "red")))
+
+    assert data
+    assert saved["max_threads"] == 2
+    assert saved["autotiling"] is False
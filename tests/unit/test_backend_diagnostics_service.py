@@ -66,3 +66,43 @@ def test_backend_diagnostics_has_empty_log_message():
     document = service.build_log_document()
 
     assert "(no backend log entries captured yet)" in document.body
+
+
+def test_backend_diagnostics_reports_converter_pool_stats():
+    from backend.image_converter.core.factory.converter_pool import ConverterPool
+
+    pool = ConverterPool(capacity=4)
+    pool.get("jpeg", object)
+    pool.get("jpeg", object)
+    service = BackendDiagnosticsService(
+        LoggerStub(""),
+        "/tmp",
+        StorageManagementStub(True),
+        log_path_provider=lambda: "/tmp/backend.log",
+        log_reader=lambda: "",
+        converter_pool=pool,
+    )
+
+    document = service.build_log_document()
+
+    assert "converter_pool: hits=1 misses=1 evictions=0 size=1 capacity=4" in document.body
+
+
+def test_backend_diagnostics_reports_avif_thread_budget():
+    from backend.image_converter.domain.encoder_threads import EncoderThreadBudget
+
+    service = BackendDiagnosticsService(
+        LoggerStub(""),
+        "/tmp",
+        StorageManagementStub(True),
+        log_path_provider=lambda: "/tmp/backend.log",
+        log_reader=lambda: "",
+        avif_threads=EncoderThreadBudget(total_threads=8, concurrent_encodes=3),
+    )
+
+    document = service.build_log_document()
+
+    assert (
+        "avif_encoder: threads_per_encode=2 total_threads=8 concurrent_encodes=3 autotiling=True"
+        in document.body
+    )
@@ -0,0 +1,111 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from backend.image_converter.domain.banded_decode import (
+    DecodeMemoryLimitError,
+    open_without_pixel_limit,
+    reduce_in_bands,
+    supports_bands,
+)
+from backend.image_converter.domain.decoded_image import DecodedImage
+
+
+def _encoded(fmt: str, size=(157, 101)) -> bytes:
+    rng = np.random.default_rng(7)
+    pixels = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["TIFF", "BMP", "PPM"])
+def test_When_ReducingInBands_Expect_SamePixelsAsFullReduce(fmt):
+    data = _encoded(fmt)
+
+    banded = reduce_in_bands(Image.open(BytesIO(data)), 4, max_band_bytes=2000)
+
+    assert banded.tobytes() == Image.open(BytesIO(data)).reduce(4).tobytes()
+
+
+def test_When_ImageIsCompressed_Expect_NoBandSupport():
+    assert not supports_bands(Image.open(BytesIO(_encoded("PNG"))))
+
+
+def test_When_PageExceedsMemoryLimit_Expect_ReducedWhileDecoding():
+    data = _encoded("TIFF")
+
+    decoded = DecodedImage.from_bytes(data, draft_width=40, memory_limit_bytes=20_000)
+
+    assert decoded.size == (53, 34)
+    assert decoded.stored_size == (157, 101)
+    assert decoded.source_format == "TIFF"
+
+
+@pytest.mark.parametrize("fmt,draft_width", [("TIFF", None), ("PNG", 40)])
+def test_When_PageCannotFitMemoryLimit_Expect_DecodeMemoryLimitError(fmt, draft_width):
+    with pytest.raises(DecodeMemoryLimitError, match="processing memory limit"):
+        DecodedImage.from_bytes(_encoded(fmt), draft_width=draft_width, memory_limit_bytes=20_000)
+
+
+@pytest.fixture
+def bomb_sized_pgm(tmp_path):
+    """A grayscale PGM past Pillow's default decompression-bomb limit, mapped from a sparse file."""
+    import mmap
+
+    side = 13_500  # 182M px, over 2 * Image.MAX_IMAGE_PIXELS
+    path = tmp_path / "huge.pgm"
+    header = f"P5\n{side} {side}\n255\n".encode()
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + side * side)
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    yield data
+    data.close()
+
+
+def test_When_PageIsOverBombLimitWithMemoryLimit_Expect_ReducedInBands(bomb_sized_pgm):
+    assert Image.MAX_IMAGE_PIXELS == 89_478_485
+
+    decoded = DecodedImage.from_bytes(bomb_sized_pgm, draft_width=2000, memory_limit_bytes=64 * 1024 * 1024)
+
+    assert decoded.size == (2250, 2250)
+    assert decoded.stored_size == (13_500, 13_500)
+    assert Image.MAX_IMAGE_PIXELS == 89_478_485
+
+
+def test_When_PageIsOverBombLimitWithoutMemoryLimit_Expect_PillowCheckStillApplies(bomb_sized_pgm):
+    with pytest.raises(Image.DecompressionBombError):
+        DecodedImage.from_bytes(bomb_sized_pgm, draft_width=2000)
+
+
+def test_When_PageIsOverBombLimitAndCannotBeBanded_Expect_DecodeMemoryLimitError(bomb_sized_pgm):
+    with pytest.raises(DecodeMemoryLimitError, match="convert it to a smaller width"):
+        DecodedImage.from_bytes(bomb_sized_pgm, memory_limit_bytes=64 * 1024 * 1024)
+
+
+def test_When_OpeningWithoutPixelLimit_Expect_OtherOpensStillChecked(bomb_sized_pgm, monkeypatch):
+    Image.init()
+    factory, accept = Image.OPEN["PPM"]
+    checked_meanwhile = []
+
+    def opening_elsewhere(fp, filename):
+        if not checked_meanwhile:
+            checked_meanwhile.append(True)
+            with pytest.raises(Image.DecompressionBombError):
+                Image.open(BytesIO(bomb_sized_pgm[:64]))
+        return factory(fp, filename)
+
+    monkeypatch.setitem(Image.OPEN, "PPM", (opening_elsewhere, accept))
+
+    with open_without_pixel_limit(bomb_sized_pgm) as img:
+        assert img.size == (13_500, 13_500)
+    assert checked_meanwhile == [True]
+
+
+def test_When_OpeningUnknownDataWithoutPixelLimit_Expect_UnidentifiedImageError():
+    with pytest.raises(UnidentifiedImageError):
+        open_without_pixel_limit(b"not an image at all")
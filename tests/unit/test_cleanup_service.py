@@ -6,6 +6,7 @@ re-test deletion timing logic in detail; that is what `expiration_time` plus
 file mtime fixtures handle in integration tests.
 """
 
+import json
 import os
 import time
 
@@ -132,3 +133,26 @@ def test_cleanup_temp_folders_records_errors_with_typed_dto(tmp_path, monkeypatc
     assert err.kind == "directory"
     assert err.path == str(folder)
     assert "locked" in err.error
+
+
+def test_cleanup_temp_folders_force_keeps_status_files_of_unfinished_jobs(tmp_path):
+    now = time.time()
+    jobs = {
+        "job_running.json": {"state": "running", "updated_at": now},
+        "job_queued.json": {"state": "queued", "updated_at": now},
+        "job_done.json": {"state": "succeeded", "updated_at": now},
+        "job_abandoned.json": {"state": "running", "updated_at": now - 7200},
+    }
+    for name, job in jobs.items():
+        (tmp_path / name).write_text(json.dumps(job))
+    (tmp_path / ".job_running.json.tmp").write_text("{}")
+
+    svc = CleanupService(str(tmp_path), expiration_time=3600, logger=_Logger())
+
+    summary = svc.cleanup_temp_folders(force=True).value
+
+    deleted = sorted(os.path.basename(item.path) for item in summary.deleted)
+    assert deleted == ["job_abandoned.json", "job_done.json"]
+    assert (tmp_path / "job_running.json").exists()
+    assert (tmp_path / "job_queued.json").exists()
+    assert (tmp_path / ".job_running.json.tmp").exists()
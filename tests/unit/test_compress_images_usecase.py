@@ -0,0 +1,175 @@
+import pytest
+from PIL import Image
+
+from backend.image_converter.application.compress_images_usecase import CompressImagesUseCase
+from backend.image_converter.application.dtos import CompressRequest
+from backend.image_converter.application.payload_expander_factory import create_payload_expander
+from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
+from backend.image_converter.domain.image_resizer import ImageResizer
+from backend.image_converter.domain.units import TargetSize
+from backend.image_converter.infrastructure.local_storage import LocalStorage
+from backend.image_converter.infrastructure.logger import Logger
+
+
+class _SortedStorage(LocalStorage):
+    """LocalStorage with a deterministic listing order for assertions."""
+
+    def _list_directory(self, folder):
+        return sorted(super()._list_directory(folder))
+
+
+@pytest.fixture
+def logger():
+    return Logger(debug=False, json_output=False)
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    folder = tmp_path / "source"
+    folder.mkdir()
+    for index in range(6):
+        Image.new("RGB", (64 + index, 32), (index * 40, 0, 0)).save(folder / f"img_{index}.png")
+    (folder / "img_3_broken.png").write_bytes(b"not an image")
+    return folder
+
+
+def _build_use_case(logger, max_workers):
+    return CompressImagesUseCase(
+        logger,
+        ImageResizer(),
+        ImageConverterFactory,
+        _SortedStorage(logger),
+        create_payload_expander(logger),
+        max_workers=max_workers,
+    )
+
+
+def _request(source_folder, dest_folder):
+    dest_folder.mkdir()
+    return CompressRequest(
+        source_folder=str(source_folder),
+        dest_folder=str(dest_folder),
+        image_format=ImageFormat.JPEG,
+        quality=80,
+        width=32,
+        target_size=None,
+    )
+
+
+def test_When_PagesRunConcurrently_Expect_SequentialOrderAndErrors(logger, source_folder, tmp_path):
+    sequential = _build_use_case(logger, max_workers=1).execute(
+        _request(source_folder, tmp_path / "sequential")
+    )
+    concurrent = _build_use_case(logger, max_workers=4).execute(
+        _request(source_folder, tmp_path / "concurrent")
+    )
+
+    assert concurrent.processed_files == sequential.processed_files
+    assert concurrent.processed_files == [f"img_{index}.jpg" for index in range(6)]
+    assert len(concurrent.errors) == 1
+    assert concurrent.errors[0].startswith("img_3_broken.png: ")
+    for name in concurrent.processed_files:
+        with Image.open(tmp_path / "concurrent" / name) as img:
+            assert img.width == 32
+
+
+def test_When_RunInOrderWindowIsFull_Expect_OutcomesKeepSubmissionOrder():
+    import threading
+    import time
+
+    seen = []
+    lock = threading.Lock()
+
+    def make_job(index):
+        def job():
+            time.sleep(0.01 * (5 - index))
+            with lock:
+                seen.append(index)
+            return index
+        return job
+
+    ordered = list(CompressImagesUseCase._run_in_order((make_job(i) for i in range(5)), workers=3))
+
+    assert ordered == [0, 1, 2, 3, 4]
+    assert sorted(seen) == [0, 1, 2, 3, 4]
+
+
+def test_When_TargetSizeUsesProxy_Expect_FullEncodesReported(logger, tmp_path):
+    source = tmp_path / "large"
+    source.mkdir()
+    Image.linear_gradient("L").resize((640, 480)).convert("RGB").save(source / "photo.png")
+    dest = tmp_path / "out"
+    dest.mkdir()
+    use_case = CompressImagesUseCase(
+        logger,
+        ImageResizer(),
+        ImageConverterFactory,
+        _SortedStorage(logger),
+        create_payload_expander(logger),
+        target_size_proxy_pixels=16_384,
+    )
+
+    result = use_case.execute(CompressRequest(
+        source_folder=str(source),
+        dest_folder=str(dest),
+        image_format=ImageFormat.JPEG,
+        quality=80,
+        width=None,
+        target_size=TargetSize(bytes=20_000),
+    ))
+
+    assert result.processed_files == ["photo.jpg"]
+    assert 1 <= result.full_resolution_encodes <= 10
+    assert (dest / "photo.jpg").stat().st_size <= 20_000 * 1.02
+    assert result.to_json_dict()["full_resolution_encodes"] == result.full_resolution_encodes
+
+
+def test_When_SourceJpegAlreadyMeetsTarget_Expect_KeptWithoutEncodes(logger, tmp_path):
+    source = tmp_path / "jpegs"
+    source.mkdir()
+    Image.linear_gradient("L").resize((320, 240)).convert("RGB").save(source / "photo.jpg", quality=60)
+    dest = tmp_path / "out"
+    dest.mkdir()
+
+    result = _build_use_case(logger, max_workers=1).execute(CompressRequest(
+        source_folder=str(source),
+        dest_folder=str(dest),
+        image_format=ImageFormat.JPEG,
+        quality=80,
+        width=None,
+        target_size=TargetSize(bytes=200_000),
+    ))
+
+    assert result.processed_files == ["photo.jpg"]
+    assert result.full_resolution_encodes == 0
+    assert (dest / "photo.jpg").read_bytes() == (source / "photo.jpg").read_bytes()
+
+
+def test_When_PdfMergeRequested_Expect_OneDocumentInUploadOrder(logger, source_folder, tmp_path):
+    import pypdfium2 as pdfium
+
+    dest = tmp_path / "merged"
+    dest.mkdir()
+    upload_order = tuple(f"img_{index}.png" for index in reversed(range(6))) + ("img_3_broken.png",)
+    req = CompressRequest(
+        source_folder=str(source_folder),
+        dest_folder=str(dest),
+        image_format=ImageFormat.PDF,
+        quality=80,
+        width=None,
+        target_size=None,
+        pdf_merge=True,
+        upload_order=upload_order,
+    )
+
+    result = _build_use_case(logger, max_workers=3).execute(req)
+
+    assert result.processed_files == ["merged.pdf"]
+    assert len(result.errors) == 1
+    assert [p.name for p in dest.iterdir()] == ["merged.pdf"]
+    pdf = pdfium.PdfDocument(str(dest / "merged.pdf"))
+    try:
+        assert [round(page.get_size()[0]) for page in pdf] == [64 + index for index in reversed(range(6))]
+    finally:
+        pdf.close()
@@ -0,0 +1,113 @@
+from io import BytesIO
+
+import pytest
+from flask import Flask
+from PIL import Image
+
+from backend.image_converter.presentation.web import routes
+
+_BOUNDARY = "imgcompress-route-boundary"
+
+
+def _png() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _body(*parts):
+    chunks = []
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        chunks.append(f"--{_BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + value + b"\r\n")
+    return b"".join(chunks) + f"--{_BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def post_compress(monkeypatch):
+    expanded = []
+    expander = routes.use_case.payload_expander
+    original_expand = expander.expand
+
+    def recording_expand(name, *args, **kwargs):
+        expanded.append(name)
+        return original_expand(name, *args, **kwargs)
+
+    monkeypatch.setattr(expander, "expand", recording_expand)
+    # A cache hit would skip the expander this test watches.
+    monkeypatch.setattr(routes.use_case, "conversion_cache", None)
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_blueprint, url_prefix="/api")
+    client = app.test_client()
+
+    def post(body: bytes, chunked: bool = False, max_content_length: int = None):
+        app.config["MAX_CONTENT_LENGTH"] = max_content_length
+        if chunked:
+            # No Content-Length: the limit is only hit while the body is read.
+            options = dict(
+                input_stream=BytesIO(body),
+                headers={"Transfer-Encoding": "chunked"},
+                environ_overrides={"wsgi.input_terminated": True},
+            )
+        else:
+            options = dict(data=body)
+        response = client.post(
+            "/api/compress",
+            content_type=f"multipart/form-data; boundary={_BOUNDARY}",
+            **options,
+        )
+        return response, expanded
+
+    return post
+
+
+def test_When_FilesComeBeforeFields_Expect_Converted(post_compress):
+    response, expanded = post_compress(_body(("files[]", _png(), "a.png"), ("format", b"png", None)))
+
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ok"
+    assert expanded == ["a.png"]
+
+
+def test_When_FieldFollowsFiles_Expect_BadRequest(post_compress):
+    response, _ = post_compress(_body(
+        ("format", b"png", None),
+        ("files[]", _png(), "a.png"),
+        ("width", b"100", None),
+    ))
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Form fields must be sent before files: width"
+
+
+def test_When_FileTypeIsUnsupported_Expect_BadRequestBeforeAnyConversion(post_compress):
+    response, expanded = post_compress(_body(
+        ("files[]", _png(), "a.png"),
+        ("files[]", b"plain text", "x.txt"),
+        ("format", b"png", None),
+    ))
+
+    assert response.status_code == 400
+    assert "x.txt" in response.get_json()["error"]
+    assert expanded == []
+
+
+def test_When_BodyIsTruncated_Expect_BadRequest(post_compress):
+    body = _body(("format", b"png", None), ("files[]", _png(), "a.png"))
+
+    response, _ = post_compress(body[:-40])
+
+    assert response.status_code == 400
+    assert "Malformed upload" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_When_BodyExceedsMaxContentLength_Expect_RequestEntityTooLarge(post_compress, chunked):
+    body = _body(("format", b"png", None), ("files[]", _png() + b"\0" * 4096, "a.png"))
+
+    response, expanded = post_compress(body, chunked=chunked, max_content_length=2048)
+
+    assert response.status_code == 413
+    assert expanded == []
@@ -0,0 +1,102 @@
+import threading
+
+from backend.image_converter.application.dtos import CompressionResponse, CompressResult, PageProgress
+from backend.image_converter.core.internals.utilities import Result
+from backend.image_converter.presentation.web.services.compression_job_service import (
+    STATE_SUCCEEDED,
+    CompressionJobService,
+)
+from backend.image_converter.presentation.web.services.compression_service import PreparedCompression
+
+
+class _Logger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="info"):
+        self.messages.append((level, message))
+
+
+class _FakeCompressionService:
+    """Reports two pages of `doc.pdf`, the second failing, once released."""
+
+    def __init__(self, prepare_error=None):
+        self.prepare_error = prepare_error
+        self.release = threading.Event()
+        self.discarded = []
+
+    def prepare(self, form_data):
+        if self.prepare_error:
+            return Result.failure(self.prepare_error)
+        return Result.success(PreparedCompression(request=None, file_names=("doc.pdf",)))
+
+    def run(self, prepared, on_page_done=None):
+        self.release.wait(5)
+        on_page_done(PageProgress(file="doc.pdf", page_index=1, output="doc_page-1.jpg"))
+        on_page_done(PageProgress(file="doc.pdf", page_index=2, error="doc.pdf (page 2): broken"))
+        return Result.success(CompressionResponse(
+            converted_files=["doc_page-1.jpg"],
+            dest_folder="/tmp/converted_x",
+            process_summary=CompressResult(processed_files=["doc_page-1.jpg"], errors=["broken"]),
+        ))
+
+    def discard(self, prepared):
+        self.discarded.append(prepared)
+
+
+def _service(tmp_path, compression_service, **kwargs):
+    return CompressionJobService(
+        _Logger(), compression_service, str(tmp_path), poll_interval_seconds=0.01, **kwargs
+    )
+
+
+def test_When_JobRuns_Expect_PerPageProgressAndDownloadableResult(tmp_path):
+    fake = _FakeCompressionService()
+    service = _service(tmp_path, fake)
+
+    job = service.submit(form_data=None).value
+    queued = service.get(job.job_id)
+    fake.release.set()
+    events = list(service.events(job.job_id))
+    finished = service.get(job.job_id)
+
+    assert queued.state in ("queued", "running")
+    assert [f.name for f in queued.files] == ["doc.pdf"]
+    assert events[-1].startswith("event: done\n")
+    assert finished.state == STATE_SUCCEEDED
+    progress = finished.files[0]
+    assert (progress.pages_done, progress.pages_failed) == (1, 1)
+    assert progress.outputs == ["doc_page-1.jpg"]
+    assert finished.result["dest_folder"] == "/tmp/converted_x"
+
+
+def test_When_QueueIsFull_Expect_SubmissionRejected(tmp_path):
+    fake = _FakeCompressionService()
+    service = _service(tmp_path, fake, max_concurrent_jobs=1, max_queued_jobs=1)
+
+    first = service.submit(form_data=None)
+    second = service.submit(form_data=None)
+    third = service.submit(form_data=None)
+    fake.release.set()
+
+    assert first.is_successful and second.is_successful
+    assert third.error == CompressionJobService.QUEUE_FULL_ERROR
+    for result in (first, second):
+        list(service.events(result.value.job_id))
+    assert service.submit(form_data=None).is_successful
+    fake.release.set()
+
+
+def test_When_PreparationFails_Expect_NoJobAndSlotReleased(tmp_path):
+    service = _service(tmp_path, _FakeCompressionService(prepare_error="bad preset"), max_queued_jobs=0)
+
+    assert service.submit(form_data=None).error == "bad preset"
+    assert service.submit(form_data=None).error == "bad preset"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_When_JobIdIsUnknownOrMalformed_Expect_None(tmp_path):
+    service = _service(tmp_path, _FakeCompressionService())
+
+    assert service.get("0" * 32) is None
+    assert service.get("../etc/passwd") is None
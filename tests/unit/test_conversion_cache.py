@@ -0,0 +1,172 @@
+import os
+
+import pytest
+from PIL import Image
+
+from backend.image_converter.application.compress_images_usecase import CompressImagesUseCase
+from backend.image_converter.application.dtos import CompressRequest
+from backend.image_converter.application.payload_expander_factory import create_payload_expander
+from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
+from backend.image_converter.core.image_conversion_processor import ImageConversionProcessor
+from backend.image_converter.domain.image_resizer import ImageResizer
+from backend.image_converter.infrastructure.cleanup_service import CleanupService
+from backend.image_converter.infrastructure.conversion_cache import CachedOutput, ConversionCache
+from backend.image_converter.infrastructure.local_storage import LocalStorage
+from backend.image_converter.infrastructure.logger import Logger
+
+
+def _store(cache, key, tmp_path, payload=b"x" * 100, suffix=".jpg"):
+    produced = tmp_path / f"produced_{key}"
+    produced.write_bytes(payload)
+    cache.store(key, [(CachedOutput(suffix=suffix, original_width=64, resized_width=32), str(produced))])
+
+
+def test_When_ParametersDiffer_Expect_DifferentKeys():
+    base = {"format": "jpeg", "quality": 80, "width": None}
+
+    same = ConversionCache.build_key(b"image", dict(reversed(list(base.items()))))
+
+    assert ConversionCache.build_key(b"image", base) == same
+    assert ConversionCache.build_key(b"image", {**base, "quality": 81}) != same
+    assert ConversionCache.build_key(b"other", base) != same
+
+
+def test_When_EntryStored_Expect_RestoredUnderNewStem(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=10_000)
+    _store(cache, "k1", tmp_path, payload=b"converted", suffix="_page-1.jpg")
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    assert cache.lookup("missing") is None
+    hit = cache.lookup("k1")
+    restored = cache.restore(hit, str(dest), "report")
+
+    assert restored.value == ["report_page-1.jpg"]
+    assert (dest / "report_page-1.jpg").read_bytes() == b"converted"
+    assert hit.outputs[0].resized_width == 32
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_When_OverBudget_Expect_LeastRecentlyUsedEvicted(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=100_000)
+    for index, key in enumerate(["old", "used", "new"]):
+        _store(cache, key, tmp_path, payload=b"x" * 4_000)
+        os.utime(cache.root + f"/{key}", (1_000 + index, 1_000 + index))
+    cache.lookup("old")  # refreshes its mtime
+
+    evicted = cache.evict(max_bytes=10_000)
+
+    assert [os.path.basename(path) for path in evicted] == ["used"]
+    assert cache.lookup("used") is None
+    assert cache.stats().entries == 2
+
+
+def test_When_StoresOutgrowBudget_Expect_StoreTrimsItself(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=10_000)
+    for index in range(5):
+        _store(cache, f"k{index}", tmp_path, payload=b"x" * 3_000)
+        os.utime(cache.root + f"/k{index}", (1_000 + index, 1_000 + index))
+
+    assert cache.stats().size_bytes <= 10_000
+    assert cache.lookup("k4") is not None
+    assert cache.lookup("k0") is None
+
+
+def test_When_StoresAreSmall_Expect_NoSweepUntilSlackIsUsed(tmp_path, monkeypatch):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=80_000)
+    sweeps = []
+    original_evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: sweeps.append(1) or original_evict())
+
+    for index in range(12):
+        _store(cache, f"k{index}", tmp_path, payload=b"x" * 1_000)
+
+    # The first store sweeps; then one sweep per 10_000 bytes stored.
+    assert len(sweeps) == 2
+
+
+def test_When_CleanupRuns_Expect_CacheLeftAloneAndClearedOnForce(tmp_path):
+    cache = ConversionCache(str(tmp_path / "conversion_cache"), max_bytes=100_000)
+    _store(cache, "a", tmp_path, payload=b"x" * 4_000)
+    _store(cache, "b", tmp_path, payload=b"x" * 4_000)
+    service = CleanupService(str(tmp_path), 3600, Logger(debug=False, json_output=False), cache)
+
+    routine = service.cleanup_temp_folders().value
+    cleared = service.cleanup_temp_folders(force=True).value
+
+    assert [item for item in routine.deleted if item.kind == "cache_entry"] == []
+    assert sorted(os.path.basename(item.path) for item in cleared.deleted) == ["a", "b"]
+    assert cache.stats().entries == 0
+
+
+@pytest.fixture
+def use_case_with_cache(tmp_path):
+    logger = Logger(debug=False, json_output=False)
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=10_000_000)
+    use_case = CompressImagesUseCase(
+        logger,
+        ImageResizer(),
+        ImageConverterFactory,
+        LocalStorage(logger),
+        create_payload_expander(logger),
+        conversion_cache=cache,
+    )
+    return use_case, cache
+
+
+def _request(source, dest, quality=80):
+    dest.mkdir()
+    return CompressRequest(
+        source_folder=str(source),
+        dest_folder=str(dest),
+        image_format=ImageFormat.JPEG,
+        quality=quality,
+        width=32,
+        target_size=None,
+    )
+
+
+def test_When_SameUploadRepeats_Expect_SecondRequestServedFromCache(tmp_path, use_case_with_cache):
+    use_case, cache = use_case_with_cache
+    source = tmp_path / "source"
+    source.mkdir()
+    Image.new("RGB", (64, 32), (200, 10, 10)).save(source / "logo.png")
+
+    first = use_case.execute(_request(source, tmp_path / "first"))
+    (source / "logo.png").rename(source / "logo_again.png")
+    second = use_case.execute(_request(source, tmp_path / "second"))
+    other_quality = use_case.execute(_request(source, tmp_path / "third", quality=50))
+
+    assert first.processed_files == ["logo.jpg"]
+    assert second.processed_files == ["logo_again.jpg"]
+    assert other_quality.processed_files == ["logo_again.jpg"]
+    assert (tmp_path / "second" / "logo_again.jpg").read_bytes() == (tmp_path / "first" / "logo.jpg").read_bytes()
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats().entries == 2
+
+
+def test_When_ProcessorSeesCachedInput_Expect_ResultsWithCachedWidths(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=10_000_000)
+    source = tmp_path / "photo.png"
+    Image.new("RGB", (64, 32), (10, 200, 10)).save(source)
+
+    def run(destination):
+        processor = ImageConversionProcessor(
+            source=str(source),
+            destination=str(destination),
+            image_format=ImageFormat.JPEG,
+            width=32,
+            conversion_cache=cache,
+        )
+        processor.run()
+        return processor.results
+
+    converted = run(tmp_path / "first")
+    restored = run(tmp_path / "second")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [(r.file, r.original_width, r.resized_width, r.is_successful) for r in restored] == [
+        (r.file, r.original_width, r.resized_width, r.is_successful) for r in converted
+    ]
+    assert os.path.isfile(restored[0].destination)
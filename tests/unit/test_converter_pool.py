@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
+from backend.image_converter.core.factory.converter_pool import ConverterPool
+
+
+def test_When_PoolIsFull_Expect_LeastRecentlyUsedEvicted():
+    pool = ConverterPool(capacity=2)
+    first = pool.get("a", object)
+    pool.get("b", object)
+    assert pool.get("a", object) is first  # "a" is now the most recent
+    pool.get("c", object)
+
+    assert pool.get("a", object) is first
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 3, 1, 2)
+    pool.get("b", object)
+    assert pool.stats().misses == 4
+
+
+def test_When_CapacityIsZero_Expect_FreshConverterEveryCall():
+    pool = ConverterPool(capacity=0)
+    assert pool.get("a", object) is not pool.get("a", object)
+    assert pool.stats().size == 0
+
+
+def test_When_FactoryGetsSameArguments_Expect_SameConverterInstance():
+    logger = MagicMock()
+    jpeg = ImageConverterFactory.create_converter(ImageFormat.JPEG, 71, logger)
+
+    assert ImageConverterFactory.create_converter(ImageFormat.JPEG, 71, logger) is jpeg
+    assert ImageConverterFactory.create_converter(ImageFormat.JPEG, 72, logger) is not jpeg
+    assert ImageConverterFactory.create_converter(ImageFormat.JPEG, 71, MagicMock()) is not jpeg
+    assert ImageConverterFactory.pool_stats().hits >= 1
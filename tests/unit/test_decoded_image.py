@@ -0,0 +1,107 @@
+from io import BytesIO
+
+from PIL import Image, ImageCms
+
+from backend.image_converter.application.file_payload_expander import PagePayload
+from backend.image_converter.core.factory.jpeg_converter import JpegConverter
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.image_resizer import ImageResizer
+from backend.image_converter.infrastructure.logger import Logger
+
+
+def _jpeg_with_metadata() -> bytes:
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    buffer = BytesIO()
+    Image.new("RGB", (80, 40), "red").save(buffer, format="JPEG", exif=exif, icc_profile=icc)
+    return buffer.getvalue()
+
+
+def test_When_DecodingJpeg_Expect_MetadataCaptured():
+    image = DecodedImage.from_bytes(_jpeg_with_metadata())
+
+    assert image.size == (80, 40)
+    assert image.source_format == "JPEG"
+    assert image.icc_profile
+    assert image.exif
+
+
+def test_When_ResizingDecodedImage_Expect_MetadataKeptWithoutReencoding():
+    image = DecodedImage.from_bytes(_jpeg_with_metadata())
+
+    resized = ImageResizer().resize(image, 40)
+
+    assert resized.size == (40, 20)
+    assert resized.icc_profile == image.icc_profile
+    assert resized.exif == image.exif
+    with Image.open(BytesIO(resized.to_bytes())) as reopened:
+        assert reopened.format == "TIFF"
+        assert reopened.getexif()[0x0112] == 6
+
+
+def test_When_PayloadDecodedTwice_Expect_SingleDecode(monkeypatch):
+    calls = []
+    original = DecodedImage.from_bytes
+
+    def counting_from_bytes(data, **kwargs):
+        calls.append(data)
+        return original(data, **kwargs)
+
+    monkeypatch.setattr(DecodedImage, "from_bytes", staticmethod(counting_from_bytes))
+    payload = PagePayload(data=_jpeg_with_metadata(), page_index=None, label="photo.jpg")
+
+    assert payload.decode() is payload.decode()
+    assert len(calls) == 1
+
+
+def test_When_EncodingDecodedImage_Expect_SameOutputAsByteAdapter():
+    data = _jpeg_with_metadata()
+    converter = JpegConverter(quality=80, logger=Logger(debug=False))
+
+    from_image = converter.encode_image(DecodedImage.from_bytes(data))
+    from_bytes = converter.encode_to_bytes(data)
+
+    assert from_image == from_bytes
+    with Image.open(BytesIO(from_image)) as out:
+        # EXIF orientation 6 is applied while normalizing.
+        assert out.size == (40, 80)
+
+
+def _large_jpeg() -> bytes:
+    buffer = BytesIO()
+    Image.linear_gradient("L").resize((1600, 1003)).convert("RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def test_When_DraftDecodingJpeg_Expect_ReducedDecodeSizeAndStoredSizeKept():
+    image = DecodedImage.from_bytes(_large_jpeg(), draft_width=200)
+
+    assert image.size == (200, 126)
+    assert image.stored_size == (1600, 1003)
+
+
+def test_When_FastDownscaling_Expect_SameDimensionsAsExactResize():
+    data = _large_jpeg()
+
+    fast = ImageResizer().resize_image(data, 150)
+    exact = ImageResizer(fast_downscale=False).resize_image(data, 150)
+
+    with Image.open(BytesIO(fast)) as fast_img, Image.open(BytesIO(exact)) as exact_img:
+        assert fast_img.size == exact_img.size == (150, 94)
+
+
+def test_When_FastDownscaleDisabled_Expect_NoDraftWidth():
+    assert ImageResizer().draft_width(300) == 600
+    assert ImageResizer(fast_downscale=False).draft_width(300) is None
+    assert ImageResizer().draft_width(None) is None
+
+
+def test_When_DraftWidthGivenForPng_Expect_FullDecode():
+    buffer = BytesIO()
+    Image.new("RGB", (400, 200)).save(buffer, format="PNG")
+
+    image = DecodedImage.from_bytes(buffer.getvalue(), draft_width=100)
+
+    assert image.size == (400, 200)
+    assert image.stored_size is None
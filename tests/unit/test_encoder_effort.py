@@ -0,0 +1,101 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from backend.image_converter.application.dtos import CompressionFormData
+from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.factory.converter_factory import ImageConverterFactory
+from backend.image_converter.core.factory.png_converter import PngConverter
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.encoder_effort import (
+    AVIF_EFFORT_SETTINGS,
+    PNG_EFFORT_SETTINGS,
+    EncoderEffort,
+)
+from backend.image_converter.presentation.cli.argument_parser import parse_arguments
+from backend.image_converter.presentation.web.services.compression_service import (
+    CompressionService,
+)
+from tests.unit.dummy_logger import DummyLogger
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("fast", EncoderEffort.FAST),
+        ("  MAX ", EncoderEffort.MAX),
+        ("", EncoderEffort.BALANCED),
+        (None, EncoderEffort.BALANCED),
+    ],
+)
+def test_When_ParsingEffort_Expect_MatchingEnumMemberOrDefault(raw, expected):
+    result = EncoderEffort.from_string_result(raw)
+
+    assert result.is_successful
+    assert result.value is expected
+
+
+def test_When_ParsingUnknownEffort_Expect_Failure():
+    result = EncoderEffort.from_string_result("ludicrous")
+
+    assert not result.is_successful
+    assert "ludicrous" in result.error
+
+
+def test_When_ResolvingSettings_Expect_SlowerEncoderForHigherEffort():
+    assert set(AVIF_EFFORT_SETTINGS) == set(EncoderEffort) == set(PNG_EFFORT_SETTINGS)
+    assert EncoderEffort.FAST.avif.speed > EncoderEffort.BALANCED.avif.speed > EncoderEffort.MAX.avif.speed
+    assert EncoderEffort.FAST.png.compress_level < EncoderEffort.MAX.png.compress_level
+    assert EncoderEffort.MAX.png.optimize
+
+
+def test_When_EncodingPngAtEachEffort_Expect_SamePixelsAndSmallerFilesForMax():
+    gradient = Image.linear_gradient("L").resize((256, 256)).convert("RGB")
+    image = DecodedImage(image=gradient)
+
+    outputs = {
+        effort: PngConverter(DummyLogger(), effort).encode_image(image) for effort in EncoderEffort
+    }
+
+    assert len(outputs[EncoderEffort.MAX]) <= len(outputs[EncoderEffort.FAST])
+    for data in outputs.values():
+        with Image.open(BytesIO(data)) as decoded:
+            assert decoded.tobytes() == gradient.tobytes()
+
+
+def test_When_EffortsDiffer_Expect_SeparatePooledConverters():
+    logger = DummyLogger()
+
+    fast = ImageConverterFactory.create_converter(ImageFormat.AVIF, 70, logger, effort=EncoderEffort.FAST)
+    slow = ImageConverterFactory.create_converter(ImageFormat.AVIF, 70, logger, effort=EncoderEffort.MAX)
+
+    assert fast is not slow
+    assert (fast.effort, slow.effort) == (EncoderEffort.FAST, EncoderEffort.MAX)
+
+
+def test_When_CompressingWithUnknownEffort_Expect_RejectedBeforeConversion():
+    service = CompressionService(DummyLogger(), use_case=None, temp_folder_service=None)
+    form_data = CompressionFormData(
+        uploaded_files=(),
+        quality=85,
+        width=None,
+        image_format=ImageFormat.AVIF,
+        target_size_kb=None,
+        use_rembg=False,
+        pdf_preset="",
+        pdf_scale="",
+        pdf_margin_mm=10.0,
+        pdf_paginate=False,
+        effort="ludicrous",
+    )
+
+    result = service.compress(form_data)
+
+    assert not result.is_successful
+    assert "ludicrous" in result.error
+
+
+def test_When_CliEffortOmitted_Expect_Balanced():
+    assert parse_arguments(["in", "out"]).effort == "balanced"
+    assert parse_arguments(["in", "out", "--effort", "max"]).effort == "max"
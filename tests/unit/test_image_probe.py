@@ -0,0 +1,72 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageCms, ImageFile
+
+from backend.image_converter.application.compress_images_usecase import CompressImagesUseCase
+from backend.image_converter.application.file_payload_expander import PagePayload
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.infrastructure.image_probe import ImageProbe
+
+
+def _jpeg(orientation=None, with_icc=False) -> bytes:
+    params = {}
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        params["exif"] = exif
+    if with_icc:
+        params["icc_profile"] = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    buffer = BytesIO()
+    Image.new("RGB", (120, 60), "blue").save(buffer, format="JPEG", **params)
+    return buffer.getvalue()
+
+
+def test_When_ProbingJpeg_Expect_HeaderFieldsWithoutDecoding(monkeypatch):
+    data = _jpeg(orientation=6, with_icc=True)
+
+    def fail_load(self):
+        raise AssertionError("probe must not decode pixel data")
+
+    monkeypatch.setattr(ImageFile.ImageFile, "load", fail_load)
+    result = ImageProbe().probe(data)
+
+    assert result.is_successful
+    metadata = result.value
+    assert metadata.size == (120, 60)
+    assert metadata.display_size == (60, 120)
+    assert metadata.mode == "RGB"
+    assert metadata.format == "JPEG"
+    assert metadata.orientation == 6
+    assert metadata.has_icc_profile
+
+
+def test_When_ProbingImageWithoutExif_Expect_DefaultOrientation():
+    metadata = ImageProbe().probe(_jpeg()).value
+
+    assert metadata.orientation == 1
+    assert not metadata.has_icc_profile
+
+
+def test_When_ProbingGarbage_Expect_Failure():
+    result = ImageProbe().probe(b"not an image")
+
+    assert not result.is_successful
+    assert "Could not read image header" in result.error
+
+
+def test_When_PayloadAlreadyDecoded_Expect_ProbeUsesDecodedImage():
+    image = DecodedImage.from_pil(Image.new("RGBA", (10, 20)))
+    payload = PagePayload(data=None, page_index=None, label="layered.psd", image=image)
+
+    metadata = payload.probe(ImageProbe()).value
+
+    assert metadata.size == (10, 20)
+    assert metadata.mode == "RGBA"
+
+
+@pytest.mark.parametrize("width, expect_resize", [(120, False), (60, True), (None, False)])
+def test_When_TargetWidthMatchesSource_Expect_NoResize(width, expect_resize):
+    metadata = ImageProbe().probe(_jpeg()).value
+
+    assert CompressImagesUseCase._needs_resize(metadata, width) is expect_resize
@@ -0,0 +1,46 @@
+import mmap
+from io import BytesIO
+
+from PIL import Image
+
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.input_buffer import open_stream
+from backend.image_converter.infrastructure import mapped_file
+from backend.image_converter.infrastructure.image_probe import ImageProbe
+from backend.image_converter.infrastructure.local_storage import LocalStorage
+
+
+def _write_png(path, size=(64, 48)):
+    Image.new("RGB", size, (10, 20, 30)).save(path, format="PNG")
+    return str(path)
+
+
+def test_When_FileIsLarge_Expect_MappedBufferThatDecodes(tmp_path, monkeypatch):
+    monkeypatch.setattr(mapped_file, "MMAP_MIN_BYTES", 0)
+    path = _write_png(tmp_path / "page.png")
+
+    data = LocalStorage().read_bytes(path).value
+
+    assert isinstance(data, mmap.mmap)
+    assert ImageProbe().probe(data).value.size == (64, 48)
+    assert DecodedImage.from_bytes(data).image.getpixel((0, 0)) == (10, 20, 30)
+
+
+def test_When_FileIsSmall_Expect_PlainBytes(tmp_path):
+    path = _write_png(tmp_path / "page.png")
+
+    assert isinstance(mapped_file.read_file_buffer(path), bytes)
+
+
+def test_When_OpeningSeveralStreams_Expect_IndependentPositions(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 8)
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    first, second = open_stream(data), open_stream(data)
+    first.seek(-2, 2)
+
+    assert first.read() == bytes([254, 255])
+    assert second.read(3) == bytes([0, 1, 2])
+    assert open_stream(b"abc").read() == BytesIO(b"abc").read()
@@ -0,0 +1,55 @@
+from io import BytesIO
+
+from PIL import Image
+
+from backend.image_converter.core.factory.jpeg_converter import JpegConverter
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.jpeg_stream import strip_jpeg_metadata
+from tests.unit.dummy_logger import DummyLogger
+
+
+def _jpeg(quality=70, orientation=None, comment=b"taken by someone"):
+    img = Image.effect_noise((48, 32), 40).convert("RGB")
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    if orientation is not None:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=quality, exif=exif.tobytes(), comment=comment,
+             icc_profile=b"\x00" * 128)
+    return buffer.getvalue()
+
+
+def test_When_MetadataIsStripped_Expect_SamePixelsWithoutExifOrComment():
+    source = _jpeg()
+
+    stripped = strip_jpeg_metadata(source)
+
+    assert b"CameraMaker" not in stripped and b"taken by someone" not in stripped
+    assert len(stripped) < len(source)
+    with Image.open(BytesIO(source)) as before, Image.open(BytesIO(stripped)) as after:
+        assert after.info.get("icc_profile") == before.info.get("icc_profile")
+        assert after.tobytes() == before.tobytes()
+
+
+def test_When_SourceJpegIsAtOrBelowQuality_Expect_LosslessCopyInsteadOfReencode():
+    source = _jpeg(quality=70)
+    converter = JpegConverter(quality=80, logger=DummyLogger())
+
+    out = converter.encode_image(DecodedImage.from_bytes(source))
+
+    assert out == strip_jpeg_metadata(source)
+    assert JpegConverter(quality=60, logger=DummyLogger()).lossless_copy(DecodedImage.from_bytes(source)) is None
+
+
+def test_When_SourceNeedsRotationOrWasResized_Expect_Reencoded():
+    rotated = DecodedImage.from_bytes(_jpeg(quality=70, orientation=6))
+    converter = JpegConverter(quality=90, logger=DummyLogger())
+
+    assert converter.lossless_copy(rotated) is None
+    with Image.open(BytesIO(converter.encode_image(rotated))) as out:
+        assert out.size == (32, 48)
+
+    decoded = DecodedImage.from_bytes(_jpeg(quality=70))
+    resized = decoded.with_image(decoded.image.resize((24, 16)))
+    assert converter.lossless_copy(resized) is None
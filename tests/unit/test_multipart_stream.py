@@ -0,0 +1,134 @@
+import io
+import os
+
+import pytest
+
+from backend.image_converter.presentation.web.multipart_stream import (
+    StreamingMultipartReader,
+    UploadRejectedError,
+)
+
+_BOUNDARY = "imgcompress-test-boundary"
+
+
+def _body(*parts):
+    chunks = []
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        chunks.append(f"--{_BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + value + b"\r\n")
+    return b"".join(chunks) + f"--{_BOUNDARY}--\r\n".encode()
+
+
+class _TrickleStream(io.BytesIO):
+    """Hands the body out in small reads, like a slow upload."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 16) if size and size > 0 else size)
+
+
+def _reader(body, tmp_path, threshold=1024):
+    stream = _TrickleStream(body)
+    return stream, StreamingMultipartReader(stream, _BOUNDARY.encode(), str(tmp_path), threshold)
+
+
+def test_When_FieldsComeFirst_Expect_EachFileBeforeTheNextArrives(tmp_path):
+    body = _body(
+        ("format", b"png", None),
+        ("files[]", b"A" * 200, "a.png"),
+        ("files[]", b"B" * 200, "b.png"),
+    )
+    stream, reader = _reader(body, tmp_path)
+
+    fields = reader.read_fields()
+    files = reader.iter_files()
+    first = next(files)
+    position_after_first = stream.tell()
+    second = next(files)
+
+    assert fields.get("format") == "png"
+    assert not reader.buffered
+    assert (first.name, first.read_bytes().value) == ("a.png", b"A" * 200)
+    assert position_after_first < body.index(b"B" * 200)
+    assert (second.name, second.read_bytes().value) == ("b.png", b"B" * 200)
+    assert list(files) == []
+
+
+def test_When_FilesComeFirst_Expect_WholeBodyBufferedBeforeFields(tmp_path):
+    body = _body(
+        ("files[]", b"A" * 2048, "../a.png"),
+        ("format", b"avif", None),
+        ("quality", b"50", None),
+    )
+    _, reader = _reader(body, tmp_path, threshold=512)
+
+    fields = reader.read_fields()
+    files = list(reader.iter_files())
+
+    assert reader.buffered
+    assert (fields.get("format"), fields.get("quality")) == ("avif", "50")
+    assert [f.name for f in files] == ["a.png"]
+    assert files[0].read_bytes().value == b"A" * 2048
+
+
+def test_When_FieldFollowsStreamedFile_Expect_RejectedWhenItArrives(tmp_path):
+    body = _body(
+        ("format", b"png", None),
+        ("files[]", b"A", "a.png"),
+        ("quality", b"50", None),
+    )
+    _, reader = _reader(body, tmp_path)
+
+    reader.read_fields()
+    files = reader.iter_files()
+
+    assert next(files).name == "a.png"
+    with pytest.raises(UploadRejectedError, match="Form fields must be sent before files: quality"):
+        next(files)
+
+
+def test_When_FileIsNotAccepted_Expect_RejectedBeforeItsBytesAreRead(tmp_path):
+    body = _body(("files[]", b"A" * 200, "a.png"), ("files[]", b"T" * 200, "x.txt"), ("format", b"png", None))
+    stream = _TrickleStream(body)
+    reader = StreamingMultipartReader(
+        stream, _BOUNDARY.encode(), str(tmp_path), 1024, accept_file=lambda name: name.endswith(".png")
+    )
+
+    with pytest.raises(UploadRejectedError, match="x.txt"):
+        reader.read_fields()
+    assert stream.tell() < body.index(b"T" * 200) + 16
+
+
+def test_When_BodyIsTruncated_Expect_Rejected(tmp_path):
+    body = _body(("format", b"png", None), ("files[]", b"A" * 200, "a.png"))
+    _, reader = _reader(body[:-40], tmp_path)
+
+    reader.read_fields()
+    with pytest.raises(UploadRejectedError, match="Malformed upload"):
+        list(reader.iter_files())
+
+
+def test_When_UploadRolledOverToDisk_Expect_MappedBuffer(tmp_path, monkeypatch):
+    import mmap
+
+    from backend.image_converter.infrastructure import mapped_file
+
+    monkeypatch.setattr(mapped_file, "MMAP_MIN_BYTES", 0)
+    body = _body(("format", b"png", None), ("files[]", b"C" * 5000, "c.png"))
+    _, reader = _reader(body, tmp_path, threshold=1024)
+
+    reader.read_fields()
+    data = next(reader.iter_files()).read_bytes().value
+
+    assert isinstance(data, mmap.mmap)
+    assert data[:] == b"C" * 5000
+    # Kept under its name while mapped, for readers in other processes.
+    spooled = mapped_file.mapped_path(data)
+    assert os.path.dirname(spooled) == str(tmp_path)
+    with open(spooled, "rb") as f:
+        assert f.read(3) == b"CCC"
+
+    data.close()
+    del data
+    assert not os.path.exists(spooled)
@@ -0,0 +1,62 @@
+from PIL import Image
+
+from backend.image_converter.core.enums.image_format import ImageFormat
+from backend.image_converter.core.image_conversion_processor import ImageConversionProcessor
+from backend.image_converter.presentation.cli.argument_parser import parse_arguments
+
+
+def _write_inputs(folder):
+    for index, color in enumerate(["red", "green", "blue"]):
+        Image.new("RGB", (40 + index, 20), color).save(folder / f"image_{index}.png")
+    pages = [Image.new("RGB", (60, 80), color) for color in ["white", "black", "gray"]]
+    pages[0].save(folder / "document.pdf", save_all=True, append_images=pages[1:])
+
+
+def _run(source, destination, jobs):
+    processor = ImageConversionProcessor(
+        source=str(source),
+        destination=str(destination),
+        image_format=ImageFormat.JPEG,
+        quality=80,
+        width=30,
+        jobs=jobs,
+    )
+    processor.run()
+    return processor.results
+
+
+def test_When_DirectoryRunUsesProcessPool_Expect_SameResultsInSameOrder(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    _write_inputs(source)
+
+    sequential = _run(source, tmp_path / "sequential", jobs=1)
+    parallel = _run(source, tmp_path / "parallel", jobs=3)
+
+    assert [r.file for r in parallel] == [r.file for r in sequential]
+    assert all(r.is_successful for r in parallel)
+    assert [(r.original_width, r.resized_width) for r in parallel] == [
+        (r.original_width, r.resized_width) for r in sequential
+    ]
+    pdf_pages = [r.file for r in parallel if r.file.startswith("document_page-")]
+    assert pdf_pages == ["document_page-1.jpg", "document_page-2.jpg", "document_page-3.jpg"]
+    assert (tmp_path / "parallel" / "document_page-3.jpg").is_file()
+
+
+def test_When_PdfSplitAcrossWorkers_Expect_PageRangeTasks(tmp_path):
+    _write_inputs(tmp_path)
+    processor = ImageConversionProcessor(
+        source=str(tmp_path),
+        destination=str(tmp_path / "out"),
+        image_format=ImageFormat.JPEG,
+        jobs=2,
+    )
+
+    tasks = processor._plan_pool_tasks([str(tmp_path / "document.pdf"), str(tmp_path / "image_0.png")])
+
+    assert [task.page_numbers for task in tasks] == [(1, 2), (3,), None]
+
+
+def test_When_JobsArgumentOmitted_Expect_NoneSoCliUsesCpuCount():
+    assert parse_arguments(["in", "out"]).jobs is None
+    assert parse_arguments(["in", "out", "--jobs", "4"]).jobs == 4
@@ -4,6 +4,8 @@ from PIL import Image
 import pypdfium2
 
 from backend.image_converter.core.factory.pdf_converter import PdfConverter
+from backend.image_converter.domain.decoded_image import DecodedImage
+from backend.image_converter.domain.jpeg_quality import estimate_jpeg_quality
 from backend.image_converter.infrastructure.logger import Logger
 from backend.image_converter.domain.pdf_presets import resolve_pdf_preset
 from backend.image_converter.domain.pdf_quality import PdfQuality
@@ -94,3 +96,37 @@ def test_When_UsingSmallPdfQuality_Expect_SmallerOutputThanUltra():
 
     assert small.startswith(b"%PDF")
     assert len(small) < len(ultra)
+
+
+def _make_jpeg_bytes(quality: int, size=(120, 80)) -> bytes:
+    img = Image.effect_noise(size, 40).convert("RGB")
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def test_When_JpegSourceFitsQuality_Expect_EmbeddedWithoutReencode():
+    jpeg = _make_jpeg_bytes(60)
+    converter = PdfConverter(logger=Logger(debug=False, json_output=False), pdf_quality=PdfQuality.HIGH)
+
+    pdf_bytes = converter.encode_image(DecodedImage.from_bytes(jpeg))
+
+    assert jpeg in pdf_bytes
+
+
+def test_When_JpegSourceIsFinerOrResized_Expect_Reencoded():
+    fine = _make_jpeg_bytes(95)
+    coarse = _make_jpeg_bytes(60)
+    converter = PdfConverter(logger=Logger(debug=False, json_output=False), pdf_quality=PdfQuality.HIGH)
+    decoded = DecodedImage.from_bytes(coarse)
+    resized = decoded.with_image(decoded.image.resize((60, 40)))
+
+    assert fine not in converter.encode_image(DecodedImage.from_bytes(fine))
+    assert coarse not in converter.encode_image(resized)
+
+
+def test_When_EstimatingJpegQuality_Expect_SavedQuality():
+    for quality in (30, 55, 82, 92):
+        with Image.open(BytesIO(_make_jpeg_bytes(quality))) as img:
+            assert estimate_jpeg_quality(img.quantization) == quality
+    assert estimate_jpeg_quality(None) is None
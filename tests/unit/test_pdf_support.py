@@ -1,4 +1,5 @@
 from io import BytesIO
+import os
 
 from PIL import Image
 
@@ -99,3 +100,113 @@ def test_When_FileIsNonPdf_Expect_ExpanderReturnsOriginalPayload():
     assert len(payloads) == 1
     assert payloads[0].label == "image.png"
     assert payloads[0].page_index is None
+
+
+def _multi_page_pdf(page_count: int) -> bytes:
+    pages = [Image.new("RGB", (40 + 10 * i, 30), (20 * i, 80, 160)) for i in range(page_count)]
+    buffer = BytesIO()
+    pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:])
+    return buffer.getvalue()
+
+
+def test_When_RenderingWithWorkerPool_Expect_SamePagesInOrder(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    data = _multi_page_pdf(5)
+    sequential = PdfPageExtractor(dpi=72).rasterize_pages(data, "scan.pdf")
+    parallel = PdfPageExtractor(dpi=72, render_workers=2, max_pages_in_flight=2).rasterize_pages(data, "scan.pdf")
+
+    assert parallel.is_successful
+    assert list(parallel.value) == list(sequential.value)
+
+
+def test_When_RenderingSelectedPagesWithWorkerPool_Expect_RequestedOrder(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    data = _multi_page_pdf(4)
+    extractor = PdfPageExtractor(dpi=72, render_workers=2)
+
+    result = extractor.rasterize_pages(data, "scan.pdf", page_numbers=[3, 1, 4])
+
+    widths = []
+    for page in result.value:
+        with Image.open(BytesIO(page)) as img:
+            widths.append(img.width)
+    assert widths == [60, 40, 70]
+
+
+def test_When_RasterTargetGiven_Expect_PageRenderedAtTargetWidth():
+    from backend.image_converter.domain.raster_target import RasterTarget
+
+    data = _multi_page_pdf(2)
+    extractor = PdfPageExtractor(dpi=300)
+
+    result = extractor.rasterize_pages(data, "scan.pdf", raster_target=RasterTarget(width=20))
+
+    widths = []
+    for page in result.value:
+        with Image.open(BytesIO(page)) as img:
+            widths.append(img.width)
+    assert widths == [20, 20]
+
+
+def test_When_ExtractorHasNoImageFormat_Expect_DecodedPagesMatchingPng():
+    data = _multi_page_pdf(2)
+    encoded = list(PdfPageExtractor(dpi=72).rasterize_pages(data, "scan.pdf").value)
+    decoded = list(PdfPageExtractor(dpi=72, image_format=None).rasterize_pages(data, "scan.pdf").value)
+
+    for page_bytes, image in zip(encoded, decoded):
+        with Image.open(BytesIO(page_bytes)) as png:
+            assert image.mode == png.mode
+            assert image.tobytes() == png.tobytes()
+
+
+def test_When_ExtractorYieldsImages_Expect_PayloadsCarryDecodedPages():
+    page = Image.new("RGB", (12, 8), (1, 2, 3))
+
+    class DummyExtractor:
+        def rasterize_pages(self, data, source_hint):
+            return Result.success([page])
+
+    payload = next(iter(FilePayloadExpander(DummyExtractor(), DummyRenderer()).expand("demo.pdf", b"").value))
+
+    assert payload.data is None
+    assert payload.decode().image is page
+
+
+def test_When_RenderingSeveralPdfs_Expect_OneLongLivedPool(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    extractor = PdfPageExtractor(dpi=72, render_workers=2)
+
+    list(extractor.rasterize_pages(_multi_page_pdf(4), "a.pdf").value)
+    pool = extractor._pool
+    list(extractor.rasterize_pages(_multi_page_pdf(3), "b.pdf").value)
+
+    assert pool is not None
+    assert extractor._pool is pool
+
+
+def test_When_PdfHasFewPages_Expect_RenderedWithoutPool(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    extractor = PdfPageExtractor(dpi=72, render_workers=2)
+
+    pages = list(extractor.rasterize_pages(_multi_page_pdf(2), "scan.pdf").value)
+
+    assert len(pages) == 2
+    assert extractor._pool is None
+
+
+def test_When_PdfIsMemoryMapped_Expect_WorkersOpenItByPath(tmp_path, monkeypatch):
+    from backend.image_converter.infrastructure import mapped_file, pdf_page_extractor
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(mapped_file, "MMAP_MIN_BYTES", 0)
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(_multi_page_pdf(3))
+    data = mapped_file.read_file_buffer(str(path))
+
+    def no_copy(*_args, **_kwargs):
+        raise AssertionError("mapped PDFs must not be copied")
+
+    monkeypatch.setattr(pdf_page_extractor.tempfile, "mkstemp", no_copy)
+    pages = list(PdfPageExtractor(dpi=72, render_workers=2).rasterize_pages(data, "scan.pdf").value)
+
+    assert len(pages) == 3
@@ -0,0 +1,56 @@
+import pytest
+
+from backend.image_converter.domain.pdf_presets import PDF_PRESETS
+from backend.image_converter.domain.pdf_quality import PdfQuality
+from backend.image_converter.domain.raster_target import RasterTarget
+
+A4_POINTS = (595, 842)
+MAX_SCALE = 300 / 72.0
+
+
+def test_When_NoWidthOrPreset_Expect_NoTarget():
+    assert RasterTarget.for_conversion(None) is None
+    assert RasterTarget.for_conversion(0) is None
+
+
+def test_When_WidthRequested_Expect_ScaleMatchesWidth():
+    target = RasterTarget.for_conversion(800)
+
+    assert target.scale_for(*A4_POINTS, max_scale=MAX_SCALE) == pytest.approx(800 / 595)
+
+
+def test_When_WidthExceedsMaximumDpi_Expect_ScaleCapped():
+    target = RasterTarget.for_conversion(5000)
+
+    assert target.scale_for(*A4_POINTS, max_scale=MAX_SCALE) == MAX_SCALE
+
+
+def test_When_PresetFitsPage_Expect_ScaleFromPresetDpi():
+    target = RasterTarget.for_conversion(
+        800, PDF_PRESETS["a4-portrait"], "fit", 0.0, pdf_quality=PdfQuality.SMALL
+    )
+
+    # The preset wins over the width; an A4 page fills a 96 DPI A4 box.
+    assert target.width is None
+    assert target.scale_for(*A4_POINTS, max_scale=MAX_SCALE) == pytest.approx(96 / 72.0, rel=1e-3)
+
+
+def test_When_PresetFillsOrRotates_Expect_CoveringScale():
+    fill = RasterTarget.for_conversion(
+        None, PDF_PRESETS["a4-portrait"], "fill", 0.0, pdf_quality=PdfQuality.SMALL
+    )
+    rotating = RasterTarget.for_conversion(
+        None, PDF_PRESETS["a4-auto"], "fit", 0.0, pdf_quality=PdfQuality.SMALL
+    )
+    landscape_page = (842, 500)
+
+    assert fill.scale_for(*landscape_page, max_scale=MAX_SCALE) == pytest.approx(1123 / 500)
+    assert rotating.scale_for(*landscape_page, max_scale=MAX_SCALE) == pytest.approx(1123 / 842)
+
+
+def test_When_PaginatedPreset_Expect_WidthOnlyTarget():
+    target = RasterTarget.for_conversion(
+        None, PDF_PRESETS["a4-portrait"], "fit", 0.0, pdf_paginate=True, pdf_quality=PdfQuality.MEDIUM
+    )
+
+    assert target == RasterTarget(width=round(595 * 150 / 72.0))
@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+from PIL import Image
+
+from backend.image_converter.core.internals.rembg_batching import RembgMaskBatcher
+from backend.image_converter.core.internals.rembg_sessions import RembgSessionRegistry
+
+
+class _Input:
+    def __init__(self, batch_dim):
+        self.name = "input.1"
+        self.shape = [batch_dim, 3, 8, 8]
+
+
+class _InnerSession:
+    def __init__(self, batch_dim):
+        self.batch_dim = batch_dim
+        self.batch_sizes = []
+
+    def get_inputs(self):
+        return [_Input(self.batch_dim)]
+
+    def run(self, _outputs, feed):
+        batch = feed["input.1"]
+        self.batch_sizes.append(batch.shape[0])
+        ramp = np.linspace(0, 1, 64, dtype=np.float32).reshape(1, 1, 8, 8)
+        return [np.repeat(ramp, batch.shape[0], axis=0)]
+
+
+class _FakeSession:
+    def __init__(self, batch_dim="batch_size"):
+        self.inner_session = _InnerSession(batch_dim)
+        self.predicted = 0
+
+    def normalize(self, img, mean, std, size):
+        return {"input.1": np.zeros((1, 3, 8, 8), dtype=np.float32)}
+
+    def predict(self, img):
+        self.predicted += 1
+        return [Image.new("L", img.size, 255)]
+
+
+def _batcher(session, batch_size=4, wait=1.0):
+    registry = RembgSessionRegistry(session_factory=lambda name: session)
+    return RembgMaskBatcher(registry, max_batch_size=batch_size, max_wait_seconds=wait)
+
+
+def _predict_concurrently(batcher, count):
+    results = [None] * count
+
+    def run(index):
+        results[index] = batcher.predict_masks("u2net", Image.new("RGB", (20 + index, 10)))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_When_PagesArriveTogether_Expect_OneBatchedInference():
+    session = _FakeSession()
+
+    results = _predict_concurrently(_batcher(session), 4)
+
+    assert session.inner_session.batch_sizes == [4]
+    assert session.predicted == 0
+    assert [masks[0].size for masks in results] == [(20, 10), (21, 10), (22, 10), (23, 10)]
+
+
+def test_When_ModelHasFixedBatchDimension_Expect_PerImageFallback():
+    session = _FakeSession(batch_dim=1)
+
+    results = _predict_concurrently(_batcher(session), 3)
+
+    assert session.inner_session.batch_sizes == []
+    assert session.predicted == 3
+    assert all(len(masks) == 1 for masks in results)
+
+
+def test_When_BatchingDisabled_Expect_DirectPrediction():
+    session = _FakeSession()
+
+    masks = _batcher(session, batch_size=1).predict_masks("u2net", Image.new("RGB", (5, 5)))
+
+    assert session.predicted == 1
+    assert masks[0].size == (5, 5)
+
+
+def test_When_RemovingBackground_Expect_RgbaCutoutOfSourceSize():
+    cutout = _batcher(_FakeSession(), wait=0.0).remove_background("u2net", Image.new("RGB", (16, 12), "red"))
+
+    assert cutout.mode == "RGBA"
+    assert cutout.size == (16, 12)
@@ -0,0 +1,113 @@
+import threading
+
+from backend.image_converter.core.factory.rembg_png_converter import RembgPngConverter
+from backend.image_converter.core.internals.rembg_sessions import RembgSessionRegistry
+from backend.image_converter.infrastructure.logger import Logger
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _counting_factory(loads):
+    def factory(model_name):
+        loads.append(model_name)
+        return {"model": model_name, "load": len(loads)}
+    return factory
+
+
+def test_When_ConvertersShareRegistry_Expect_ModelLoadedOnce():
+    loads = []
+    registry = RembgSessionRegistry(session_factory=_counting_factory(loads))
+    logger = Logger(debug=False)
+
+    first = RembgPngConverter(logger=logger, model_name="u2net", session_registry=registry)
+    second = RembgPngConverter(logger=logger, model_name="u2net", session_registry=registry)
+
+    assert first._get_background_removal_session() is second._get_background_removal_session()
+    assert loads == ["u2net"]
+
+
+def test_When_SessionsRequestedConcurrently_Expect_SingleLoad():
+    loads = []
+    release = threading.Event()
+
+    def slow_factory(model_name):
+        release.wait(timeout=5)
+        loads.append(model_name)
+        return object()
+
+    registry = RembgSessionRegistry(session_factory=slow_factory)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(registry.get("u2net"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert loads == ["u2net"]
+    assert len({id(session) for session in sessions}) == 1
+
+
+def test_When_LeasesExceedLimit_Expect_InferenceBounded():
+    registry = RembgSessionRegistry(max_concurrent_inferences=2, session_factory=lambda name: object())
+    active = []
+    peak = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def infer():
+        with registry.lease("u2net"):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=infer) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert max(peak) <= 2
+
+
+def test_When_SessionIdle_Expect_EvictedAndReloadedOnDemand():
+    loads = []
+    clock = _Clock()
+    registry = RembgSessionRegistry(
+        idle_eviction_seconds=300, session_factory=_counting_factory(loads), clock=clock
+    )
+    registry._start_reaper = lambda: None
+
+    with registry.lease("u2net"):
+        clock.now = 1000
+        assert registry.evict_idle() == ()
+
+    clock.now = 1200
+    assert registry.evict_idle() == ()
+    clock.now = 1300
+    assert registry.evict_idle() == ("u2net",)
+    assert registry.loaded_models() == ()
+
+    registry.get("u2net")
+    assert loads == ["u2net", "u2net"]
+
+
+def test_When_WarmingUp_Expect_ModelLoadedInBackground():
+    loads = []
+    registry = RembgSessionRegistry(session_factory=_counting_factory(loads))
+
+    registry.warm_up_in_background("isnet-general-use", Logger(debug=False)).join(timeout=5)
+
+    assert registry.loaded_models() == ("isnet-general-use",)
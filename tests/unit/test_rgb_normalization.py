@@ -0,0 +1,35 @@
+from PIL import Image
+
+from backend.image_converter.domain.rgb_normalization import normalize_to_rgb
+
+
+def test_When_ImageIsUprightRgb_Expect_SameObjectReturned():
+    img = Image.new("RGB", (8, 4), (10, 20, 30))
+    assert normalize_to_rgb(img) is img
+
+
+def test_When_ImageHasAlpha_Expect_BlendedOntoBackground():
+    img = Image.new("RGBA", (2, 1), (0, 0, 0, 0))
+    img.putpixel((1, 0), (200, 0, 0, 128))
+
+    out = normalize_to_rgb(img, background=(0, 0, 255))
+
+    assert out.mode == "RGB"
+    assert out.getpixel((0, 0)) == (0, 0, 255)
+    r, g, b = out.getpixel((1, 0))
+    assert (abs(r - 100), g, abs(b - 127)) <= (1, 0, 1)
+
+
+def test_When_PaletteHasTransparencyOrExifRotation_Expect_FlattenedAndUpright():
+    palette = Image.new("P", (3, 2), 1)
+    palette.putpalette([0, 0, 0, 255, 0, 0])
+    palette.info["transparency"] = 1
+    assert normalize_to_rgb(palette).getpixel((0, 0)) == (255, 255, 255)
+
+    rotated = Image.new("RGB", (6, 2), (0, 128, 0))
+    exif = rotated.getexif()
+    exif[0x0112] = 6
+    rotated.info["exif"] = exif.tobytes()
+    out = normalize_to_rgb(rotated)
+    assert out.size == (2, 6)
+    assert out.getexif().get(0x0112, 1) == 1
@@ -14,6 +14,7 @@ The thin `settings` facade is exercised via `settings.get()` plus
 """
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -93,6 +94,126 @@ def test_valid_config_loads_into_typed_app_config(config_file):
     assert config.features.is_logo_enabled is True
     assert config.features.is_dev_mode_enabled is False
     assert config.rembg.model_name == "u2net"
+    assert config.rembg.warm_up_on_boot is False
+    assert config.rembg.max_concurrent_inferences == 1
+    assert config.rembg.idle_eviction_seconds == 0
+    assert config.rembg.batch_size == 1
+    assert config.rembg.intra_op_threads == 0
+    assert config.rembg.inter_op_threads == 0
+    assert config.compression.max_concurrent_pages.is_auto is True
+    assert config.compression.max_concurrent_background_removals == 1
+    assert config.compression.target_size_proxy_pixels == 0
+    assert config.uploads.streaming_ingest is True
+    assert config.uploads.spool_threshold_bytes == 16 * BYTES_PER_MEBIBYTE
+    assert config.conversion_cache.enabled is True
+    assert config.conversion_cache.max_size_bytes == 512 * BYTES_PER_MEBIBYTE
+
+
+def test_compression_concurrency_accepts_explicit_values(config_file):
+    cfg = _copy_config()
+    cfg["compression"] = {
+        "max_concurrent_pages": 6,
+        "max_concurrent_background_removals": 2,
+        "target_size_proxy_pixels": 65536,
+    }
+    config_file(cfg)
+
+    compression = settings.get().compression
+
+    assert compression.max_concurrent_pages.resolve(fallback_when_auto=999) == 6
+    assert compression.pages_per_web_worker(web_workers=16) == 6
+    assert compression.max_concurrent_background_removals == 2
+    assert compression.target_size_proxy_pixels == 65536
+
+
+def test_auto_concurrent_pages_split_cpus_between_web_workers(config_file, monkeypatch):
+    config_file(VALID_CONFIG)
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    compression = settings.get().compression
+
+    assert compression.pages_per_web_worker(web_workers=16) == 1
+    assert compression.pages_per_web_worker(web_workers=4) == 4
+    assert compression.pages_per_web_worker(web_workers=32) == 1
+
+
+def test_compression_concurrency_rejects_invalid_values(config_file):
+    cfg = _copy_config()
+    cfg["compression"] = {"max_concurrent_pages": "lots", "max_concurrent_background_removals": 0}
+    config_file(cfg)
+
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+
+    assert "compression.max_concurrent_pages" in str(exc.value)
+    assert "compression.max_concurrent_background_removals' must be >= 1" in str(exc.value)
+
+
+def test_rembg_session_settings_are_validated(config_file):
+    cfg = _copy_config()
+    cfg["rembg"] = {
+        "model_name": "u2net",
+        "warm_up_on_boot": "yes",
+        "max_concurrent_inferences": 0,
+        "idle_eviction_seconds": 600,
+    }
+    config_file(cfg)
+
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+
+    assert "rembg.warm_up_on_boot" in str(exc.value)
+    assert "rembg.max_concurrent_inferences' must be >= 1" in str(exc.value)
+    assert "idle_eviction_seconds" not in str(exc.value)
+
+
+def test_conversion_cache_settings_are_validated(config_file):
+    cfg = _copy_config()
+    cfg["conversion_cache"] = {"enabled": "sometimes", "max_size_mebibytes": -1}
+    config_file(cfg)
+
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+
+    assert "conversion_cache.enabled" in str(exc.value)
+    assert "conversion_cache.max_size_mebibytes' must be >= 0" in str(exc.value)
+
+
+def test_pdf_render_settings_default_and_validate(config_file):
+    config_file(VALID_CONFIG)
+    assert settings.get().pdf.render_workers == 4
+    assert settings.get().pdf.max_pages_in_flight == 0
+
+    cfg = _copy_config()
+    cfg["pdf"] = {"render_workers": 0, "max_pages_in_flight": -1}
+    config_file(cfg)
+
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+
+    assert "pdf.render_workers' must be >= 1" in str(exc.value)
+    assert "pdf.max_pages_in_flight' must be >= 0" in str(exc.value)
+
+
+def test_processing_memory_limit_is_optional(config_file):
+    config_file(VALID_CONFIG)
+    assert settings.get().processing.max_memory_bytes is None
+
+    cfg = _copy_config()
+    cfg["processing"] = {"max_memory_mebibytes": 64}
+    config_file(cfg)
+    assert settings.get().processing.max_memory_bytes == 64 * BYTES_PER_MEBIBYTE
+
+
+def test_processing_converter_pool_size_defaults_and_validates(config_file):
+    config_file(VALID_CONFIG)
+    assert settings.get().processing.converter_pool_size == 32
+
+    cfg = _copy_config()
+    cfg["processing"] = {"converter_pool_size": -1}
+    config_file(cfg)
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+    assert "processing.converter_pool_size' must be >= 0" in str(exc.value)
 
 
 def test_app_config_is_immutable(config_file):
@@ -186,6 +307,7 @@ def test_invalid_value_types_are_rejected(config_file, path, bad_value, message)
     ("path", "bad_value", "message"),
     [
         (("uploads", "max_file_size_mebibytes"), 0, ">= 1"),
+        (("uploads", "spool_threshold_mebibytes"), 0, ">= 1"),
         (("web", "port"), 70000, "<= 65535"),
         (("crop_preview", "max_retry_attempts"), 0, ">= 1"),
         (("logging", "max_size_mebibytes"), 0, ">= 1"),
@@ -325,3 +447,28 @@ def test_load_from_file_is_directly_usable(tmp_path):
 
     assert isinstance(config, AppConfig)
     assert config.rembg.model_name == "u2net"
+
+
+def test_avif_thread_budget_is_split_between_concurrent_encodes(config_file):
+    config_file(VALID_CONFIG)
+    assert settings.get().avif.encoder_threads.is_auto is True
+    assert settings.get().avif.autotiling is True
+
+    cfg = _copy_config()
+    cfg["avif"] = {"encoder_threads": 12, "autotiling": False}
+    config_file(cfg)
+    budget = settings.get().avif.thread_budget(concurrent_encodes=4)
+
+    assert (budget.threads_per_encode, budget.autotiling) == (3, False)
+    assert settings.get().avif.thread_budget(concurrent_encodes=24).threads_per_encode == 1
+
+
+def test_avif_encoder_threads_rejects_invalid_values(config_file):
+    cfg = _copy_config()
+    cfg["avif"] = {"encoder_threads": 0}
+    config_file(cfg)
+
+    with pytest.raises(ConfigError) as exc:
+        settings.get()
+
+    assert "avif.encoder_threads' must be >= 1" in str(exc.value)
@@ -0,0 +1,149 @@
+import math
+
+import pytest
+
+from backend.image_converter.domain.size_targeting import (
+    find_best_quality_under_target,
+    find_best_quality_via_proxy,
+)
+from backend.image_converter.domain.units import TargetSize
+
+
+class _CountingEncoder:
+    """Fake encoder whose output size grows exponentially with quality."""
+
+    def __init__(self, base: float = 2_000, growth: float = 0.045):
+        self.base = base
+        self.growth = growth
+        self.calls = []
+
+    def size_for(self, q: int) -> int:
+        return int(self.base * math.exp(self.growth * q))
+
+    def __call__(self, q, _data):
+        self.calls.append(q)
+        return b"x" * self.size_for(q)
+
+
+def _reference_best(encoder: _CountingEncoder, target: int, q_min: int = 10, q_max: int = 95) -> int:
+    fitting = [q for q in range(q_min, q_max + 1) if encoder.size_for(q) <= target]
+    return max(fitting) if fitting else q_min
+
+
+@pytest.mark.parametrize("target", [5_000, 20_000, 60_000, 110_000])
+def test_When_SearchingWithoutBand_Expect_ExactBestQualityWithoutRepeats(target):
+    encoder = _CountingEncoder()
+
+    q, out, size = find_best_quality_under_target(encoder, None, target)
+
+    assert q == _reference_best(encoder, target)
+    assert size == len(out) <= target or q == 10
+    assert len(encoder.calls) == len(set(encoder.calls))
+    assert len(encoder.calls) <= 10
+
+
+def test_When_ModelFits_Expect_FewerEncodesThanBinarySearch():
+    encoder = _CountingEncoder()
+
+    find_best_quality_under_target(encoder, None, 30_000)
+
+    assert len(encoder.calls) < 7
+
+
+def test_When_ResultLandsInBand_Expect_EarlyStop():
+    encoder = _CountingEncoder()
+    target = TargetSize(bytes=40_000)
+
+    q, _, size = find_best_quality_under_target(
+        encoder, None, target.soft_limit, good_enough_bytes=target.band_floor
+    )
+
+    assert target.band_floor <= size <= target.soft_limit
+    assert len(encoder.calls) <= 4
+
+
+def test_When_NothingFits_Expect_MinimumQualityEncodedOnce():
+    encoder = _CountingEncoder()
+
+    q, out, size = find_best_quality_under_target(encoder, None, 100)
+
+    assert q == 10
+    assert size == encoder.size_for(10)
+    assert encoder.calls.count(10) == 1
+
+
+def test_When_ProxyPredictsWell_Expect_AtMostTwoFullEncodes():
+    full = _CountingEncoder(base=40_000)
+    proxy = _CountingEncoder(base=2_000)
+    calls = []
+
+    def encoder(q, data):
+        calls.append((data, q))
+        return (full if data == "full" else proxy)(q, data)
+
+    target = TargetSize(bytes=400_000)
+    q, out, size, full_encodes = find_best_quality_via_proxy(
+        encoder, "full", "proxy", 20.0, target.soft_limit, good_enough_bytes=target.band_floor
+    )
+
+    assert size == len(out) <= target.soft_limit
+    assert full_encodes == len([c for c in calls if c[0] == "full"]) <= 2
+    assert q >= _reference_best(full, target.soft_limit) - 2
+
+
+def test_When_ProxyMisjudgesCurve_Expect_BestQualityFromFewFullEncodes():
+    full = _CountingEncoder(base=10_000, growth=0.07)
+    proxy = _CountingEncoder(base=2_000)
+
+    def encoder(q, data):
+        return (full if data == "full" else proxy)(q, data)
+
+    q, out, size, full_encodes = find_best_quality_via_proxy(encoder, "full", "proxy", 20.0, 400_000)
+
+    assert size == len(out) <= 400_000
+    assert q == _reference_best(full, 400_000)
+    assert full_encodes == len(full.calls) <= 4
+
+
+def test_When_ConfirmationsAreTooLarge_Expect_FullSearchBelowThem():
+    full = _CountingEncoder(base=80_000)
+    proxy = _CountingEncoder(base=2_000)
+
+    def encoder(q, data):
+        return (full if data == "full" else proxy)(q, data)
+
+    q, out, size, full_encodes = find_best_quality_via_proxy(
+        encoder, "full", "proxy", 20.0, 400_000, max_confirmations=1
+    )
+
+    assert q == _reference_best(full, 400_000)
+    assert size <= 400_000
+    assert full_encodes == len(full.calls) >= 2
+    assert len(full.calls) == len(set(full.calls))
+
+
+def test_When_Searching_Expect_OnlyBestOutputAndFallbackKept():
+    import weakref
+
+    class _Output:
+        def __init__(self, size):
+            self.size = size
+
+        def __len__(self):
+            return self.size
+
+    sizes = _CountingEncoder()
+    produced = []
+    held_at_each_encode = []
+
+    def encoder(q, _data):
+        held_at_each_encode.append(sum(ref() is not None for ref in produced))
+        output = _Output(sizes.size_for(q))
+        produced.append(weakref.ref(output))
+        return output
+
+    q, out, size = find_best_quality_under_target(encoder, None, 60_000, q_min=10)
+
+    assert q == _reference_best(sizes, 60_000)
+    assert len(produced) >= 4
+    assert max(held_at_each_encode) <= 2
@@ -0,0 +1,65 @@
+from io import BytesIO
+
+import pypdfium2 as pdfium
+import pytest
+from PIL import Image
+
+from backend.image_converter.domain.jpeg_stream import jpeg_frame
+from backend.image_converter.domain.pdf_merge import PdfMergeOrder, natural_sort_key
+from backend.image_converter.infrastructure.streaming_pdf import PdfPage, StreamingPdfWriter
+
+
+def _jpeg(size, mode="RGB", color=(200, 30, 30)):
+    buffer = BytesIO()
+    Image.new(mode, size, color if mode == "RGB" else 90).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def test_When_PagesAreStreamed_Expect_ReadableDocumentWithPlacedImages(tmp_path):
+    path = tmp_path / "out.pdf"
+    writer = StreamingPdfWriter(str(path))
+    writer.add_page(PdfPage(200, 100, x=50, y=0, width=100, height=50, jpeg=_jpeg((40, 20))))
+    writer.add_page(PdfPage(120.5, 80, x=0, y=0, width=120.5, height=80, jpeg=_jpeg((30, 30), mode="L")))
+    writer.close()
+
+    pdf = pdfium.PdfDocument(str(path))
+    try:
+        assert len(pdf) == 2
+        assert pdf[0].get_size() == (200, 100)
+        assert pdf[1].get_size() == pytest.approx((120.5, 80))
+        first = pdf[0].render(scale=1).to_pil().convert("RGB")
+        # Placed in the top half, centered horizontally.
+        r, g, b = first.getpixel((100, 25))
+        assert r > 150 and g < 80
+        assert first.getpixel((100, 75)) == (255, 255, 255)
+        assert first.getpixel((20, 25)) == (255, 255, 255)
+    finally:
+        pdf.close()
+
+
+def test_When_WriterIsAbortedOrRejectsPage_Expect_NoFileLeft(tmp_path):
+    path = tmp_path / "out.pdf"
+    writer = StreamingPdfWriter(str(path))
+    with pytest.raises(ValueError):
+        writer.add_page(PdfPage(10, 10, 0, 0, 10, 10, jpeg=b"not a jpeg"))
+    assert writer.page_count == 0
+    with pytest.raises(ValueError):
+        writer.close()
+
+    writer = StreamingPdfWriter(str(path))
+    writer.add_page(PdfPage(10, 10, 0, 0, 10, 10, jpeg=_jpeg((8, 8))))
+    writer.abort()
+    assert not path.exists()
+
+
+def test_When_JpegFrameIsRead_Expect_SizeAndComponents():
+    assert jpeg_frame(_jpeg((37, 11))) == (37, 11, 3)
+    assert jpeg_frame(_jpeg((5, 9), mode="L")) == (5, 9, 1)
+
+
+def test_When_NamesSortNaturally_Expect_NumbersComparedByValue():
+    names = ["Page10.jpg", "page2.jpg", "page1.jpg", "cover.png"]
+    assert sorted(names, key=natural_sort_key) == ["cover.png", "page1.jpg", "page2.jpg", "Page10.jpg"]
+    assert PdfMergeOrder.from_string_result("").value == PdfMergeOrder.UPLOAD
+    assert PdfMergeOrder.from_string_result("Name").value == PdfMergeOrder.NAME
+    assert not PdfMergeOrder.from_string_result("random").is_successful
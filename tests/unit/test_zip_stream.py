@@ -0,0 +1,52 @@
+import io
+import zipfile
+
+import pytest
+
+from backend.image_converter.infrastructure import zip_stream
+from backend.image_converter.infrastructure.zip_stream import ZipStream, collect_entries
+
+
+@pytest.fixture
+def folder(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"\xff\xd8" + bytes(range(256)) * 40)
+    (tmp_path / "fotó.png").write_bytes(b"png-bytes")
+    (tmp_path / "empty.avif").write_bytes(b"")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "page.pdf").write_bytes(b"%PDF-1.7" * 100)
+    return tmp_path
+
+
+def _read_back(folder):
+    stream = ZipStream(collect_entries(str(folder)))
+    data = b"".join(stream)
+    return stream, data, zipfile.ZipFile(io.BytesIO(data))
+
+
+def test_When_FolderStreamed_Expect_StoredArchiveOfExactAnnouncedLength(folder):
+    stream, data, archive = _read_back(folder)
+
+    assert len(data) == stream.content_length
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ["a.jpg", "empty.avif", "fotó.png", "nested/page.pdf"]
+    assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    assert archive.read("nested/page.pdf") == (folder / "nested" / "page.pdf").read_bytes()
+
+
+def test_When_LimitsExceeded_Expect_Zip64RecordsReadable(folder, monkeypatch):
+    monkeypatch.setattr(zip_stream, "_ZIP64_LIMIT", 200)
+    monkeypatch.setattr(zip_stream, "_ZIP64_COUNT_LIMIT", 2)
+
+    stream, data, archive = _read_back(folder)
+
+    assert len(data) == stream.content_length
+    assert archive.testzip() is None
+    assert archive.read("a.jpg") == (folder / "a.jpg").read_bytes()
+
+
+def test_When_FileShrinksWhileStreaming_Expect_Error(folder):
+    stream = ZipStream(collect_entries(str(folder)))
+    (folder / "a.jpg").write_bytes(b"short")
+
+    with pytest.raises(IOError):
+        b"".join(stream)